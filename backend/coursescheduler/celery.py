@@ -13,4 +13,8 @@ app.conf.beat_schedule = {
         'task': 'metrics.tasks.calculate_and_store_metrics',
         'schedule': crontab(minute='*/5'),
     },
+    'purge-schedule-cache-hourly': {
+        'task': 'scheduler.tasks.purge_schedule_cache',
+        'schedule': crontab(minute=17),
+    },
 }
\ No newline at end of file
@@ -285,6 +285,26 @@ CELERY_TASK_SERIALIZER = 'json'
 CELERY_RESULT_SERIALIZER = 'json'
 CELERY_TASK_ALWAYS_EAGER = False  # Ensure this is False in production
 
+# Cache shared by every web worker (schedule frontiers, course catalog).
+# Data version tokens live in the database (scheduler.DataVersion), so
+# without Redis each process falls back to its own memory cache, which only
+# lowers hit rates.
+CACHE_REDIS_URL = os.getenv("CACHE_REDIS_URL", os.getenv("REDIS_URL"))
+if CACHE_REDIS_URL:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": CACHE_REDIS_URL,
+            "KEY_PREFIX": "coursescheduler",
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        }
+    }
+
 # Timezone settings
 USE_TZ = False
 TIME_ZONE = 'America/Toronto'
\ No newline at end of file
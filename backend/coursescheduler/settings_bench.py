@@ -0,0 +1,25 @@
+"""
+Django settings for running benchmarks (see scheduler's benchmark_scheduler
+command) against a throwaway in-memory SQLite database:
+
+    python manage.py benchmark_scheduler --settings=coursescheduler.settings_bench
+"""
+from .settings import *  # noqa: F401,F403
+from .settings import LOGGING
+
+DATABASES = {
+    "default": {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": ":memory:",
+    }
+}
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    }
+}
+
+# Per-request info logging would dominate the timings
+LOGGING["loggers"]["scheduler"]["level"] = "WARNING"
+LOGGING["loggers"]["scheduler"]["handlers"] = ["console"]
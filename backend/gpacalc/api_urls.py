@@ -26,6 +26,7 @@ urlpatterns = [
     
     # Calculation and export endpoints
     path('calculate/', views.calculate_gpa, name='calculate_gpa'),
+    path('target_grade/', views.target_grade, name='target_grade'),
     path('progress_export_excel/', views.progress_export_excel, name='progress_export_excel'),
 
     # User progress endpoint
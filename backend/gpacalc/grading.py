@@ -0,0 +1,282 @@
+# gpacalc/grading.py
+"""
+In-memory grade computation for the GPA calculator.
+
+calculate_gpa used to create a CourseGrade and one AssessmentGrade row per
+assessment for every scheme it evaluated, only to read them back in
+CourseGrade.calculate_from_assessments and never use them again. The same
+computation runs here on plain values, so a calculation writes nothing.
+
+Results are identical to the stored path: weightages and achieved marks are
+rounded the way the DecimalField(max_digits=5, decimal_places=2) columns
+rounded them (see column_value()), and values those columns would reject
+skip the assessment, as the failed create() did.
+
+Letter grades come from a GradeLadder: the boundaries of a GradeScale (see
+models.py), sorted once and searched with bisect. grade_scale() keeps each
+process's ladders in memory; saving a scale clears this process's copy and
+other processes reload theirs after GRADE_SCALE_MAX_AGE. Without a default
+scale in the database the built-in GRADE_LADDER is used; requests may pick
+another scale by name. GradeLadder.lookup_many()
+grades whole arrays of percentages at once, with NumPy when it is installed.
+"""
+import bisect
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from decimal import Context, Decimal, InvalidOperation, ROUND_HALF_UP
+from typing import List, Optional
+
+try:
+    import numpy as np
+except ImportError:  # optional, lookup_many() falls back to bisect
+    np = None
+
+logger = logging.getLogger(__name__)
+
+# Reload cached grade scales at least this often, in seconds
+GRADE_SCALE_MAX_AGE = 5 * 60
+
+# Built-in scale: (lowest percentage, letter grade, GPA value), highest first
+GRADE_LADDER = [
+    (90, "A+", 4.0),
+    (85, "A", 4.0),
+    (80, "A-", 3.7),
+    (77, "B+", 3.3),
+    (73, "B", 3.0),
+    (70, "B-", 2.7),
+    (67, "C+", 2.3),
+    (63, "C", 2.0),
+    (60, "C-", 1.7),
+    (57, "D+", 1.3),
+    (53, "D", 1.0),
+    (50, "D-", 0.7),
+]
+FAILING_GRADE = ("F", 0.0)
+
+# Assessment columns are DecimalField(max_digits=5, decimal_places=2)
+_COLUMN_CONTEXT = Context(prec=5)
+_COLUMN_PLACES = Decimal("0.01")
+_COLUMN_MAX = Decimal("999.99")
+
+
+class GradeLadder:
+    """
+    Sorted grade boundaries of a scale.
+
+    Args:
+        boundaries: iterable of (lowest percentage, letter grade, GPA value).
+            Percentages below the lowest boundary get its grade, so a scale
+            should start at 0.
+    """
+
+    def __init__(self, boundaries):
+        boundaries = sorted((float(lowest), letter, float(gpa)) for lowest, letter, gpa in boundaries)
+        if not boundaries:
+            raise ValueError("a grade scale needs at least one boundary")
+        self.boundaries = boundaries
+        self._lowest = [lowest for lowest, _, _ in boundaries]
+        self._grades = [(letter, gpa) for _, letter, gpa in boundaries]
+
+    def lookup(self, percentage):
+        """(letter_grade, gpa_value) of a final percentage"""
+        return self._grades[max(0, bisect.bisect_right(self._lowest, percentage) - 1)]
+
+    def lookup_many(self, percentages):
+        """
+        Grade a whole sequence of percentages at once.
+
+        Returns:
+            (letter grades, GPA values), as NumPy arrays when NumPy is
+            installed and lists otherwise
+        """
+        if np is None:
+            grades = [self.lookup(percentage) for percentage in percentages]
+            return [letter for letter, _ in grades], [gpa for _, gpa in grades]
+        positions = np.searchsorted(self._lowest, np.asarray(percentages, dtype=float), side="right") - 1
+        np.maximum(positions, 0, out=positions)
+        letters = np.array([letter for letter, _ in self._grades], dtype=object)
+        gpas = np.array([gpa for _, gpa in self._grades])
+        return letters[positions], gpas[positions]
+
+    def threshold(self, letter_grade):
+        """Lowest percentage earning a letter grade, or None if the scale doesn't have it"""
+        for position, (lowest, letter, _) in enumerate(self.boundaries):
+            if letter.upper() == letter_grade.upper():
+                # Every percentage reaches the lowest grade
+                return lowest if position else 0.0
+        return None
+
+    def gpa_threshold(self, gpa):
+        """Lowest percentage earning at least `gpa`, or None if no grade does"""
+        for position, (lowest, _, boundary_gpa) in enumerate(self.boundaries):
+            if boundary_gpa >= gpa:
+                return lowest if position else 0.0
+        return None
+
+
+DEFAULT_LADDER = GradeLadder(GRADE_LADDER + [(0, *FAILING_GRADE)])
+
+_ladders = {}
+_ladders_lock = threading.Lock()
+
+
+def _load_ladders():
+    """Every GradeScale in the database, keyed by name, with None for the default"""
+    from django.core.exceptions import ImproperlyConfigured
+    from django.db import DatabaseError
+    from .models import GradeScale
+
+    ladders = {}
+    defaults = []
+    try:
+        for scale in GradeScale.objects.prefetch_related("boundaries"):
+            if scale.is_default:
+                defaults.append(scale.name)
+            boundaries = [(b.min_percentage, b.letter_grade, b.gpa_value) for b in scale.boundaries.all()]
+            if not boundaries:
+                continue
+            ladders[scale.name] = GradeLadder(boundaries)
+            if scale.is_default:
+                ladders[None] = ladders[scale.name]
+    except DatabaseError:
+        logger.warning("Grade scales could not be loaded, using the built-in scale", exc_info=True)
+    # Prevented by the single-default constraint; refuse to pick one silently
+    if len(defaults) > 1:
+        raise ImproperlyConfigured(f"Several grade scales are marked as default: {', '.join(defaults)}")
+    return ladders
+
+
+def grade_scale(name=None):
+    """
+    The GradeLadder of a GradeScale, by name, or of the default scale.
+    Without a default scale in the database DEFAULT_LADDER is used.
+
+    Raises:
+        ValueError: if there is no scale (with boundaries) called `name`
+    """
+    # (loaded_at, ladders) is read and replaced as one value, so a concurrent
+    # invalidate_grade_scales() can't empty it between the check and the lookup
+    current = _ladders.get("current")
+    if current is None or time.monotonic() - current[0] >= GRADE_SCALE_MAX_AGE:
+        with _ladders_lock:
+            current = _ladders.get("current")
+            if current is None or time.monotonic() - current[0] >= GRADE_SCALE_MAX_AGE:
+                current = (time.monotonic(), _load_ladders())
+                _ladders["current"] = current
+    if name is None:
+        return current[1].get(None, DEFAULT_LADDER)
+    if name not in current[1]:
+        raise ValueError(f"Unknown grade scale: {name}")
+    return current[1][name]
+
+
+def invalidate_grade_scales():
+    """Drop this process's cached grade scales (called by the model signals)"""
+    with _ladders_lock:
+        _ladders.clear()
+
+
+def letter_grade_for(percentage, scale=None):
+    """
+    Map a final percentage to its (letter_grade, gpa_value).
+
+    Args:
+        percentage: final percentage
+        scale: GradeLadder, or None for the default scale
+
+    >>> letter_grade_for(82.4, DEFAULT_LADDER)
+    ('A-', 3.7)
+    """
+    return (scale or grade_scale()).lookup(percentage)
+
+
+def column_value(value):
+    """
+    A weightage or achieved percentage as it reads back from an assessment
+    column: floats keep five significant digits (Django's DecimalField
+    conversion), then the value is rounded to two places half away from zero
+    (PostgreSQL numeric).
+
+    Returns:
+        float, or None for None
+
+    Raises:
+        ValueError: if the column would reject the value
+    """
+    if value is None:
+        return None
+    try:
+        if isinstance(value, float):
+            number = _COLUMN_CONTEXT.create_decimal_from_float(value)
+        else:
+            number = Decimal(str(value).strip())
+        if not number.is_finite():
+            raise ValueError(f"not a finite number: {value!r}")
+        number = number.quantize(_COLUMN_PLACES, rounding=ROUND_HALF_UP)
+    except (InvalidOperation, TypeError) as e:
+        raise ValueError(f"invalid assessment value: {value!r}") from e
+    if abs(number) > _COLUMN_MAX:
+        raise ValueError(f"assessment value out of range: {value!r}")
+    return float(number)
+
+
+def parse_weightage(raw_weight):
+    """
+    Parse a CourseEvent.weightage string ("30%", "12.5") into a float.
+    Missing or unparseable weightages count as 0.
+    """
+    raw_weight = raw_weight or 0
+    if isinstance(raw_weight, str) and raw_weight.endswith("%"):
+        raw_weight = raw_weight.rstrip("%")
+    try:
+        return float(raw_weight)
+    except Exception:
+        return 0
+
+
+@dataclass
+class AssessmentMark:
+    """One assessment of a course: its weight in the scheme and the mark achieved"""
+    event_id: int
+    weightage: Optional[float]
+    achieved_percentage: Optional[float]
+
+
+@dataclass
+class CourseResult:
+    """
+    A course's grade under one grading scheme. The fields are None when no
+    assessment carries both a weight and a mark, like an empty CourseGrade.
+    """
+    final_percentage: Optional[float] = None
+    letter_grade: Optional[str] = None
+    gpa_value: Optional[float] = None
+    assessments: List[AssessmentMark] = field(default_factory=list)
+
+
+def grade_assessments(assessments, scale=None):
+    """
+    Weighted final percentage, letter grade and GPA value of a course.
+
+    Args:
+        assessments: list of AssessmentMark
+        scale: GradeLadder, or None for the default scale
+
+    Returns:
+        CourseResult
+    """
+    total_weight = 0
+    weighted_sum = 0
+    for assessment in assessments:
+        if assessment.weightage and assessment.achieved_percentage is not None:
+            weighted_sum += assessment.achieved_percentage * assessment.weightage / 100
+            total_weight += assessment.weightage
+
+    result = CourseResult(assessments=assessments)
+    if total_weight > 0:
+        result.final_percentage = round(weighted_sum * 100 / 100, 2)
+        result.letter_grade, result.gpa_value = letter_grade_for(result.final_percentage, scale)
+    return result
+
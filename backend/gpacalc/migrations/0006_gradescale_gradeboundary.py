@@ -0,0 +1,75 @@
+# Generated by Django 5.2.4 on 2026-10-18 16:20
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+# The scale CourseGrade.calculate_from_assessments hard-coded:
+# (letter grade, lowest percentage, GPA value)
+DEFAULT_BOUNDARIES = [
+    ("A+", "90.00", "4.00"),
+    ("A", "85.00", "4.00"),
+    ("A-", "80.00", "3.70"),
+    ("B+", "77.00", "3.30"),
+    ("B", "73.00", "3.00"),
+    ("B-", "70.00", "2.70"),
+    ("C+", "67.00", "2.30"),
+    ("C", "63.00", "2.00"),
+    ("C-", "60.00", "1.70"),
+    ("D+", "57.00", "1.30"),
+    ("D", "53.00", "1.00"),
+    ("D-", "50.00", "0.70"),
+    ("F", "0.00", "0.00"),
+]
+
+
+def create_default_scale(apps, schema_editor):
+    GradeScale = apps.get_model('gpacalc', 'GradeScale')
+    GradeBoundary = apps.get_model('gpacalc', 'GradeBoundary')
+    scale = GradeScale.objects.create(name='Default', description='Default grading scale', is_default=True)
+    GradeBoundary.objects.bulk_create([
+        GradeBoundary(scale=scale, letter_grade=letter, min_percentage=lowest, gpa_value=gpa)
+        for letter, lowest, gpa in DEFAULT_BOUNDARIES
+    ])
+
+
+def delete_default_scale(apps, schema_editor):
+    apps.get_model('gpacalc', 'GradeScale').objects.filter(name='Default').delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gpacalc', '0005_assessmentweightage_gradingscheme_delete_gradescale_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GradeScale',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, unique=True)),
+                ('description', models.TextField(blank=True, null=True)),
+                ('is_default', models.BooleanField(default=False)),
+            ],
+            options={
+                'db_table': 'gpacalc_gradescale',
+            },
+        ),
+        migrations.CreateModel(
+            name='GradeBoundary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('letter_grade', models.CharField(max_length=2)),
+                ('min_percentage', models.DecimalField(decimal_places=2, max_digits=5)),
+                ('gpa_value', models.DecimalField(decimal_places=2, max_digits=3)),
+                ('scale', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='boundaries', to='gpacalc.gradescale')),
+            ],
+            options={
+                'db_table': 'gpacalc_gradeboundary',
+                'ordering': ['-min_percentage'],
+                'unique_together': {('scale', 'letter_grade')},
+            },
+        ),
+        migrations.RunPython(create_default_scale, delete_default_scale),
+    ]
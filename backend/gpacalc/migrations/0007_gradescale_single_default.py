@@ -0,0 +1,21 @@
+# Generated by Django 5.2.4 on 2026-10-18 18:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("gpacalc", "0006_gradescale_gradeboundary"),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name="gradescale",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(("is_default", True)),
+                fields=("is_default",),
+                name="gpacalc_gradescale_single_default",
+            ),
+        ),
+    ]
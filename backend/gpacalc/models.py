@@ -1,7 +1,10 @@
 from django.db import models
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
 from django.contrib.auth.models import User
 from scheduler.models import Course, CourseEvent
 from django.conf import settings
+from .grading import AssessmentMark, grade_assessments, invalidate_grade_scales
 
 class GradingScheme(models.Model):
     """
@@ -53,6 +56,66 @@ class AssessmentWeightage(models.Model):
         db_table = 'gpacalc_assessmentweightage'
 
 
+class GradeScale(models.Model):
+    """
+    A percentage to letter grade and GPA scale.
+    
+    The scale marked is_default grades every calculation, so a deployment
+    for another school only needs its own boundaries. At most one scale can
+    be the default. Without any scale the built-in one in gpacalc.grading is
+    used.
+    
+    API relevance:
+    - Decides letter_grade and gpa_value in calculate_gpa and target_grade
+    - Cached per process (see gpacalc.grading.grade_scale)
+    """
+    name = models.CharField(max_length=100, unique=True)
+    description = models.TextField(null=True, blank=True)
+    is_default = models.BooleanField(default=False)
+
+    def __str__(self):
+        return self.name
+
+    class Meta:
+        db_table = 'gpacalc_gradescale'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['is_default'],
+                condition=models.Q(is_default=True),
+                name='gpacalc_gradescale_single_default',
+            ),
+        ]
+
+
+class GradeBoundary(models.Model):
+    """
+    One grade of a GradeScale: the lowest percentage earning it.
+    
+    Percentages below a scale's lowest boundary get that boundary's grade,
+    so scales should start at 0.
+    """
+    scale = models.ForeignKey(GradeScale, on_delete=models.CASCADE, related_name='boundaries')
+    letter_grade = models.CharField(max_length=2)
+    min_percentage = models.DecimalField(max_digits=5, decimal_places=2)
+    gpa_value = models.DecimalField(max_digits=3, decimal_places=2)
+
+    def __str__(self):
+        return f"{self.scale} - {self.letter_grade} ({self.min_percentage}%)"
+
+    class Meta:
+        ordering = ['-min_percentage']
+        unique_together = ('scale', 'letter_grade')
+        db_table = 'gpacalc_gradeboundary'
+
+
+@receiver(post_save, sender=GradeScale)
+@receiver(post_delete, sender=GradeScale)
+@receiver(post_save, sender=GradeBoundary)
+@receiver(post_delete, sender=GradeBoundary)
+def invalidate_grade_scale_cache(sender, instance, **kwargs):
+    invalidate_grade_scales()
+
+
 class CourseGrade(models.Model):
     """
     Represents a student's grade for a specific course.
@@ -76,8 +139,11 @@ class CourseGrade(models.Model):
         
         This method:
         1. Aggregates all assessment grades weighted by their respective percentages
-        2. Determines the letter grade based on grading scale
+        2. Determines the letter grade based on the default GradeScale
         3. Maps the letter grade to a GPA value
+        
+        The computation itself lives in gpacalc.grading, which calculate_gpa
+        uses directly without storing any rows.
         """
         assessments = self.assessmentgrade_set.all()
 
@@ -88,64 +154,17 @@ class CourseGrade(models.Model):
             self.save()
             return
 
-        total_weight = 0
-        weighted_sum = 0
-        
-        for assessment in assessments:
-            if assessment.weightage and assessment.achieved_percentage is not None:
-                weight = float(assessment.weightage)
-                achieved = float(assessment.achieved_percentage)
-                weighted_sum += (achieved * weight / 100)
-                total_weight += weight
-
-        # Calculate final percentage if we have assessments with weights
-        if total_weight > 0:
-            self.final_percentage = round(weighted_sum * 100 / 100, 2) # Normalize to percentage scale, previously calculated percentage achieved on the assignments now doing percentage achieved in the entire course.
-
-            # Map percentage to letter grade
-            if self.final_percentage >= 90:
-                self.letter_grade = "A+"
-                self.gpa_value = 4.0
-            elif self.final_percentage >= 85:
-                self.letter_grade = "A"
-                self.gpa_value = 4.0
-            elif self.final_percentage >= 80:
-                self.letter_grade = "A-"
-                self.gpa_value = 3.7
-            elif self.final_percentage >= 77:
-                self.letter_grade = "B+"
-                self.gpa_value = 3.3
-            elif self.final_percentage >= 73:
-                self.letter_grade = "B"
-                self.gpa_value = 3.0
-            elif self.final_percentage >= 70:
-                self.letter_grade = "B-"
-                self.gpa_value = 2.7
-            elif self.final_percentage >= 67:
-                self.letter_grade = "C+"
-                self.gpa_value = 2.3
-            elif self.final_percentage >= 63:
-                self.letter_grade = "C"
-                self.gpa_value = 2.0
-            elif self.final_percentage >= 60:
-                self.letter_grade = "C-"
-                self.gpa_value = 1.7
-            elif self.final_percentage >= 57:
-                self.letter_grade = "D+"
-                self.gpa_value = 1.3
-            elif self.final_percentage >= 53:
-                self.letter_grade = "D"
-                self.gpa_value = 1.0
-            elif self.final_percentage >= 50:
-                self.letter_grade = "D-"
-                self.gpa_value = 0.7
-            else:
-                self.letter_grade = "F"
-                self.gpa_value = 0.0
-        else:
-            self.final_percentage = None
-            self.letter_grade = None
-            self.gpa_value = None
+        result = grade_assessments([
+            AssessmentMark(
+                assessment.course_event_id,
+                float(assessment.weightage) if assessment.weightage is not None else None,
+                float(assessment.achieved_percentage) if assessment.achieved_percentage is not None else None,
+            )
+            for assessment in assessments
+        ])
+        self.final_percentage = result.final_percentage
+        self.letter_grade = result.letter_grade
+        self.gpa_value = result.gpa_value
 
         self.save()
 
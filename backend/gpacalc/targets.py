@@ -0,0 +1,201 @@
+# gpacalc/targets.py
+"""
+What-if solver for the GPA calculator: the lowest mark still needed on the
+remaining assessments to reach a target grade.
+
+The final percentage only grows with the marks on the remaining
+assessments, and the letter grade and GPA only grow with the final
+percentage. So the required mark is found by binary search over the grade
+function itself (grading.grade_assessments), in hundredths of a percent,
+which is the precision the calculator keeps marks to. The same exact
+computation as calculate_gpa decides every step, so the answer is never off
+by a rounding boundary.
+
+A single mark is solved for all remaining assessments at once ("the same
+mark on everything left"), per grading scheme of a course, or across all
+courses for an overall target.
+"""
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+from .grading import AssessmentMark, grade_assessments, grade_scale
+
+# Marks are searched in hundredths of a percent, from 0 to 100
+MARK_STEPS = 10000
+
+
+def target_threshold(target, scale=None):
+    """
+    Lowest final percentage that meets a target.
+
+    Args:
+        target: {"letter_grade": "A-"}, {"gpa": 3.7} or {"percentage": 80}
+        scale: GradeLadder, or None for the default scale
+
+    Returns:
+        float percentage, or None if no percentage reaches the target
+
+    Raises:
+        ValueError: if the target is malformed
+    """
+    if not isinstance(target, dict):
+        raise ValueError("target must be an object with letter_grade, gpa or percentage")
+    scale = scale or grade_scale()
+    if target.get("letter_grade") is not None:
+        threshold = scale.threshold(str(target["letter_grade"]).strip())
+        if threshold is None:
+            raise ValueError(f"Unknown letter grade: {target['letter_grade']}")
+        return threshold
+    if target.get("gpa") is not None:
+        return scale.gpa_threshold(float(target["gpa"]))
+    if target.get("percentage") is not None:
+        return float(target["percentage"])
+    raise ValueError("target must have letter_grade, gpa or percentage")
+
+
+@dataclass
+class Outlook:
+    """
+    A course under one grading scheme: the marks known so far and the
+    weighted assessments still to come.
+
+    Attributes:
+        known: AssessmentMarks with an achieved percentage
+        remaining: (event_id, weightage) of the assessments without a mark
+        scale: GradeLadder to grade on, or None for the default scale
+    """
+    known: List[AssessmentMark]
+    remaining: List[Tuple[int, float]]
+    scale: Optional[object] = None
+
+    @classmethod
+    def from_weights(cls, weights, row, assessments, scale=None):
+        """Outlook of scheme `row` of a CourseWeights for the submitted assessments"""
+        known = [m for m in weights.marks(row, assessments) if m.achieved_percentage is not None]
+        marked = {m.event_id for m in known}
+        remaining = [
+            (event_id, weight)
+            for event_id, weight in zip(weights.event_ids, weights.matrix[row])
+            if event_id not in marked and weight
+        ]
+        return cls(known, remaining, scale)
+
+    def grade(self, mark=None):
+        """CourseResult if every remaining assessment scores `mark` (None leaves them out)"""
+        if mark is None:
+            return grade_assessments(self.known, self.scale)
+        return grade_assessments(self.known + [
+            AssessmentMark(event_id, weight, mark) for event_id, weight in self.remaining
+        ], self.scale)
+
+
+def minimum_mark(meets):
+    """
+    Lowest mark in [0, 100], to the hundredth, for which meets(mark) is true.
+
+    Args:
+        meets: predicate on a mark, false below some mark and true from it on
+
+    Returns:
+        float mark, or None if even 100 doesn't meet it
+    """
+    if not meets(100.0):
+        return None
+    low, high = 0, MARK_STEPS
+    while low < high:
+        middle = (low + high) // 2
+        if meets(middle / 100):
+            high = middle
+        else:
+            low = middle + 1
+    return low / 100
+
+
+def required_mark(outlook, threshold):
+    """Lowest mark on an outlook's remaining assessments for a final percentage >= threshold"""
+    if threshold is None:
+        return None
+    return minimum_mark(lambda mark: (outlook.grade(mark).final_percentage or 0) >= threshold)
+
+
+def best_outlook(outlooks, credits, mark):
+    """
+    Position and CourseResult of the scheme giving the most GPA (then
+    percentage) points at `mark`, first scheme on ties, as in calculate_gpa
+    """
+    best = None
+    for position, outlook in enumerate(outlooks):
+        result = outlook.grade(mark)
+        points = ((result.gpa_value or 0) * credits, (result.final_percentage or 0) * credits)
+        if best is None or points > best[0]:
+            best = (points, position, result)
+    return best[1], best[2]
+
+
+def overall_grade(courses, mark):
+    """
+    Overall GPA and percentage when every remaining assessment scores `mark`
+    and each course uses its best scheme.
+
+    Args:
+        courses: list of (credits, outlooks)
+
+    Returns:
+        (overall_gpa, overall_final_percentage, chosen scheme position per course)
+    """
+    total_credit = sum(credits for credits, _ in courses)
+    total_points = 0
+    total_weighted_percentage = 0
+    choices = []
+    for credits, outlooks in courses:
+        position, result = best_outlook(outlooks, credits, mark)
+        choices.append(position)
+        if result.gpa_value:
+            total_points += result.gpa_value * credits
+        if result.final_percentage:
+            total_weighted_percentage += result.final_percentage * credits
+    if total_credit <= 0:
+        return 0, 0, choices
+    return round(total_points / total_credit, 2), round(total_weighted_percentage / total_credit, 2), choices
+
+
+def overall_required_mark(courses, target):
+    """
+    Lowest mark on every remaining assessment of every course that brings
+    the overall result to the target.
+
+    Args:
+        courses: list of (credits, outlooks)
+        target: {"gpa": 3.5} or {"percentage": 80}
+
+    Returns:
+        float mark, or None if unreachable
+
+    Raises:
+        ValueError: if the target is malformed
+    """
+    if not isinstance(target, dict):
+        raise ValueError("overall target must be an object with gpa or percentage")
+    if target.get("gpa") is not None:
+        wanted, index = float(target["gpa"]), 0
+    elif target.get("percentage") is not None:
+        wanted, index = float(target["percentage"]), 1
+    else:
+        raise ValueError("overall target must have gpa or percentage")
+    return minimum_mark(lambda mark: overall_grade(courses, mark)[index] >= wanted)
+
+
+def result_summary(result):
+    """Response fields of a CourseResult, shaped like calculate_gpa's per-course entries"""
+    return {
+        "final_percentage": float(result.final_percentage) if result.final_percentage else 0,
+        "letter_grade": result.letter_grade or "N/A",
+        "gpa_value": float(result.gpa_value) if result.gpa_value else 0,
+    }
+
+
+def projected(outlook, mark):
+    """result_summary() of an outlook at `mark`, or None if no mark reaches the target"""
+    if mark is None:
+        return None
+    return result_summary(outlook.grade(mark))
@@ -1,3 +1,544 @@
+# gpacalc/tests.py
+"""
+GPA calculator checks: calculate_gpa against the original per-CourseGrade
+computation, its best combination and combination pages, the prefetched
+weight matrix, the target-grade solver, grade scale lookups against the original if/elif ladder, and
+the requests that pick a scale by name.
+"""
+import itertools
+import json
+from unittest import mock
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db import transaction
 from django.test import TestCase
+from django.urls import reverse
+
+from scheduler.models import Course, CourseEvent
+from .grading import (
+    DEFAULT_LADDER,
+    GRADE_SCALE_MAX_AGE,
+    grade_scale,
+    invalidate_grade_scales,
+    letter_grade_for,
+)
+from .models import AssessmentGrade, AssessmentWeightage, CourseGrade, GradeBoundary, GradeScale, GradingScheme
+from .targets import target_threshold
+from .weights import DEFAULT_SCHEME, load_weight_matrix
+
+TERM = "Fall 2025"
+
+
+def ladder_grade(percentage):
+    """The letter grade mapping calculate_gpa used before grade scales"""
+    if percentage >= 90:
+        return "A+", 4.0
+    elif percentage >= 85:
+        return "A", 4.0
+    elif percentage >= 80:
+        return "A-", 3.7
+    elif percentage >= 77:
+        return "B+", 3.3
+    elif percentage >= 73:
+        return "B", 3.0
+    elif percentage >= 70:
+        return "B-", 2.7
+    elif percentage >= 67:
+        return "C+", 2.3
+    elif percentage >= 63:
+        return "C", 2.0
+    elif percentage >= 60:
+        return "C-", 1.7
+    elif percentage >= 57:
+        return "D+", 1.3
+    elif percentage >= 53:
+        return "D", 1.0
+    elif percentage >= 50:
+        return "D-", 0.7
+    return "F", 0.0
+
+
+def create_course(course_code, weightages, section_number="01", credits=0.5):
+    """A CIS course with one CourseEvent per (event_type, weightage)"""
+    course = Course.objects.create(
+        offered_term=TERM,
+        course_type="CIS",
+        course_code=course_code,
+        section_number=section_number,
+        section_name=f"CIS*{course_code}*{section_number}",
+        seats="10 / 40",
+        instructor="A. Smith",
+        credits=credits,
+    )
+    events = [
+        CourseEvent.objects.create(course=course, event_type=event_type, weightage=weightage, description="")
+        for event_type, weightage in weightages
+    ]
+    return course, events
+
+
+def create_scale(name, boundaries, is_default=False):
+    scale = GradeScale.objects.create(name=name, is_default=is_default)
+    GradeBoundary.objects.bulk_create([
+        GradeBoundary(scale=scale, min_percentage=lowest, letter_grade=letter, gpa_value=gpa)
+        for lowest, letter, gpa in boundaries
+    ])
+    return scale
+
+
+def create_scheme(course, name, weightages):
+    """A GradingScheme weighing events by {CourseEvent: weightage}"""
+    scheme = GradingScheme.objects.create(course=course, name=name)
+    for event, weightage in weightages.items():
+        AssessmentWeightage.objects.create(grading_scheme=scheme, course_event=event, weightage=weightage)
+    return scheme
+
+
+def stored_grade(course, scheme, assessments):
+    """
+    (final_percentage, letter_grade, gpa_value) of a course the way
+    calculate_gpa computed it before grading.py: one AssessmentGrade row per
+    assessment, read back and graded with the if/elif ladder. scheme is None
+    for the event weightages.
+    """
+    course_grade = CourseGrade.objects.create(course=course)
+    for a in assessments:
+        try:
+            event = CourseEvent.objects.get(id=a["event_id"])
+            try:
+                weight = float(AssessmentWeightage.objects.get(grading_scheme=scheme, course_event=event).weightage)
+            except AssessmentWeightage.DoesNotExist:
+                try:
+                    weight = float(str(event.weightage or 0).rstrip("%"))
+                except ValueError:
+                    weight = 0
+            row = AssessmentGrade(
+                course_grade=course_grade, course_event=event, weightage=weight, achieved_percentage=a["achieved"],
+            )
+            # Rejects what the numeric(5, 2) columns reject on PostgreSQL,
+            # which SQLite would store anyway
+            row.full_clean()
+            row.save()
+        except Exception:
+            continue
+
+    total_weight = 0
+    weighted_sum = 0
+    for row in AssessmentGrade.objects.filter(course_grade=course_grade):
+        if row.weightage and row.achieved_percentage is not None:
+            weighted_sum += float(row.achieved_percentage) * float(row.weightage) / 100
+            total_weight += float(row.weightage)
+    if total_weight <= 0:
+        return 0, "N/A", 0
+    final_percentage = round(weighted_sum * 100 / 100, 2)
+    letter_grade, gpa_value = ladder_grade(final_percentage)
+    return final_percentage, letter_grade, gpa_value
+
+
+class GpaCalcTestCase(TestCase):
+    """Starts every test with no cached grade scales"""
+    def setUp(self):
+        invalidate_grade_scales()
+        self.addCleanup(invalidate_grade_scales)
+
+    def post(self, name, body):
+        return self.client.post(reverse(f"gpacalc-api:{name}"), json.dumps(body), content_type="application/json")
+
+
+class GradeScaleTests(GpaCalcTestCase):
+    def replace_default_scale(self):
+        """Make a Pass/Fail scale the default instead of the seeded one"""
+        GradeScale.objects.filter(is_default=True).update(is_default=False)
+        create_scale("Pass/Fail", [(0, "F", 0), (50, "P", 4)], is_default=True)
+
+    def test_scales_match_the_if_elif_ladder(self):
+        percentages = [hundredths / 100 for hundredths in range(10001)]
+        expected = [ladder_grade(percentage) for percentage in percentages]
+        # The seeded default scale and the built-in fallback
+        for scale in (grade_scale(), DEFAULT_LADDER):
+            self.assertEqual([scale.lookup(percentage) for percentage in percentages], expected)
+            letters, gpas = scale.lookup_many(percentages)
+            self.assertEqual(list(zip(letters, gpas)), expected)
+        self.assertEqual([letter_grade_for(percentage) for percentage in percentages], expected)
+
+    def test_default_scale_from_the_database(self):
+        self.replace_default_scale()
+        self.assertEqual(letter_grade_for(49.99), ("F", 0.0))
+        self.assertEqual(letter_grade_for(50), ("P", 4.0))
+        self.assertEqual(grade_scale("Default").lookup(50), ("D-", 0.7))
+
+    def test_built_in_scale_without_a_default(self):
+        GradeScale.objects.update(is_default=False)
+        self.assertIs(grade_scale(), DEFAULT_LADDER)
+
+    def test_unknown_scale_name_is_rejected(self):
+        with self.assertRaises(ValueError):
+            grade_scale("Percentage")
+
+    def test_several_defaults_are_refused(self):
+        scales = []
+        for name in ("Default", "Pass/Fail"):
+            boundary = mock.Mock(min_percentage=0, letter_grade="F", gpa_value=0)
+            scale = mock.Mock(is_default=True, **{"boundaries.all.return_value": [boundary]})
+            scale.name = name
+            scales.append(scale)
+        with mock.patch.object(GradeScale, "objects") as objects:
+            objects.prefetch_related.return_value = scales
+            with self.assertRaises(ImproperlyConfigured):
+                grade_scale()
+
+    def test_scales_are_reloaded_after_max_age(self):
+        clock = [1000.0]
+        with mock.patch("gpacalc.grading.time.monotonic", side_effect=lambda: clock[0]):
+            self.assertEqual(grade_scale().lookup(50), ("D-", 0.7))
+            # Written by another process: no signal clears this one's copy
+            with mock.patch("gpacalc.models.invalidate_grade_scales"):
+                self.replace_default_scale()
+            clock[0] += GRADE_SCALE_MAX_AGE - 1
+            self.assertEqual(grade_scale().lookup(50), ("D-", 0.7))
+            clock[0] += 1
+            self.assertEqual(grade_scale().lookup(50), ("P", 4.0))
+
+    def test_saving_a_scale_clears_the_cached_scales(self):
+        self.assertEqual(grade_scale().lookup(50), ("D-", 0.7))
+        self.replace_default_scale()
+        self.assertEqual(grade_scale().lookup(50), ("P", 4.0))
+
+    def test_requests_pick_a_scale_by_name(self):
+        with self.captureOnCommitCallbacks(execute=True), transaction.atomic():
+            course, (midterm, final) = create_course("3750", [("Midterm", "40%"), ("Final", "60%")])
+        create_scale("Pass/Fail", [(0, "F", 0), (50, "P", 4)])
+        entry = {
+            "course_type": "CIS",
+            "course_code": "3750",
+            "section_number": "01",
+            "assessments": [{"event_id": midterm.id, "achieved": 55}],
+        }
+        # 0.4 * 55 + 0.6 * 50 = 52
+        both_marks = dict(entry, assessments=entry["assessments"] + [{"event_id": final.id, "achieved": 50}])
+        for scale, letter_grade in ((None, "D-"), ("Pass/Fail", "P")):
+            calculated = self.post("calculate_gpa", {"offered_term": TERM, "courses": [both_marks], "grade_scale": scale})
+            self.assertEqual(calculated.json()["best_combination"]["per_course"][0]["letter_grade"], letter_grade)
+
+        target = self.post("target_grade", {
+            "offered_term": TERM,
+            "courses": [dict(entry, target={"letter_grade": "P"})],
+            "grade_scale": "Pass/Fail",
+        }).json()
+        self.assertEqual(target["courses"][0]["target_percentage"], 50.0)
+        # 22 + 0.6 * 46.66 = 49.996, which calculate_gpa rounds to 50.00
+        self.assertEqual(target["courses"][0]["best_scheme"]["required_mark"], 46.66)
+
+        for name in ("calculate_gpa", "target_grade"):
+            response = self.post(name, {"offered_term": TERM, "courses": [entry], "grade_scale": "Percentage"})
+            self.assertEqual(response.status_code, 400, name)
+
+
+class SchemeFixture:
+    """
+    Three courses: two grading schemes (one leaving an event to its own
+    weightage), no scheme, and three schemes; 6 combinations. The submitted
+    marks include an unknown event, an event without a usable weightage and
+    a mark too large for the assessment column.
+    """
+    @classmethod
+    def setUpTestData(cls):
+        with cls.captureOnCommitCallbacks(execute=True), transaction.atomic():
+            cls.design, (midterm, final, lab, quiz) = create_course(
+                "3750", [("Midterm", "30%"), ("Final", "50%"), ("Lab", "20"), ("Quiz", "TBD")],
+            )
+            cls.programming, (assignment, exam) = create_course(
+                "2500", [("Assignment", "12.5%"), ("Exam", "87.5%")], credits=0.75,
+            )
+            cls.systems, (test, project) = create_course("1300", [("Test", "50%"), ("Project", "50%")])
+        cls.design_schemes = [
+            create_scheme(cls.design, "Final heavy", {midterm: 20, final: 70, lab: 10}),
+            create_scheme(cls.design, "No quiz", {midterm: 40, final: 40}),
+        ]
+        cls.systems_schemes = [
+            create_scheme(cls.systems, "Standard", {test: 50, project: 50}),
+            create_scheme(cls.systems, "Project", {test: 25, project: 75}),
+            create_scheme(cls.systems, "Test", {test: 75, project: 25}),
+        ]
+        cls.courses = [
+            {
+                "course_type": "CIS", "course_code": "3750", "section_number": "01",
+                "assessments": [
+                    {"event_id": midterm.id, "achieved": 72.25},
+                    {"event_id": final.id, "achieved": 88},
+                    {"event_id": lab.id, "achieved": 95.5},
+                    {"event_id": quiz.id, "achieved": 100},
+                    {"event_id": 999999, "achieved": 50},
+                ],
+            },
+            {
+                "course_type": "CIS", "course_code": "2500", "section_number": "01",
+                "assessments": [
+                    {"event_id": assignment.id, "achieved": 64},
+                    {"event_id": exam.id, "achieved": 79.5},
+                ],
+            },
+            {
+                "course_type": "CIS", "course_code": "1300", "section_number": "01",
+                "assessments": [
+                    {"event_id": test.id, "achieved": 91},
+                    {"event_id": project.id, "achieved": 1000},
+                ],
+            },
+        ]
+
+    def course_schemes(self):
+        """(course, schemes, assessments) per requested course, None for the default scheme"""
+        return [
+            (self.design, self.design_schemes, self.courses[0]["assessments"]),
+            (self.programming, [None], self.courses[1]["assessments"]),
+            (self.systems, self.systems_schemes, self.courses[2]["assessments"]),
+        ]
+
+    def stored_combinations(self):
+        """calculate_gpa's combination list, built from stored_grade() like the original loop"""
+        total_credit = sum(course.credits for course, _, _ in self.course_schemes())
+        grades = [
+            [(scheme, stored_grade(course, scheme, assessments)) for scheme in schemes]
+            for course, schemes, assessments in self.course_schemes()
+        ]
+        combinations = []
+        for combo in itertools.product(*grades):
+            per_course = []
+            names = []
+            points = 0
+            weighted_percentage = 0
+            for (course, _, _), (scheme, (final_percentage, letter_grade, gpa_value)) in zip(self.course_schemes(), combo):
+                scheme_name = scheme.name if scheme else "Default"
+                names.append(f"CIS {course.course_code}: {scheme_name}")
+                per_course.append({
+                    "course": str(course),
+                    "final_percentage": final_percentage,
+                    "letter_grade": letter_grade,
+                    "gpa_value": gpa_value,
+                    "credits": course.credits,
+                    "scheme_name": scheme_name,
+                })
+                points += gpa_value * course.credits
+                weighted_percentage += final_percentage * course.credits
+            combinations.append({
+                "scheme_id": f"combo_{len(combinations)}",
+                "scheme_name": " + ".join(names),
+                "per_course": per_course,
+                "overall_gpa": round(points / total_credit, 2),
+                "overall_final_percentage": round(weighted_percentage / total_credit, 2),
+                "schemes_used": names,
+            })
+        return combinations
+
+
+class CalculateGpaTests(SchemeFixture, GpaCalcTestCase):
+    def calculate(self, **options):
+        response = self.post("calculate_gpa", dict({"offered_term": TERM, "courses": self.courses}, **options))
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_matches_the_stored_grades(self):
+        result = self.calculate()
+        # Grading writes nothing any more
+        self.assertFalse(CourseGrade.objects.exists())
+        self.assertFalse(AssessmentGrade.objects.exists())
+
+        self.assertEqual(result["combinations"], self.stored_combinations())
+        self.assertEqual(
+            [
+                (entry["course_code"], entry["scheme_name"], entry["final_percentage"], entry["letter_grade"], entry["gpa_value"])
+                for entry in result["individual_schemes"]
+            ],
+            [
+                (course.course_code, scheme.name if scheme else "Default", *stored_grade(course, scheme, assessments))
+                for course, schemes, assessments in self.course_schemes()
+                for scheme in schemes
+            ],
+        )
+
+    def test_course_grade_model_agrees(self):
+        course, schemes, assessments = self.course_schemes()[0]
+        expected = stored_grade(course, schemes[0], assessments)
+        course_grade = CourseGrade.objects.latest("id")
+        course_grade.calculate_from_assessments()
+        course_grade.refresh_from_db()
+        self.assertEqual(
+            (float(course_grade.final_percentage), course_grade.letter_grade, float(course_grade.gpa_value)),
+            expected,
+        )
+
+    def test_best_combination_takes_each_course_best_scheme(self):
+        stored = self.stored_combinations()
+        result = self.calculate(combinations_limit=1)
+        self.assertEqual(result["total_combinations"], 6)
+        # Present even though it isn't on the first page
+        self.assertEqual(result["best_combination"]["scheme_id"], "combo_2")
+        self.assertEqual(
+            result["best_combination"],
+            max(stored, key=lambda combo: (combo["overall_gpa"], combo["overall_final_percentage"])),
+        )
+        self.assertEqual(
+            [course["scheme_name"] for course in result["best_combination"]["per_course"]],
+            ["Final heavy", "Default", "Test"],
+        )
+
+    def test_pages_cover_every_combination_once(self):
+        stored = self.stored_combinations()
+        for limit in (1, 4, 6, 7):
+            with self.subTest(limit=limit):
+                pages = []
+                for offset in range(0, 6, limit):
+                    result = self.calculate(combinations_offset=offset, combinations_limit=limit)
+                    self.assertEqual((result["combinations_offset"], result["combinations_limit"]), (offset, limit))
+                    pages.extend(result["combinations"])
+                self.assertEqual(pages, stored)
+
+    def test_page_boundaries(self):
+        stored = self.stored_combinations()
+        self.assertEqual(self.calculate(combinations_offset=5, combinations_limit=3)["combinations"], stored[5:])
+        past_the_end = self.calculate(combinations_offset=6)
+        self.assertEqual(past_the_end["combinations"], [])
+        self.assertEqual(past_the_end["best_combination"]["scheme_id"], "combo_2")
+
+        clamped = self.calculate(combinations_offset=-3, combinations_limit=0)
+        self.assertEqual((clamped["combinations_offset"], clamped["combinations_limit"]), (0, 1))
+        self.assertEqual(clamped["combinations"], stored[:1])
+        self.assertEqual(self.calculate(combinations_limit=5000)["combinations_limit"], 1000)
+
+        response = self.post("calculate_gpa", {"offered_term": TERM, "courses": self.courses, "combinations_limit": "all"})
+        self.assertEqual(response.status_code, 400)
+
+
+class WeightMatrixTests(SchemeFixture, GpaCalcTestCase):
+    def test_four_queries_however_many_courses(self):
+        # Grade scales load once per process, not per request
+        grade_scale()
+        for courses in (self.courses[:1], self.courses, self.courses * 3):
+            with self.subTest(courses=len(courses)), self.assertNumQueries(4):
+                weights = load_weight_matrix(TERM, courses, include_course_events=True)
+                for course_weights, course in zip(weights, courses):
+                    for row in range(len(course_weights.schemes)):
+                        course_weights.grade(row, course["assessments"])
+            self.assertEqual(len(weights), len(courses))
+
+    def test_matrix_rows_fall_back_to_event_weightages(self):
+        design, programming, systems = load_weight_matrix(TERM, self.courses)
+        midterm, final, lab, quiz = CourseEvent.objects.filter(course=self.design).order_by("id")
+        # The unknown event gets no column
+        self.assertEqual(design.event_ids, [midterm.id, final.id, lab.id, quiz.id])
+        self.assertEqual(design.schemes, self.design_schemes)
+        self.assertEqual(design.matrix, [[20.0, 70.0, 10.0, 0.0], [40.0, 40.0, 20.0, 0.0]])
+        self.assertEqual(set(design.display[1]), {"Midterm", "Final"})
+
+        self.assertEqual(programming.schemes, [DEFAULT_SCHEME])
+        self.assertEqual(programming.matrix, [[12.5, 87.5]])
+        self.assertEqual(programming.display, [{"Assignment": "12.5%", "Exam": "87.5%"}])
+        self.assertEqual(systems.matrix, [[50.0, 50.0], [25.0, 75.0], [75.0, 25.0]])
+
+    def test_course_events_add_columns_without_marks(self):
+        course = dict(self.courses[0], assessments=self.courses[0]["assessments"][:1])
+        without, = load_weight_matrix(TERM, [course])
+        with_events, = load_weight_matrix(TERM, [course], include_course_events=True)
+        self.assertEqual(len(without.event_ids), 1)
+        self.assertEqual(
+            with_events.event_ids,
+            list(CourseEvent.objects.filter(course=self.design).order_by("id").values_list("id", flat=True)),
+        )
+        self.assertEqual(with_events.event_types[with_events.event_ids[-1]], "Quiz")
+
+    def test_missing_section_is_reported(self):
+        with self.assertRaises(Course.DoesNotExist):
+            load_weight_matrix(TERM, [dict(self.courses[0], section_number="02")])
+
+
+class TargetGradeTests(SchemeFixture, GpaCalcTestCase):
+    def unmarked(self, position, *event_types):
+        """Fixture course entry without marks for `event_types`"""
+        course = self.courses[position]
+        ids = set(CourseEvent.objects.filter(
+            course__course_code=course["course_code"], event_type__in=event_types,
+        ).values_list("id", flat=True))
+        return dict(course, assessments=[
+            dict(a, achieved=None) if a["event_id"] in ids else a for a in course["assessments"]
+        ])
+
+    def target(self, courses, **options):
+        response = self.post("target_grade", dict({"offered_term": TERM, "courses": courses}, **options))
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def best_at(self, courses, mark):
+        """calculate_gpa's best combination with every missing mark set to `mark`"""
+        filled = [
+            dict(course, assessments=[
+                dict(a, achieved=mark) if a["achieved"] is None else a for a in course["assessments"]
+            ])
+            for course in courses
+        ]
+        return self.post("calculate_gpa", {"offered_term": TERM, "courses": filled}).json()["best_combination"]
+
+    def test_letter_boundary_is_exact(self):
+        self.assertEqual(target_threshold({"letter_grade": "A-"}), 80.0)
+        self.assertEqual(target_threshold({"letter_grade": "a-"}), 80.0)
+        self.assertEqual(target_threshold({"gpa": 3.7}), 80.0)
+        self.assertEqual(target_threshold({"letter_grade": "F"}), 0.0)
+
+        course = dict(self.unmarked(1, "Exam"), target={"letter_grade": "A-"})
+        entry = self.target([course])["courses"][0]
+        self.assertEqual(entry["target_percentage"], 80.0)
+        scheme, = entry["schemes"]
+        mark = scheme["required_mark"]
+        self.assertEqual(scheme["remaining_weight"], 87.5)
+        self.assertEqual(scheme["projected"]["letter_grade"], "A-")
+        # calculate_gpa agrees: the mark reaches A-, a hundredth less doesn't
+        self.assertEqual(self.best_at([course], mark)["per_course"][0]["letter_grade"], "A-")
+        below = self.best_at([course], round(mark - 0.01, 2))["per_course"][0]
+        self.assertLess(below["final_percentage"], 80.0)
+
+    def test_already_secured_target_needs_nothing(self):
+        course = dict(self.unmarked(2, "Project"), target={"percentage": 60})
+        entry = self.target([course])["courses"][0]
+        self.assertEqual(
+            [(scheme["scheme_name"], scheme["required_mark"]) for scheme in entry["schemes"]],
+            [("Standard", 29.0), ("Project", 49.67), ("Test", 0.0)],
+        )
+        self.assertEqual(entry["best_scheme"]["scheme_name"], "Test")
+
+        # Nothing left to write, and the marks so far already give an A
+        finished = self.target([dict(self.courses[0], target={"letter_grade": "A"})])["courses"][0]
+        self.assertEqual(finished["schemes"][0]["remaining"], [])
+        self.assertEqual(finished["schemes"][0]["required_mark"], 0.0)
+        self.assertEqual(finished["best_scheme"]["scheme_name"], "Final heavy")
+
+    def test_unreachable_target(self):
+        entry = self.target([dict(self.courses[0], target={"letter_grade": "A+"})])["courses"][0]
+        for scheme in entry["schemes"]:
+            self.assertIsNone(scheme["required_mark"])
+            self.assertFalse(scheme["achievable"])
+            self.assertIsNone(scheme["projected"])
+        self.assertIsNone(entry["best_scheme"])
+
+    def test_overall_gpa_target(self):
+        courses = [self.unmarked(0, "Final"), self.unmarked(1, "Exam"), self.unmarked(2, "Project")]
+        overall = self.target(courses, target={"gpa": 3.5})["overall"]
+        mark = overall["required_mark"]
+        self.assertTrue(overall["achievable"])
+        best = self.best_at(courses, mark)
+        self.assertGreaterEqual(best["overall_gpa"], 3.5)
+        self.assertEqual((overall["overall_gpa"], overall["schemes_used"]), (best["overall_gpa"], best["schemes_used"]))
+        self.assertLess(self.best_at(courses, round(mark - 0.01, 2))["overall_gpa"], 3.5)
+
+        unreachable = self.target(courses, target={"gpa": 4.5})["overall"]
+        self.assertIsNone(unreachable["required_mark"])
+        self.assertFalse(unreachable["achievable"])
 
-# Create your tests here.
+    def test_malformed_targets_are_rejected(self):
+        for options, course_target in (
+            ({}, {"letter_grade": "Z"}),
+            ({}, {"grade": "A"}),
+            ({"target": {"letter_grade": "A"}}, None),
+        ):
+            course = dict(self.courses[0], target=course_target)
+            response = self.post("target_grade", dict({"offered_term": TERM, "courses": [course]}, **options))
+            self.assertEqual(response.status_code, 400, (options, course_target))
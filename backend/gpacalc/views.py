@@ -3,7 +3,13 @@ from django.http import JsonResponse, HttpResponse
 from django.views.decorators.http import require_GET, require_POST, require_http_methods
 from django.views.decorators.csrf import csrf_exempt
 from scheduler.models import Course, CourseEvent
-from .models import CourseGrade, AssessmentGrade, GpaCalcProgress, GradingScheme, AssessmentWeightage
+from scheduler.http_cache import conditional_read, request_data
+from .models import GpaCalcProgress, GradingScheme, AssessmentWeightage
+from .grading import grade_scale
+from .weights import DEFAULT_SCHEME, load_weight_matrix
+from .targets import (
+    Outlook, overall_grade, overall_required_mark, projected, required_mark, result_summary, target_threshold,
+)
 from openpyxl import Workbook
 from openpyxl.styles import Font, PatternFill
 from openpyxl.utils import get_column_letter
@@ -12,8 +18,13 @@ import logging
 
 logger = logging.getLogger(__name__)
 app_name = "GPA-Calculator"
+# Scheme combinations returned per calculate_gpa page
+COMBINATIONS_LIMIT = 100
+MAX_COMBINATIONS_LIMIT = 1000
+
 @require_http_methods(["GET", "POST"])
 @csrf_exempt
+@conditional_read
 def get_offered_terms(request):
     """
     API: Get all available terms
@@ -23,8 +34,10 @@ def get_offered_terms(request):
     
     Frontend usage:
     - Call to populate term dropdown in UI
+    - Prefer GET with the same fields as query parameters; responses carry an ETag
+      and unchanged data is answered with 304 Not Modified
     """
-    data = json.loads(request.body) if request.body else {}
+    data = request_data(request)
     # Added has_events flag because for scheduler app, we don't need to have courses with events
     # And we won't have events when students will use scheduler app because by then we wont have 
     # Course outlines to extract events from.
@@ -49,8 +62,9 @@ def get_offered_terms(request):
     
     return response
 
-@require_POST
+@require_http_methods(["GET", "POST"])
 @csrf_exempt
+@conditional_read
 def get_course_types(request):
     """
     API: Get course types for a given term
@@ -63,9 +77,11 @@ def get_course_types(request):
     
     Frontend usage:
     - Call when user selects a term to populate the course type dropdown
+    - Prefer GET with the same fields as query parameters; responses carry an ETag
+      and unchanged data is answered with 304 Not Modified
     """
     
-    data = json.loads(request.body)
+    data = request_data(request)
     cterm = data.get("offered_term")
     # Added has_events flag because for scheduler app, we don't need to have courses with events
     # And we won't have events when students will use scheduler app because by then we wont have 
@@ -91,8 +107,9 @@ def get_course_types(request):
     response = JsonResponse(list(types), safe=False)
     return response
 
-@require_POST
+@require_http_methods(["GET", "POST"])
 @csrf_exempt
+@conditional_read
 def get_course_codes(request):
     """
     API: Get course codes for a given course type and term
@@ -108,8 +125,10 @@ def get_course_codes(request):
     
     Frontend usage:
     - Call when user selects a course type to populate the course code dropdown
+    - Prefer GET with the same fields as query parameters; responses carry an ETag
+      and unchanged data is answered with 304 Not Modified
     """
-    data = json.loads(request.body)
+    data = request_data(request)
     # Added has_events flag because for scheduler app, we don't need to have courses with events
     # And we won't have events when students will use scheduler app because by then we wont have 
     # Course outlines to extract events from.
@@ -134,8 +153,9 @@ def get_course_codes(request):
         )
     return JsonResponse(list(codes), safe=False)
 
-@require_POST
+@require_http_methods(["GET", "POST"])
 @csrf_exempt
+@conditional_read
 def get_section_numbers(request):
     """
     API: Get section numbers for a given course type, code, and term
@@ -152,8 +172,10 @@ def get_section_numbers(request):
     
     Frontend usage:
     - Call when user selects a course code to populate the section dropdown
+    - Prefer GET with the same fields as query parameters; responses carry an ETag
+      and unchanged data is answered with 304 Not Modified
     """
-    data = json.loads(request.body)
+    data = request_data(request)
      # Added has_events flag because for scheduler app, we don't need to have courses with events
     # And we won't have events when students will use scheduler app because by then we wont have 
     # Course outlines to extract events from.
@@ -179,8 +201,9 @@ def get_section_numbers(request):
         )
     return JsonResponse(list(secs), safe=False)
 
-@require_POST
+@require_http_methods(["GET", "POST"])
 @csrf_exempt
+@conditional_read
 def get_course_events(request):
     """
     API: Get assessment events for a specific course section
@@ -208,8 +231,10 @@ def get_course_events(request):
     - Call when user selects a section to display assessment components
     - Display each event with its weight and an input field for the achieved grade
     - Store the event_id with each input field to submit with calculations
+    - Prefer GET with the same fields as query parameters; responses carry an ETag
+      and unchanged data is answered with 304 Not Modified
     """
-    data = json.loads(request.body)
+    data = request_data(request)
     ctype = data.get("course_type")
     code = data.get("course_code")
     csn = data.get("section_number")
@@ -243,12 +268,15 @@ def calculate_gpa(request):
                     ]
                 },
                 ...
-            ]
+            ],
+            "combinations_offset": 0,    // Optional, first combination to return
+            "combinations_limit": 100,   // Optional, combinations per page (max 1000)
+            "grade_scale": "Percentage"  // Optional GradeScale name, defaults to the default scale
         }
     
     Returns:
         JSON: {
-            "combinations": [
+            "combinations": [  // One page of all scheme combinations, in order
                 {
                     "scheme_id": "combo_0",
                     "scheme_name": "CS 101: Default + MATH 135: Scheme A",
@@ -270,6 +298,9 @@ def calculate_gpa(request):
                 ...
             ],
             "best_combination": {...},  // The combination with the highest GPA
+            "total_combinations": 12,
+            "combinations_offset": 0,
+            "combinations_limit": 100,
             "individual_schemes": [
                 {
                     "course": "CS101-001",
@@ -297,148 +328,93 @@ def calculate_gpa(request):
     - Allow users to explore different grading scheme combinations
     - Show how each grading scheme affects individual course grades
     - For logged-in users, this data is automatically saved
+    - Overall GPA is a credit-weighted sum, so best_combination is simply the best
+      scheme per course and is always present, even when it is not on the current
+      combinations page; request further pages with combinations_offset
     """
     
     data = json.loads(request.body)
     offered_term = data.get("offered_term")
-    
-    # Store course objects and their schemes for permutation calculation
+    try:
+        combinations_offset = max(0, int(data.get("combinations_offset", 0)))
+        combinations_limit = min(MAX_COMBINATIONS_LIMIT, max(1, int(data.get("combinations_limit", COMBINATIONS_LIMIT))))
+    except (TypeError, ValueError):
+        return JsonResponse({"error": "combinations_offset and combinations_limit must be integers"}, status=400)
+    try:
+        scale = grade_scale(data.get("grade_scale") or None)
+    except ValueError as e:
+        return JsonResponse({"error": str(e)}, status=400)
+    
+    # Load every course, scheme and weightage the request needs up front
     course_schemes = []
     total_credit = 0
     
-    # First pass: Gather all courses and their available schemes
-    for c in data.get("courses", []):
-        course_obj = Course.objects.get(
-            course_type=c["course_type"],
-            course_code=c["course_code"],
-            section_number=c["section_number"],
-            offered_term=offered_term,
-        )
-        
-        total_credit += float(course_obj.credits)
-        
-        # Get all grading schemes for this course
-        grading_schemes = list(GradingScheme.objects.filter(course=course_obj))
-        
-        # If no schemes exist, create a virtual default one
-        if not grading_schemes:
-            course_schemes.append({
-                "course": course_obj,
-                "assessments": c.get("assessments", []),
-                "schemes": ["default"]  # Use special marker for default scheme
-            })
-        else:
-            course_schemes.append({
-                "course": course_obj,
-                "assessments": c.get("assessments", []),
-                "schemes": grading_schemes
-            })
-    
-    # Generate all possible scheme combinations
-    def get_scheme_combinations(courses_with_schemes, current=None, index=0):
-        if current is None:
-            current = []
-        
-        if index >= len(courses_with_schemes):
-            return [current]
-        
-        result = []
-        course_data = courses_with_schemes[index]
-        for scheme in course_data["schemes"]:
-            new_current = current + [(course_data["course"], course_data["assessments"], scheme)]
-            result.extend(get_scheme_combinations(courses_with_schemes, new_current, index+1))
-        
-        return result
-    
-    all_combinations = get_scheme_combinations(course_schemes)
-    
-    # Calculate GPA for each combination
-    combination_results = []
+    for c, weights in zip(data.get("courses", []), load_weight_matrix(offered_term, data.get("courses", []))):
+        total_credit += float(weights.course.credits)
+        course_schemes.append({
+            "course": weights.course,
+            "assessments": c.get("assessments", []),
+            "schemes": weights.schemes,  # [DEFAULT_SCHEME] if the course has no GradingScheme
+            "weights": weights,
+        })
     
-    for combo in all_combinations:
-        combo_total_points = 0
-        combo_total_weighted_percentage = 0
-        combo_courses = []
-        scheme_names = []
-        
-        for course_obj, assessments, scheme in combo:
-            if scheme == "default":
-                # Use default weightages
-                course_grade = calculate_for_default_scheme(course_obj, assessments)
-                scheme_name = "Default"
-            else:
-                # Use scheme weightages
-                course_grade = calculate_for_scheme(course_obj, scheme, assessments)
-                scheme_name = scheme.name
-            
-            scheme_names.append(f"{course_obj.course_type} {course_obj.course_code}: {scheme_name}")
+    # Grade every (course, scheme) pair exactly once
+    for course_data in course_schemes:
+        course_obj = course_data["course"]
+        course_data["results"] = []
+        for row, scheme in enumerate(course_data["schemes"]):
+            course_grade = course_data["weights"].grade(row, course_data["assessments"], scale)
+            scheme_name = "Default" if scheme == DEFAULT_SCHEME else scheme.name
             
-            course_result = {
+            course_data["results"].append((course_grade, {
                 "course": str(course_obj),
                 "final_percentage": float(course_grade.final_percentage) if course_grade.final_percentage else 0,
                 "letter_grade": course_grade.letter_grade or "N/A",
                 "gpa_value": float(course_grade.gpa_value) if course_grade.gpa_value else 0,
                 "credits": float(course_obj.credits),
                 "scheme_name": scheme_name
-            }
-            
-            combo_courses.append(course_result)
-            
-            if course_grade.gpa_value:
-                combo_total_points += float(course_grade.gpa_value) * float(course_obj.credits)
-                
-            if course_grade.final_percentage:
-                combo_total_weighted_percentage += float(course_grade.final_percentage) * float(course_obj.credits)
-        
-        # Calculate overall GPA for this combination
-        combo_overall_gpa = round(combo_total_points / total_credit, 2) if total_credit > 0 else 0
-        combo_overall_percentage = round(combo_total_weighted_percentage / total_credit, 2) if total_credit > 0 else 0
-        
-        combination_results.append({
-            "scheme_id": f"combo_{len(combination_results)}",
-            "scheme_name": " + ".join(scheme_names),
-            "per_course": combo_courses,
-            "overall_gpa": combo_overall_gpa,
-            "overall_final_percentage": combo_overall_percentage,
-            "schemes_used": scheme_names
-        })
+            }))
     
-    # Find the best combination
-    best_combo = max(
-        combination_results, 
-        key=lambda x: (x["overall_gpa"], x["overall_final_percentage"])
-    ) if combination_results else {}
+    # Combinations are the Cartesian product of the course schemes, numbered
+    # with the last course varying fastest; only the requested page is built
+    total_combinations = 1
+    for course_data in course_schemes:
+        total_combinations *= len(course_data["schemes"])
+    page_end = min(total_combinations, combinations_offset + combinations_limit)
+    combination_results = [
+        _build_combination(index, course_schemes, total_credit)
+        for index in range(combinations_offset, page_end)
+    ]
+    
+    # The best combination takes each course's best scheme (first one on ties)
+    best_choices = []
+    for course_data in course_schemes:
+        points = [
+            (result["gpa_value"] * result["credits"], result["final_percentage"] * result["credits"])
+            for _, result in course_data["results"]
+        ]
+        best_choices.append(max(range(len(points)), key=points.__getitem__))
+    best_combo = _build_combination(
+        _combination_index(best_choices, course_schemes), course_schemes, total_credit
+    )
     
     # Also prepare individual scheme results for each course (for UI display)
     individual_scheme_results = []
     
     for course_data in course_schemes:
         course_obj = course_data["course"]
-        assessments = course_data["assessments"]
         
-        for scheme in course_data["schemes"]:
-            if scheme == "default":
-                course_grade = calculate_for_default_scheme(course_obj, assessments)
+        for scheme, weightages, (course_grade, _) in zip(
+            course_data["schemes"], course_data["weights"].display, course_data["results"]
+        ):
+            if scheme == DEFAULT_SCHEME:
                 scheme_name = "Default"
                 scheme_id = "default"
                 scheme_description = "Default grading scheme"
-                weightages = {}
-                
-                # Get weightages for display
-                for event in CourseEvent.objects.filter(course=course_obj):
-                    if event.weightage:
-                        weightages[event.event_type] = event.weightage
-                
             else:
-                course_grade = calculate_for_scheme(course_obj, scheme, assessments)
                 scheme_name = scheme.name
                 scheme_id = str(scheme.id)
                 scheme_description = scheme.description or ""
-                
-                # Get weightages for display
-                weightages = {}
-                for w in AssessmentWeightage.objects.filter(grading_scheme=scheme):
-                    weightages[w.course_event.event_type] = f"{w.weightage}%"
             
             individual_scheme_results.append({
                 "course": str(course_obj),
@@ -473,6 +449,9 @@ def calculate_gpa(request):
     result_data = {
         "combinations": combination_results,
         "best_combination": best_combo,
+        "total_combinations": total_combinations,
+        "combinations_offset": combinations_offset,
+        "combinations_limit": combinations_limit,
         "individual_schemes": individual_scheme_results,
         "total_credit": float(total_credit),
         "courses": clean_courses,
@@ -491,87 +470,201 @@ def calculate_gpa(request):
     return JsonResponse(result_data)
 
 
-def calculate_for_default_scheme(course, assessments):
+@require_POST
+@csrf_exempt
+def target_grade(request):
     """
-    Calculate grades using the default weightages from CourseEvent
+    API: Solve for the marks needed on the remaining assessments to reach a target grade
+    
+    Request:
+        JSON: {
+            "offered_term": "Fall 2025",
+            "courses": [
+                {
+                    "course_type": "CS",
+                    "course_code": "101",
+                    "section_number": "001",
+                    "assessments": [
+                        {"event_id": 12, "achieved": 87.5},
+                        {"event_id": 13, "achieved": null},  // Not written yet
+                        ...
+                    ],
+                    "target": {"letter_grade": "A-"}  // Optional, or {"gpa": 3.7} or {"percentage": 80}
+                },
+                ...
+            ],
+            "target": {"gpa": 3.5},  // Optional overall target, or {"percentage": 80}
+            "grade_scale": "Percentage"  // Optional GradeScale name, as in calculate_gpa
+        }
     
-    Args:
-        course: Course object
-        assessments: List of assessment data with event_id and achieved percentage
-        
     Returns:
-        CourseGrade object with calculated final percentage, letter grade and GPA value
+        JSON: {
+            "courses": [
+                {
+                    "course": "CS101-001",
+                    "course_type": "CS",
+                    "course_code": "101",
+                    "section_number": "001",
+                    "target": {"letter_grade": "A-"},
+                    "target_percentage": 80.0,
+                    "schemes": [
+                        {
+                            "scheme_id": "default",
+                            "scheme_name": "Default",
+                            "current": {"final_percentage": 41.5, "letter_grade": "F", "gpa_value": 0},
+                            "remaining": [{"event_id": 13, "event_type": "Final", "weightage": 50.0}],
+                            "remaining_weight": 50.0,
+                            "required_mark": 76.5,  // null if the target can't be reached
+                            "achievable": true,
+                            "projected": {"final_percentage": 80.0, "letter_grade": "A-", "gpa_value": 3.7}
+                        },
+                        ...
+                    ],
+                    "best_scheme": {...}  // Scheme needing the lowest mark, null if none can reach it
+                },
+                ...
+            ],
+            "overall": {  // Only with an overall target
+                "target": {"gpa": 3.5},
+                "required_mark": 81.25,
+                "achievable": true,
+                "overall_gpa": 3.5,
+                "overall_final_percentage": 82.1,
+                "schemes_used": ["CS 101: Default", ...]
+            },
+            "offered_term": "Fall 2025"
+        }
+    
+    Frontend usage:
+    - Answers "what do I need on the final to get an A-?" in one request
+    - Assessments without a mark (achieved null or not sent) are the remaining ones;
+      required_mark is the same mark needed on each of them, to the hundredth
+    - For the overall target every course uses its best scheme at that mark
+    - Grades are computed exactly as calculate_gpa computes them
     """
-    cg = CourseGrade.objects.create(course=course)
+    data = json.loads(request.body)
+    offered_term = data.get("offered_term")
+    courses = data.get("courses", [])
+    
+    try:
+        scale = grade_scale(data.get("grade_scale") or None)
+        thresholds = [target_threshold(c["target"], scale) if c.get("target") is not None else None for c in courses]
+    except (TypeError, ValueError) as e:
+        return JsonResponse({"error": str(e)}, status=400)
+    
+    try:
+        course_weights = load_weight_matrix(offered_term, courses, include_course_events=True)
+    except Course.DoesNotExist as e:
+        return JsonResponse({"error": str(e)}, status=404)
+    
+    course_results = []
+    overall_courses = []
+    for c, weights, threshold in zip(courses, course_weights, thresholds):
+        course_obj = weights.course
+        outlooks = [
+            Outlook.from_weights(weights, row, c.get("assessments", []), scale)
+            for row in range(len(weights.schemes))
+        ]
+        overall_courses.append((float(course_obj.credits), outlooks))
+        
+        schemes = []
+        for scheme, outlook in zip(weights.schemes, outlooks):
+            mark = required_mark(outlook, threshold) if c.get("target") is not None else None
+            schemes.append({
+                "scheme_id": "default" if scheme == DEFAULT_SCHEME else str(scheme.id),
+                "scheme_name": "Default" if scheme == DEFAULT_SCHEME else scheme.name,
+                "current": result_summary(outlook.grade()),
+                "remaining": [
+                    {"event_id": event_id, "event_type": weights.event_types[event_id], "weightage": weight}
+                    for event_id, weight in outlook.remaining
+                ],
+                "remaining_weight": round(sum(weight for _, weight in outlook.remaining), 2),
+                "required_mark": mark,
+                "achievable": mark is not None,
+                "projected": projected(outlook, mark),
+            })
+        
+        reachable = [entry for entry in schemes if entry["achievable"]]
+        course_results.append({
+            "course": str(course_obj),
+            "course_type": course_obj.course_type,
+            "course_code": course_obj.course_code,
+            "section_number": course_obj.section_number,
+            "target": c.get("target"),
+            "target_percentage": threshold,
+            "schemes": schemes,
+            "best_scheme": min(reachable, key=lambda entry: entry["required_mark"]) if reachable else None,
+        })
     
-    for a in assessments:
+    result_data = {"courses": course_results, "offered_term": offered_term or ""}
+    
+    if data.get("target") is not None:
         try:
-            ev = CourseEvent.objects.get(id=a["event_id"])
-            # Parse weightage to decimal (strip % if present)
-            raw_weight = ev.weightage or 0
-            if isinstance(raw_weight, str) and raw_weight.endswith("%"):
-                raw_weight = raw_weight.rstrip("%")
-            try:
-                weight = float(raw_weight)
-            except Exception:
-                weight = 0
-                
-            AssessmentGrade.objects.create(
-                course_grade=cg,
-                course_event=ev,
-                weightage=weight,
-                achieved_percentage=a["achieved"]
-            )
-        except Exception as e:
-            continue  # Skip invalid assessments
+            mark = overall_required_mark(overall_courses, data["target"])
+        except (TypeError, ValueError) as e:
+            return JsonResponse({"error": str(e)}, status=400)
+        # Show where the best marks (or the required mark) would leave the student
+        overall_gpa, overall_percentage, choices = overall_grade(overall_courses, 100.0 if mark is None else mark)
+        result_data["overall"] = {
+            "target": data["target"],
+            "required_mark": mark,
+            "achievable": mark is not None,
+            "overall_gpa": overall_gpa,
+            "overall_final_percentage": overall_percentage,
+            "schemes_used": [
+                f"{weights.course.course_type} {weights.course.course_code}: "
+                f"{'Default' if weights.schemes[choice] == DEFAULT_SCHEME else weights.schemes[choice].name}"
+                for weights, choice in zip(course_weights, choices)
+            ],
+        }
     
-    cg.calculate_from_assessments()
-    return cg
+    return JsonResponse(result_data)
 
 
-def calculate_for_scheme(course, scheme, assessments):
+def _combination_index(choices, course_schemes):
+    """Number of a combination given the chosen scheme position of each course"""
+    index = 0
+    for choice, course_data in zip(choices, course_schemes):
+        index = index * len(course_data["schemes"]) + choice
+    return index
+
+
+def _build_combination(index, course_schemes, total_credit):
     """
-    Calculate grades using a specific grading scheme
-    
-    Args:
-        course: Course object
-        scheme: GradingScheme object
-        assessments: List of assessment data with event_id and achieved percentage
-        
-    Returns:
-        CourseGrade object with calculated final percentage, letter grade and GPA value
+    Result entry of the index-th scheme combination (see calculate_gpa),
+    decoded from the per-course results without recomputing any grade
     """
-    cg = CourseGrade.objects.create(course=course)
-    
-    for a in assessments:
-        try:
-            ev = CourseEvent.objects.get(id=a["event_id"])
-            
-            # Get weightage from the grading scheme
-            try:
-                aw = AssessmentWeightage.objects.get(grading_scheme=scheme, course_event=ev)
-                weight = float(aw.weightage)
-            except AssessmentWeightage.DoesNotExist:
-                # Fall back to event's weightage
-                raw_weight = ev.weightage or 0
-                if isinstance(raw_weight, str) and raw_weight.endswith("%"):
-                    raw_weight = raw_weight.rstrip("%")
-                try:
-                    weight = float(raw_weight)
-                except Exception:
-                    weight = 0
+    choices = []
+    for course_data in reversed(course_schemes):
+        index, choice = divmod(index, len(course_data["schemes"]))
+        choices.append(choice)
+    choices.reverse()
+    
+    combo_total_points = 0
+    combo_total_weighted_percentage = 0
+    combo_courses = []
+    scheme_names = []
+    
+    for choice, course_data in zip(choices, course_schemes):
+        course_obj = course_data["course"]
+        course_grade, course_result = course_data["results"][choice]
+        scheme_names.append(f"{course_obj.course_type} {course_obj.course_code}: {course_result['scheme_name']}")
+        combo_courses.append(dict(course_result))
+        
+        if course_grade.gpa_value:
+            combo_total_points += float(course_grade.gpa_value) * float(course_obj.credits)
             
-            AssessmentGrade.objects.create(
-                course_grade=cg,
-                course_event=ev,
-                weightage=weight,
-                achieved_percentage=a["achieved"]
-            )
-        except Exception as e:
-            None
-    
-    cg.calculate_from_assessments()
-    return cg
+        if course_grade.final_percentage:
+            combo_total_weighted_percentage += float(course_grade.final_percentage) * float(course_obj.credits)
+    
+    return {
+        "scheme_id": f"combo_{_combination_index(choices, course_schemes)}",
+        "scheme_name": " + ".join(scheme_names),
+        "per_course": combo_courses,
+        "overall_gpa": round(combo_total_points / total_credit, 2) if total_credit > 0 else 0,
+        "overall_final_percentage": round(combo_total_weighted_percentage / total_credit, 2) if total_credit > 0 else 0,
+        "schemes_used": scheme_names
+    }
 
 
 @require_GET
@@ -0,0 +1,180 @@
+# gpacalc/weights.py
+"""
+Prefetched weightages for the GPA calculator.
+
+calculate_gpa used to look up every assessment's CourseEvent and
+AssessmentWeightage one query at a time, for every scheme, and then query
+them again to display each scheme's weightages. load_weight_matrix() reads
+everything a request needs in four queries (courses, grading schemes, course
+events, scheme weightages) and gives each course a dense scheme x event
+weight matrix. Grading and display then work from memory only.
+
+Matrix values are rounded like the assessment columns (see
+grading.column_value()). A weightage the column would reject is stored as
+None, which leaves the assessment out of the grade, as before.
+"""
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from django.db.models import Q
+
+from scheduler.models import Course, CourseEvent
+from .grading import AssessmentMark, column_value, grade_assessments, parse_weightage
+from .models import AssessmentWeightage, GradingScheme
+
+# Scheme marker for courses without any GradingScheme
+DEFAULT_SCHEME = "default"
+
+
+def _event_id(value):
+    """Submitted event_id as an int, or None if it can't be one"""
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _column(weight):
+    try:
+        return column_value(weight)
+    except ValueError:
+        return None
+
+
+@dataclass
+class CourseWeights:
+    """
+    Grading schemes of one requested course and their weights.
+
+    Attributes:
+        course: Course object
+        schemes: GradingScheme objects, or [DEFAULT_SCHEME] when the course has none
+        event_ids: matrix columns, the existing events the request submitted marks
+            for (and the course's other events if requested)
+        matrix: one row per scheme, the weight of each column (None if unusable)
+        display: one {event_type: weightage} dict per scheme, for the UI
+        event_types: event_type of each column's event
+    """
+    course: object
+    schemes: list
+    event_ids: List[int]
+    matrix: List[List[Optional[float]]]
+    display: List[Dict[str, str]]
+    event_types: Dict[int, str] = field(default_factory=dict)
+    columns: Dict[int, int] = field(init=False, repr=False)
+
+    def __post_init__(self):
+        self.columns = {event_id: column for column, event_id in enumerate(self.event_ids)}
+
+    def marks(self, row, assessments):
+        """
+        AssessmentMarks of the submitted assessments under scheme `row`.
+        Assessments with unknown events or unusable marks are skipped.
+        """
+        weights = self.matrix[row]
+        marks = []
+        for a in assessments:
+            try:
+                column = self.columns[_event_id(a["event_id"])]
+                marks.append(AssessmentMark(self.event_ids[column], weights[column], column_value(a["achieved"])))
+            except (KeyError, TypeError, ValueError):
+                continue  # Skip invalid assessments
+        return marks
+
+    def grade(self, row, assessments, scale=None):
+        """CourseResult of the submitted assessments under scheme `row`, graded on `scale`"""
+        return grade_assessments(self.marks(row, assessments), scale)
+
+
+def load_weight_matrix(offered_term, courses, include_course_events=False):
+    """
+    Load the weights of every requested course.
+
+    Args:
+        offered_term: term of the courses
+        courses: calculate_gpa course entries with course_type, course_code,
+            section_number and assessments
+        include_course_events: also give a column to every event of the
+            course, including those without a submitted mark
+
+    Returns:
+        list of CourseWeights, in request order
+
+    Raises:
+        Course.DoesNotExist: if a requested section does not exist
+    """
+    if not courses:
+        return []
+
+    keys = [(c["course_type"], c["course_code"], c["section_number"]) for c in courses]
+    query = Q()
+    for course_type, course_code, section_number in set(keys):
+        query |= Q(course_type=course_type, course_code=course_code, section_number=section_number)
+    found = {
+        (course.course_type, course.course_code, course.section_number): course
+        for course in Course.objects.filter(query, offered_term=offered_term)
+    }
+    for key in keys:
+        if key not in found:
+            raise Course.DoesNotExist(f"Course {'*'.join(key)} not found in {offered_term}")
+    course_ids = {course.course_id for course in found.values()}
+
+    schemes = {}
+    for scheme in GradingScheme.objects.filter(course_id__in=course_ids).order_by("id"):
+        schemes.setdefault(scheme.course_id, []).append(scheme)
+
+    # Submitted events are looked up by id alone, like the per-assessment
+    # queries were; the courses' own events are needed for display
+    submitted = [
+        [_event_id(a.get("event_id")) if isinstance(a, dict) else None for a in c.get("assessments", [])]
+        for c in courses
+    ]
+    submitted_ids = {event_id for ids in submitted for event_id in ids if event_id is not None}
+    events = {}
+    course_events = {}
+    for ev in CourseEvent.objects.filter(Q(course_id__in=course_ids) | Q(id__in=submitted_ids)).values(
+        "id", "course_id", "event_type", "weightage"
+    ):
+        events[ev["id"]] = ev
+        course_events.setdefault(ev["course_id"], []).append(ev)
+
+    scheme_weights = {}
+    for w in AssessmentWeightage.objects.filter(
+        grading_scheme__course_id__in=course_ids
+    ).values("grading_scheme_id", "course_event_id", "course_event__event_type", "weightage"):
+        scheme_weights.setdefault(w["grading_scheme_id"], []).append(w)
+
+    result = []
+    for key, ids in zip(keys, submitted):
+        course = found[key]
+        event_ids = [event_id for event_id in ids if event_id in events]
+        if include_course_events:
+            event_ids += [ev["id"] for ev in course_events.get(course.course_id, [])]
+        event_ids = list(dict.fromkeys(event_ids))
+        columns = {event_id: column for column, event_id in enumerate(event_ids)}
+        event_types = {event_id: events[event_id]["event_type"] for event_id in event_ids}
+        default_row = [_column(parse_weightage(events[event_id]["weightage"])) for event_id in event_ids]
+
+        course_schemes = schemes.get(course.course_id)
+        if not course_schemes:
+            display = {}
+            for ev in course_events.get(course.course_id, []):
+                if ev["weightage"]:
+                    display[ev["event_type"]] = ev["weightage"]
+            result.append(CourseWeights(course, [DEFAULT_SCHEME], event_ids, [default_row], [display], event_types))
+            continue
+
+        matrix = []
+        displays = []
+        for scheme in course_schemes:
+            # Events the scheme doesn't weigh fall back to the event's weightage
+            row = list(default_row)
+            display = {}
+            for w in scheme_weights.get(scheme.id, []):
+                display[w["course_event__event_type"]] = f"{w['weightage']}%"
+                if w["course_event_id"] in columns:
+                    row[columns[w["course_event_id"]]] = _column(float(w["weightage"]))
+            matrix.append(row)
+            displays.append(display)
+        result.append(CourseWeights(course, course_schemes, event_ids, matrix, displays, event_types))
+    return result
@@ -15,6 +15,41 @@ request_duration = Histogram(
     ['method', 'endpoint']
 )
 
+schedule_cache_requests = Counter(
+    'scheduler_schedule_cache_total',
+    'Conflict-free schedule result cache lookups',
+    ['result']
+)
+
+# Schedule generator instrumentation, labelled by the number of courses requested
+schedule_phase_duration = Histogram(
+    'scheduler_schedule_phase_seconds',
+    'Time spent in each phase of conflict-free schedule generation',
+    ['phase', 'courses'],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+)
+
+schedule_search_nodes = Histogram(
+    'scheduler_schedule_search_nodes',
+    'Search nodes visited per conflict-free schedule request',
+    ['courses'],
+    buckets=(10, 100, 1000, 10000, 50000, 100000, 500000, 1000000, 5000000)
+)
+
+schedule_search_pruned = Histogram(
+    'scheduler_schedule_search_pruned',
+    'Conflicting sections pruned per search depth per request',
+    ['depth'],
+    buckets=(0, 10, 100, 1000, 10000, 100000, 1000000)
+)
+
+schedule_search_branching = Histogram(
+    'scheduler_schedule_search_branching_factor',
+    'Average sections placed per expanded search node',
+    ['courses'],
+    buckets=(1, 1.5, 2, 3, 4, 6, 8, 12, 16, 24, 32)
+)
+
 def metrics_view(request):
     """Endpoint for Prometheus to scrape metrics"""
     return HttpResponse(generate_latest(), content_type=CONTENT_TYPE_LATEST)
\ No newline at end of file
@@ -7,6 +7,9 @@ django.setup()
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'coursescheduler.settings')
 from django.db import transaction
 from scheduler.models import Course, CourseEvent
+from scheduler.term_index import invalidate_term
+from scheduler.schedule_cache import invalidate_schedule_cache
+from scheduler.conflicts import encode_event
 from gpacalc.models import GradingScheme, AssessmentWeightage
 from coopforum.models import Post as CoopPost
 from django.contrib.auth import authenticate
@@ -57,12 +60,15 @@ def insert_cleaned_sections(courses_data):
     }
     db_connection, db_cursor = get_db_connection()
     # log_debug(f"course_data = {courses_data}")
+    # Terms touched by this run, their in-memory section indexes must be rebuilt
+    updated_terms = set()
     try:
         # Process each course
         for course_codes, term_sections in courses_data.items():
             # Process each term for the current course
             for term, sections in term_sections.items():
                 logger.info(f"Processing term: {term}")
+                updated_terms.add(term[:20] if term else '')
                 
                 # Process each section in the term
                 for sectioninfo in sections:
@@ -168,18 +174,27 @@ def insert_cleaned_sections(courses_data):
                         days_str = ", ".join(days_list) if days_list else "TBD"
                         time_range_str = time_range if time_range else "TBD"
                         date_range_str = date_range if date_range else ""
+                        # Precompiled columns, the scheduler reads these instead of the strings
+                        encoded = encode_event(time_range_str, days_str, date_range_str)
                         # Insert event
                         insert_event_query = """
                             INSERT INTO events 
-                            (course_id, event_type, times, location, days, dates)
-                            VALUES (%s, %s, %s, %s, %s, %s)
+                            (course_id, event_type, times, location, days, dates,
+                             start_minute, end_minute, day_mask, start_date, end_date)
+                            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
                         """
                         db_cursor.execute(insert_event_query, 
                                         (course_id, event_type, time_range_str, location, 
-                                        days_str, date_range_str))
+                                        days_str, date_range_str,
+                                        encoded["start_minute"], encoded["end_minute"], encoded["day_mask"],
+                                        encoded["start_date"], encoded["end_date"]))
 
         db_connection.commit()
         logger.info("Successfully inserted all sections and events")
+        # Raw SQL inserts bypass model signals, so invalidate explicitly
+        for offered_term in updated_terms:
+            invalidate_term(offered_term)
+            invalidate_schedule_cache(offered_term)
     except Exception as e:
         logger.error(f"An error occurred while adding data to the database: {e}")
         db_connection.rollback()
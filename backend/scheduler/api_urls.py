@@ -1,5 +1,5 @@
 from django.urls import path
-from . import views
+from . import views, async_views
 from gpacalc import views as gpacalc_views
 
 app_name = 'scheduler-api'
@@ -11,8 +11,15 @@ urlpatterns = [
     path('course_codes/', gpacalc_views.get_course_codes, name='get_course_codes'),
     path('section_numbers/', gpacalc_views.get_section_numbers, name='get_section_numbers'),
 
+    #API endpoint to get the whole term -> type -> code -> section tree in one cached document
+    path('catalog/', views.course_catalog, name='course_catalog'),
+
     #API endpoint to get the conflict free schedule
     path('conflict_free_schedule/', views.conflict_free_schedule, name='conflict_free_schedule'),
+    #API endpoint to get conflict free schedules while adding/removing one course at a time
+    path('incremental_schedule/', views.incremental_schedule, name='incremental_schedule'),
+    #API endpoint to find the sections of candidate courses that fit around fixed sections
+    path('compatible_sections/', views.compatible_sections, name='compatible_sections'),
 
     #API endpoint to get the course events, you'll need to provide the offered term and course_type, course_code and section_number
     path('course_events_schedule/', views.course_events_schedule, name='search_courses'),
@@ -21,4 +28,12 @@ urlpatterns = [
 
     #API endpoint to submit suggestions
     path('submit_suggestion/', views.submit_suggestion, name='submit_suggestion'),
+
+    #Async variants of the read endpoints above, for ASGI deployments
+    path('async/offered_terms/', async_views.offered_terms, name='async_offered_terms'),
+    path('async/course_types/', async_views.course_types, name='async_course_types'),
+    path('async/course_codes/', async_views.course_codes, name='async_course_codes'),
+    path('async/section_numbers/', async_views.section_numbers, name='async_section_numbers'),
+    path('async/course_events_schedule/', async_views.course_events_schedule, name='async_course_events_schedule'),
+    path('async/conflict_free_schedule/', async_views.conflict_free_schedule, name='async_conflict_free_schedule'),
 ]
\ No newline at end of file
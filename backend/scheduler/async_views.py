@@ -0,0 +1,139 @@
+# scheduler/async_views.py
+"""
+Async variants of the hot read endpoints, for ASGI deployments
+(coursescheduler/asgi.py).
+
+They take the same requests and return the same responses as their sync
+counterparts in gpacalc/views.py and scheduler/views.py (GET with query
+parameters or POST with a JSON body, ETags and 304s via
+http_cache.conditional_read), but use Django's
+async ORM, so a worker waiting on the database can serve other requests
+instead of holding a thread per request during registration peaks. They are
+routed under /api/scheduler/async/.
+
+conflict_free_schedule is CPU-bound once the term index is built, so its
+async variant awaits the shared sync implementation in a worker thread
+rather than blocking the event loop.
+"""
+import logging
+
+from asgiref.sync import sync_to_async
+from django.http import JsonResponse
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_http_methods
+
+from . import views
+from .http_cache import conditional_read, request_data
+from .models import Course
+
+logger = logging.getLogger(__name__)
+
+
+def _catalog_courses(data, **filters):
+    """
+    Course rows behind the dropdown endpoints. Like the gpacalc views, only
+    sections with events are listed unless "has_events" is false, because the
+    scheduler app runs before course outlines have been processed.
+    """
+    courses = Course.objects.filter(**filters)
+    if data.get("has_events", True) == True:
+        courses = courses.filter(has_events=True)
+    return courses
+
+
+async def _distinct(courses, field):
+    return [value async for value in courses.values_list(field, flat=True).distinct().order_by(field)]
+
+
+@require_http_methods(["GET", "POST"])
+@csrf_exempt
+@conditional_read
+async def offered_terms(request):
+    """
+    API: Get all available terms (async variant of gpacalc get_offered_terms)
+
+    Returns:
+        JSON: Array of term strings ["Fall 2025", "Winter 2026", ...]
+    """
+    data = request_data(request)
+    return JsonResponse(await _distinct(_catalog_courses(data), "offered_term"), safe=False)
+
+
+@require_http_methods(["GET", "POST"])
+@csrf_exempt
+@conditional_read
+async def course_types(request):
+    """
+    API: Get course types for a given term (async variant of gpacalc get_course_types)
+
+    Request:
+        JSON: {"offered_term": "Fall 2025"}, or the same fields as GET query parameters
+    """
+    data = request_data(request)
+    courses = _catalog_courses(data, offered_term=data.get("offered_term"))
+    return JsonResponse(await _distinct(courses, "course_type"), safe=False)
+
+
+@require_http_methods(["GET", "POST"])
+@csrf_exempt
+@conditional_read
+async def course_codes(request):
+    """
+    API: Get course codes for a type and term (async variant of gpacalc get_course_codes)
+
+    Request:
+        JSON: {"course_type": "CIS", "offered_term": "Fall 2025"}, or the same fields as GET query parameters
+    """
+    data = request_data(request)
+    courses = _catalog_courses(data, offered_term=data.get("offered_term"), course_type=data.get("course_type"))
+    return JsonResponse(await _distinct(courses, "course_code"), safe=False)
+
+
+@require_http_methods(["GET", "POST"])
+@csrf_exempt
+@conditional_read
+async def section_numbers(request):
+    """
+    API: Get section numbers of a course (async variant of gpacalc get_section_numbers)
+
+    Request:
+        JSON: {"course_type": "CIS", "course_code": "3750", "offered_term": "Fall 2025"},
+            or the same fields as GET query parameters
+    """
+    data = request_data(request)
+    courses = _catalog_courses(
+        data,
+        offered_term=data.get("offered_term"),
+        course_type=data.get("course_type"),
+        course_code=data.get("course_code"),
+    )
+    return JsonResponse(await _distinct(courses, "section_number"), safe=False)
+
+
+@require_http_methods(["GET", "POST"])
+@csrf_exempt
+@conditional_read
+async def course_events_schedule(request):
+    """
+    API: Get all events for multiple course sections (async variant of
+    scheduler course_events_schedule, same request and response)
+    """
+    courses = views.requested_sections(request_data(request))
+
+    result, section_keys, evs = views.section_events_query(courses)
+    if evs is not None:
+        async for ev in evs:
+            views.add_section_event(result, section_keys, ev)
+    return JsonResponse(result, safe=False)
+
+
+@csrf_exempt
+async def conflict_free_schedule(request):
+    """
+    API: Generate paginated conflict-free schedules (async variant of
+    scheduler conflict_free_schedule, same request and response)
+    """
+    # The search is CPU-bound and touches the database only through thread-safe
+    # ORM calls, so it runs in the default executor instead of queueing behind
+    # every other sync call on the single thread_sensitive thread
+    return await sync_to_async(views.conflict_free_schedule, thread_sensitive=False)(request)
@@ -0,0 +1,91 @@
+# scheduler/catalog.py
+"""
+Precomputed course catalog: the whole term -> course type -> course code ->
+section numbers tree in one document.
+
+The dropdown endpoints (gpacalc get_offered_terms, get_course_types,
+get_course_codes, get_section_numbers) run a DISTINCT query per click. The
+catalog is built from a single query, once per data version
+(term_index.catalog_version(), bumped by every invalidate_term() and when a
+section's has_events flag changes), and kept in Django's cache as
+ready-to-send JSON and gzip bytes with a strong ETag.
+
+The version token is stored in the database (scheduler.DataVersion), so a
+scrape in another process changes it for every worker within
+term_index.VERSION_CHECK_INTERVAL, and every worker builds the same body and
+ETag for the same version, whether or not the cache is shared.
+"""
+import gzip
+import hashlib
+import json
+import logging
+
+from django.core.cache import cache
+
+from .term_index import catalog_version
+
+logger = logging.getLogger(__name__)
+
+_CATALOG_KEY = "scheduler:catalog:{}:{}"
+# Documents are keyed on the version, so this only bounds how long
+# superseded versions linger in the cache
+CATALOG_TTL = 60 * 60
+
+
+def _build_trees():
+    """Build the has_events-only and the full catalog tree with one query"""
+    from .models import Course
+
+    trees = {True: {}, False: {}}
+    rows = (
+        Course.objects
+        .values_list("offered_term", "course_type", "course_code", "section_number", "has_events")
+        .order_by("offered_term", "course_type", "course_code", "section_number")
+    )
+    for offered_term, course_type, course_code, section_number, has_events in rows.iterator():
+        if offered_term is None:
+            continue
+        for only_with_events in (True, False):
+            if only_with_events and not has_events:
+                continue
+            sections = (
+                trees[only_with_events]
+                .setdefault(offered_term, {})
+                .setdefault(course_type, {})
+                .setdefault(course_code, [])
+            )
+            if section_number not in sections:
+                sections.append(section_number)
+    return trees
+
+
+def get_catalog(has_events=True):
+    """
+    Return the catalog document for the current data version.
+
+    Returns:
+        dict: {
+            "etag": '"<sha1>"',
+            "body": b'{"version": ..., "terms": {"Fall 2025": {"CIS": {"3750": ["01", ...]}}}}',
+            "gzip": <gzip-compressed body>
+        }
+    """
+    version = catalog_version()
+    key = _CATALOG_KEY.format(version, "events" if has_events else "all")
+    document = cache.get(key)
+    if document is not None:
+        return document
+
+    trees = _build_trees()
+    for only_with_events, terms in trees.items():
+        body = json.dumps({"version": version, "terms": terms}, separators=(",", ":")).encode()
+        built = {
+            "etag": f'"{hashlib.sha1(body).hexdigest()}"',
+            "body": body,
+            "gzip": gzip.compress(body, compresslevel=6),
+        }
+        cache.set(_CATALOG_KEY.format(version, "events" if only_with_events else "all"), built, CATALOG_TTL)
+        if only_with_events == has_events:
+            document = built
+    logger.info(f"Built course catalog {version}: {len(trees[False])} terms, {len(document['body'])} bytes")
+    return document
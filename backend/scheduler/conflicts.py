@@ -0,0 +1,212 @@
+# scheduler/conflicts.py
+"""
+Date-aware meeting conflicts.
+
+timetable.py treats every meeting as a weekly (day, start, end) slot that
+runs all term, which is wrong for half-semester sections and single-date
+meetings such as exams: two sections that share a Monday 10:00 slot in
+different halves of the term do not conflict.
+
+Every meeting here also carries the date range from Event.dates. Meetings
+without dates run all term. Two meetings conflict when they share a weekday,
+their times overlap, and their date ranges overlap on at least one date that
+falls on that weekday.
+
+- sections_conflict() checks two sections with a sweep line over meetings
+  sorted by (day, start), so sections with many irregular meetings cost
+  O(n log n) instead of a pairwise scan.
+- build_masks() gives the solver exact occupancy masks. The term is cut into
+  phases at every date-range boundary of the requested sections, and each
+  phase gets its own minute-of-week block in the mask. Two sections conflict
+  exactly when their masks share a bit, so the solver's single AND is still
+  all it needs. Phases that can't reveal a conflict that another phase
+  doesn't already reveal are dropped, so requests without date ranges keep
+  one-week masks.
+"""
+import re
+from collections import namedtuple
+from datetime import datetime, timedelta
+
+from .timetable import MINUTES_PER_WEEK, day_mask, event_slot, interval_mask, parse_time_range
+
+# first_date/last_date are inclusive datetime.date values, or None for all term
+Meeting = namedtuple("Meeting", ["day", "start", "end", "first_date", "last_date", "event_type"])
+
+_DATE_FORMATS = ("%Y/%m/%d", "%m/%d/%Y", "%Y-%m-%d", "%m/%d/%y")
+_DATE_TOKEN = re.compile(r"\d{1,4}[/-]\d{1,2}[/-]\d{1,4}")
+_ALL_DAYS = frozenset(range(7))
+
+
+def parse_date(value):
+    """Parse "2025/09/04" or "09/04/2025" into a date, or None"""
+    value = (value or "").strip()
+    for date_format in _DATE_FORMATS:
+        try:
+            return datetime.strptime(value, date_format).date()
+        except ValueError:
+            continue
+    return None
+
+
+def parse_date_range(dates):
+    """
+    Convert an Event.dates string ("2025/09/04 - 2025/10/24") into an
+    inclusive (first_date, last_date) tuple. A single date gives a one-day
+    range. Empty, TBA or unparseable values give None (the meeting runs all
+    term).
+    """
+    tokens = _DATE_TOKEN.findall(dates or "")
+    if len(tokens) == 1:
+        tokens = tokens * 2
+    if len(tokens) != 2:
+        return None
+    first, last = parse_date(tokens[0]), parse_date(tokens[1])
+    if first is None or last is None or last < first:
+        return None
+    return first, last
+
+
+def encode_event(times, days, dates):
+    """
+    Canonical encoding of an Event's strings, as stored in its precompiled
+    columns so hot paths never parse them again.
+
+    Returns:
+        dict with start_minute/end_minute (None for TBD), day_mask, and
+        start_date/end_date (None when the meeting runs all term)
+    """
+    time_range = parse_time_range(times)
+    start_date, end_date = parse_date_range(dates) or (None, None)
+    return {
+        "start_minute": time_range[0] if time_range else None,
+        "end_minute": time_range[1] if time_range else None,
+        "day_mask": day_mask(days),
+        "start_date": start_date,
+        "end_date": end_date,
+    }
+
+
+def compile_section_meetings(events):
+    """
+    Turn a section's Event rows into Meetings, one per meeting day.
+
+    Args:
+        events: iterable of dicts with "times", "days", "dates" and "event_type",
+            plus optionally the precompiled columns (see encode_event())
+
+    Meetings without a usable time or day (TBD) can't be placed and are left
+    out, as in timetable.compile_meetings().
+    """
+    meetings = []
+    for e in events:
+        slot = event_slot(e)
+        if slot is None:
+            continue
+        start, end, days = slot
+        if e.get("start_minute") is not None:
+            first_date, last_date = e.get("start_date"), e.get("end_date")
+        else:
+            first_date, last_date = parse_date_range(e.get("dates")) or (None, None)
+        for day in days:
+            meetings.append(Meeting(day, start, end, first_date, last_date, e.get("event_type")))
+    return meetings
+
+
+def _share_date(a, b, day):
+    """True if meetings a and b both happen on some date falling on weekday `day`"""
+    firsts = [m.first_date for m in (a, b) if m.first_date is not None]
+    if not firsts:
+        return True
+    first = max(firsts)
+    last = min(m.last_date for m in (a, b) if m.last_date is not None)
+    return first <= last and day in _weekdays(first, last + timedelta(days=1))
+
+
+def _weekdays(first, end):
+    """Weekdays present in [first, end); None bounds mean unbounded"""
+    if first is None or end is None or (end - first).days >= 7:
+        return _ALL_DAYS
+    return frozenset((first + timedelta(days=k)).weekday() for k in range((end - first).days))
+
+
+def sections_conflict(meetings_a, meetings_b):
+    """
+    True if two sections have a meeting at the same time on the same date.
+
+    Sweep line over both sections' meetings sorted by (day, start), keeping
+    the meetings of each section that are still running at the sweep point.
+    """
+    timeline = sorted(
+        [(m.day, m.start, 0, m) for m in meetings_a] + [(m.day, m.start, 1, m) for m in meetings_b],
+        key=lambda item: (item[0], item[1], item[2]),
+    )
+    active = ([], [])
+    for day, start, side, meeting in timeline:
+        for running in active:
+            running[:] = [m for m in running if m.day == day and m.end > start]
+        for other in active[1 - side]:
+            if _share_date(meeting, other, day):
+                return True
+        active[side].append(meeting)
+    return False
+
+
+def _phases(meeting_lists):
+    """
+    Cut the term at every date-range boundary.
+
+    Returns:
+        list of (phase_first, phase_end, dated meetings active in the phase),
+        phase_end exclusive and None for unbounded ends
+    """
+    dated = [m for meetings in meeting_lists for m in meetings if m.first_date is not None]
+    boundaries = sorted({m.first_date for m in dated} | {m.last_date + timedelta(days=1) for m in dated})
+    edges = [None] + boundaries + [None]
+    phases = []
+    for first, end in zip(edges, edges[1:]):
+        active = frozenset(
+            m for m in dated
+            if (first is not None and m.first_date <= first) and (end is not None and end <= m.last_date + timedelta(days=1))
+        )
+        phases.append((first, end, active))
+    return phases
+
+
+def build_masks(meeting_lists):
+    """
+    Exact occupancy masks for a set of sections.
+
+    Args:
+        meeting_lists: one list of Meetings per section
+
+    Returns:
+        list of int masks, one per section, such that two sections conflict
+        (per sections_conflict) exactly when their masks share a bit
+    """
+    signatures = []
+    for first, end, active in _phases(meeting_lists):
+        signature = (active, _weekdays(first, end))
+        if signature not in signatures:
+            signatures.append(signature)
+
+    # A phase whose meetings and weekdays are all covered by another phase
+    # can only show conflicts that the other phase shows as well
+    kept = []
+    for i, (active, weekdays) in enumerate(signatures):
+        subsumed = any(
+            j != i and active <= other_active and weekdays <= other_weekdays
+            for j, (other_active, other_weekdays) in enumerate(signatures)
+        )
+        if not subsumed:
+            kept.append((active, weekdays))
+
+    masks = []
+    for meetings in meeting_lists:
+        mask = 0
+        for phase, (active, weekdays) in enumerate(kept):
+            offset = phase * MINUTES_PER_WEEK
+            for m in meetings:
+                if m.day in weekdays and (m.first_date is None or m in active):
+                    mask |= interval_mask(m.day, m.start, m.end) << offset
+        masks.append(mask)
+    return masks
@@ -0,0 +1,154 @@
+# scheduler/frontier.py
+"""
+Session-scoped incremental schedule search.
+
+Students build schedules one course at a time. Instead of re-running the
+whole search after every edit, the compatible combinations are kept level by
+level, in the order the courses were added:
+
+    levels[0] = [()]
+    levels[k] = every conflict-free combination of the first k courses
+
+Adding a course extends the last level by one course. Removing a course keeps
+every level before it and re-extends only the courses added after it, so
+removing the most recent course costs nothing. Combinations are stored as
+tuples of section course_ids, so they stay valid across requests even though
+the masks (term_index.section_masks) are rebuilt every time.
+
+Each level is in lexicographic section order, which is exactly the order a
+SOLVER_BACKTRACK search over the same course order yields.
+
+State lives in Django's cache under the session key and term, and is dropped
+when the term's data version changes. Levels are stored as packed arrays of
+course_ids rather than pickled tuples, which keeps a full frontier to a few
+hundred kilobytes that load in milliseconds.
+
+The state is only shared between web workers when a shared cache backend is
+configured (CACHE_REDIS_URL in settings.py). With the per-process fallback
+it works per worker: an edit that lands on another worker than the previous
+one finds no state and recomputes the selection from scratch, which still
+gives the right answer.
+"""
+from array import array
+
+from django.core.cache import cache
+
+from .term_index import cache_key_part, section_masks, term_data_version
+
+# Largest level kept per session; bigger selections fall back to a plain search
+FRONTIER_MAX_COMBINATIONS = 20000
+# Idle time after which a session's frontier is dropped, in seconds
+FRONTIER_TTL = 30 * 60
+
+_FRONTIER_KEY = "scheduler:frontier:v2:{}:{}"
+
+
+def _pack(levels):
+    """Levels 1.. as flat course_id arrays (level 0 is always [()])"""
+    return [array("q", [course_id for combination in level for course_id in combination]).tobytes() for level in levels[1:]]
+
+
+def _unpack(packed):
+    levels = [[()]]
+    for size, data in enumerate(packed, 1):
+        flat = array("q")
+        flat.frombytes(data)
+        levels.append([tuple(flat[i:i + size]) for i in range(0, len(flat), size)])
+    return levels
+
+
+class FrontierTooLarge(Exception):
+    """Raised when a level would exceed FRONTIER_MAX_COMBINATIONS"""
+
+
+class ScheduleFrontier:
+    """
+    Conflict-free combinations of a session's selection, one level per course.
+
+    Args:
+        offered_term: term of the selection
+        version: term_data_version() the combinations were computed against
+        order: selection entries [course_type, course_code, course_section]
+            in the order they were added
+        levels: list of lists of course_id tuples, levels[k] covering order[:k]
+    """
+
+    def __init__(self, offered_term, version, order=None, levels=None):
+        self.offered_term = offered_term
+        self.version = version
+        self.order = [tuple(course) for course in order or []]
+        self.levels = levels or [[()]]
+
+    @classmethod
+    def load(cls, session_key, offered_term):
+        """The session's frontier for a term, or an empty one"""
+        version = term_data_version(offered_term)
+        state = cache.get(_FRONTIER_KEY.format(session_key, cache_key_part(offered_term)))
+        if state is None or state["version"] != version:
+            return cls(offered_term, version)
+        return cls(offered_term, version, state["order"], _unpack(state["levels"]))
+
+    def save(self, session_key):
+        cache.set(
+            _FRONTIER_KEY.format(session_key, cache_key_part(self.offered_term)),
+            {"version": self.version, "order": self.order, "levels": _pack(self.levels)},
+            FRONTIER_TTL,
+        )
+
+    @staticmethod
+    def discard(session_key, offered_term):
+        cache.delete(_FRONTIER_KEY.format(session_key, cache_key_part(offered_term)))
+
+    def combinations(self):
+        """Conflict-free combinations of the whole selection, as course_id tuples"""
+        return self.levels[-1]
+
+    def update(self, selection, course_sections):
+        """
+        Bring the frontier to a new selection, reusing every level that is
+        still valid.
+
+        Args:
+            selection: canonical selection entries (see schedule_cache.canonical_selection)
+            course_sections: dict of selection entry tuple -> indexed section dicts
+
+        Returns:
+            (levels_reused, levels_computed)
+
+        Raises:
+            FrontierTooLarge: if a level grows past FRONTIER_MAX_COMBINATIONS
+        """
+        wanted = [tuple(course) for course in selection]
+        # Levels stay valid up to the first course that was removed
+        reused = 0
+        while reused < len(self.order) and self.order[reused] in wanted:
+            reused += 1
+        kept = [course for course in self.order[reused:] if course in wanted]
+        added = [course for course in wanted if course not in self.order]
+        new_order = self.order[:reused] + kept + added
+
+        self.levels = self.levels[:reused + 1]
+        self.order = new_order[:reused]
+        if reused == len(new_order):
+            return reused, 0
+
+        masks = {}
+        sections = [s for course in new_order for s in course_sections[course]]
+        for section, mask in zip(sections, section_masks(sections)):
+            masks[section["course_id"]] = mask
+
+        for course in new_order[reused:]:
+            candidates = [(s["course_id"], masks[s["course_id"]]) for s in course_sections[course]]
+            level = []
+            for combination in self.levels[-1]:
+                occupied = 0
+                for course_id in combination:
+                    occupied |= masks[course_id]
+                for course_id, mask in candidates:
+                    if not mask & occupied:
+                        level.append(combination + (course_id,))
+                if len(level) > FRONTIER_MAX_COMBINATIONS:
+                    raise FrontierTooLarge()
+            self.levels.append(level)
+            self.order.append(course)
+        return reused, len(new_order) - reused
@@ -0,0 +1,90 @@
+# scheduler/http_cache.py
+"""
+Conditional GET support for the read-only course APIs.
+
+The read endpoints accept GET with query parameters as well as the original
+POST with a JSON body. Every response carries a strong ETag derived from the
+requested term's data version (term_index.read_api_version, or the
+catalog-wide version when no term is given) and the request parameters, so
+a repeat request with If-None-Match gets a 304 without running the view, and
+GET responses can be cached by browsers and reverse proxies.
+
+The version tokens come from the database (scheduler.DataVersion), not from a
+per-process cache. Every worker computes the same ETag for the same data, and
+a scrape in another process changes it everywhere within
+term_index.VERSION_CHECK_INTERVAL.
+"""
+import hashlib
+import json
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import quote_etag
+from django.views.decorators.http import condition
+
+from .term_index import catalog_version, read_api_version
+
+# Seconds a GET response may be reused before it must be revalidated
+READ_MAX_AGE = 60
+
+
+def request_data(request):
+    """
+    Request parameters: the query string of a GET ("true"/"false" become
+    booleans) or the JSON body of a POST.
+    """
+    if request.method in ("GET", "HEAD"):
+        data = {}
+        for key, value in request.GET.items():
+            lowered = value.lower()
+            data[key] = True if lowered == "true" else False if lowered == "false" else value
+        return data
+    return json.loads(request.body) if request.body else {}
+
+
+def _read_etag(request, *args, **kwargs):
+    try:
+        data = request_data(request)
+    except ValueError:
+        # Let the view report the malformed body
+        return None
+    offered_term = data.get("offered_term") if isinstance(data, dict) else None
+    version = read_api_version(offered_term) if offered_term else catalog_version()
+    raw = json.dumps([request.path, version, data], sort_keys=True, default=str)
+    return hashlib.sha1(raw.encode()).hexdigest()
+
+
+def _patch_read_response(request, response):
+    if request.method in ("GET", "HEAD") and response.status_code == 200:
+        patch_cache_control(response, public=True, max_age=READ_MAX_AGE, must_revalidate=True)
+    return response
+
+
+def conditional_read(view):
+    """
+    Decorator for read-only views: strong ETag and 304 handling, plus
+    Cache-Control on successful GET responses.
+
+    Async views are supported too. Django's condition() would compute the
+    ETag, which reads the version tokens from the database, on the event loop,
+    so for them it is computed in a worker thread instead.
+    """
+    if iscoroutinefunction(view):
+        @wraps(view)
+        async def async_wrapped(request, *args, **kwargs):
+            etag = await sync_to_async(_read_etag)(request, *args, **kwargs)
+            etag = quote_etag(etag) if etag is not None else None
+            response = get_conditional_response(request, etag=etag)
+            if response is None:
+                response = _patch_read_response(request, await view(request, *args, **kwargs))
+            if etag and request.method in ("GET", "HEAD"):
+                response.headers.setdefault("ETag", etag)
+            return response
+        return async_wrapped
+
+    @condition(etag_func=_read_etag)
+    @wraps(view)
+    def wrapped(request, *args, **kwargs):
+        return _patch_read_response(request, view(request, *args, **kwargs))
+    return wrapped
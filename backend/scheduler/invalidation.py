@@ -0,0 +1,144 @@
+# scheduler/invalidation.py
+"""
+Batched invalidation for the model signals in models.py.
+
+Every ORM write to a Course or Event changes a term's section data, which
+invalidates the term's section index (term_index.invalidate_term) and the
+cached schedules of the course (schedule_cache.invalidate_schedule_cache).
+A write to a CourseEvent (an assessment) only changes what the read APIs
+serve (term_index.invalidate_assessments) and possibly the section's
+has_events flag. Doing that from each signal made an import that writes rows
+one by one pay several extra writes per row, and a deleted course repeated
+the work for every cascaded event.
+
+The signals only record what changed, without running a query. The changes
+are applied once, de-duplicated per term and course, when the transaction
+commits (transaction.on_commit, immediately outside a transaction). Loaders
+that write outside a single transaction can group their writes with
+batched_invalidation():
+
+    with batched_invalidation():
+        for row in rows:
+            Course.objects.create(...)
+
+Applying the changes after the commit also keeps other processes from
+rebuilding an index from uncommitted data under the new version token. For
+the same reason Course.has_events follows assessment writes at the commit,
+not within the transaction.
+"""
+import logging
+import threading
+from contextlib import contextmanager
+
+from django.db import transaction
+
+from .schedule_cache import invalidate_schedule_cache
+from .term_index import invalidate_assessments, invalidate_term
+
+logger = logging.getLogger(__name__)
+
+# Above this many changed courses in a term, all of its cached schedules
+# are deleted instead of matching every course
+MAX_COURSES_PER_INVALIDATION = 100
+
+_local = threading.local()
+
+
+def _pending():
+    """This thread's changes not applied yet"""
+    if not hasattr(_local, "depth"):
+        _local.depth = 0
+        _local.sections = {}
+        _local.event_courses = set()
+        _local.assessment_courses = set()
+    return _local
+
+
+def _schedule():
+    state = _pending()
+    if state.depth == 0:
+        # Runs right away outside a transaction; once per write inside one,
+        # but only the first call finds anything left to apply
+        transaction.on_commit(apply_pending_changes)
+
+
+def course_changed(offered_term, course_type, course_code):
+    """Record a change to a section of a course (Course signals)"""
+    _pending().sections.setdefault(offered_term, set()).add((course_type, course_code))
+    _schedule()
+
+
+def event_changed(course_id):
+    """Record a change to a meeting of a section, by its Course primary key (Event signals)"""
+    _pending().event_courses.add(course_id)
+    _schedule()
+
+
+def assessment_changed(course_id):
+    """Record a change to an assessment of a section, by its Course primary key (CourseEvent signals)"""
+    _pending().assessment_courses.add(course_id)
+    _schedule()
+
+
+@contextmanager
+def batched_invalidation():
+    """Apply the changes recorded inside the block once, when it exits (after the commit, if any)"""
+    state = _pending()
+    state.depth += 1
+    try:
+        yield
+    finally:
+        state.depth -= 1
+        if state.depth == 0:
+            transaction.on_commit(apply_pending_changes)
+
+
+def apply_pending_changes():
+    """Invalidate every term and course changed since the last call"""
+    from .models import Course, CourseEvent
+
+    state = _pending()
+    sections, event_courses, assessment_courses = state.sections, state.event_courses, state.assessment_courses
+    state.sections, state.event_courses, state.assessment_courses = {}, set(), set()
+
+    # Sections deleted since were recorded by their own Course signal
+    courses = {}
+    if event_courses or assessment_courses:
+        for course_id, offered_term, course_type, course_code in (
+            Course.objects.filter(course_id__in=event_courses | assessment_courses)
+            .values_list("course_id", "offered_term", "course_type", "course_code")
+        ):
+            courses[course_id] = (offered_term, course_type, course_code)
+    for course_id in event_courses & courses.keys():
+        offered_term, course_type, course_code = courses[course_id]
+        sections.setdefault(offered_term, set()).add((course_type, course_code))
+
+    if assessment_courses:
+        with_events = set(
+            CourseEvent.objects.filter(course_id__in=assessment_courses)
+            .values_list("course_id", flat=True)
+            .distinct()
+        )
+        # update() rather than save(), so the Course signals don't treat the
+        # flag as a change to the section's meetings
+        flipped = Course.objects.filter(course_id__in=with_events, has_events=False).update(has_events=True)
+        flipped += Course.objects.filter(
+            course_id__in=assessment_courses - with_events, has_events=True,
+        ).update(has_events=False)
+        assessment_terms = {courses[course_id][0] for course_id in assessment_courses & courses.keys()}
+        for offered_term in sorted(assessment_terms - {None}):
+            invalidate_assessments(offered_term, has_events_changed=bool(flipped))
+            # One catalog bump covers every term
+            flipped = 0
+
+    for offered_term, changed in sections.items():
+        if offered_term is None:
+            # Sections without a term are in no term's index or cache entries
+            continue
+        invalidate_term(offered_term)
+        invalidate_schedule_cache(
+            offered_term,
+            courses=changed if len(changed) <= MAX_COURSES_PER_INVALIDATION else None,
+        )
+    if sections:
+        logger.debug(f"Invalidated section data of {len(sections)} terms")
@@ -0,0 +1,52 @@
+# scheduler/management/commands/backfill_event_times.py
+"""
+Fill the precompiled meeting columns of Event rows (start_minute, end_minute,
+day_mask, start_date, end_date) from their times/days/dates strings.
+
+New rows get them at insert time (scraper import and the pre_save signal);
+this command covers rows written before the columns existed:
+
+    python manage.py backfill_event_times [--term "Fall 2025"] [--all]
+"""
+from django.core.management.base import BaseCommand
+
+from scheduler.conflicts import encode_event
+from scheduler.models import Event
+from scheduler.term_index import invalidate_term
+
+FIELDS = ["start_minute", "end_minute", "day_mask", "start_date", "end_date"]
+
+
+class Command(BaseCommand):
+    help = "Backfill Event start/end minutes, day mask and date range from the meeting strings"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--term", help="Only backfill events of this offered term")
+        parser.add_argument("--all", action="store_true", help="Re-encode rows that are already filled")
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        events = Event.objects.only("id", "times", "days", "dates", *FIELDS).order_by("id")
+        if options["term"]:
+            events = events.filter(course_id__offered_term=options["term"])
+        if not options["all"]:
+            # TBD meetings keep a null start_minute, so they are simply re-checked
+            events = events.filter(start_minute__isnull=True)
+
+        batch = []
+        updated = 0
+        for event in events.iterator(chunk_size=options["batch_size"]):
+            for field, value in encode_event(event.times, event.days, event.dates).items():
+                setattr(event, field, value)
+            batch.append(event)
+            if len(batch) >= options["batch_size"]:
+                Event.objects.bulk_update(batch, FIELDS)
+                updated += len(batch)
+                batch = []
+        if batch:
+            Event.objects.bulk_update(batch, FIELDS)
+            updated += len(batch)
+
+        # bulk_update skips the model signals
+        invalidate_term(options["term"])
+        self.stdout.write(self.style.SUCCESS(f"Encoded meeting times of {updated} events"))
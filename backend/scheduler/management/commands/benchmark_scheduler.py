@@ -0,0 +1,257 @@
+# scheduler/management/commands/benchmark_scheduler.py
+"""
+Benchmark the conflict-free schedule generator on a synthetic term.
+
+Run against the in-memory SQLite settings so no real data is touched:
+
+    python manage.py benchmark_scheduler --settings=coursescheduler.settings_bench \
+        --term-courses 60 --sections 10 --courses 5 --iterations 50 --output bench.json
+
+Two things are timed for the same random course selections:
+
+- endpoint: conflict_free_schedule end to end through a RequestFactory
+  request (JSON parsing, term index, search, serialization). Requests are
+  sent with "debug": true, so the result cache is bypassed and the per-phase
+  timings are collected as well.
+- solver: ScheduleSolver alone on the same masks, finding the first page and
+  counting all schedules.
+
+The JSON report holds the configuration, the git commit and latency
+percentiles, so runs can be compared between commits.
+"""
+import json
+import random
+import subprocess
+import time
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import RequestFactory
+
+from scheduler.conflicts import build_masks, encode_event
+from scheduler.models import Course, Event
+from scheduler.solver import ScheduleSolver, SOLVER_MODES, SOLVER_FORWARD_CHECKING
+from scheduler.term_index import get_course_sections, invalidate_term
+from scheduler.views import conflict_free_schedule
+
+BENCH_TERM = "Bench 2025"
+COURSE_TYPES = ["CIS", "ENGG", "MATH", "STAT", "PHYS", "CHEM", "ECON", "PSYC"]
+WEEKDAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday"]
+# (event_type, number of weekdays, duration in minutes)
+MEETING_PATTERNS = [("LEC", 2, 80), ("LEC", 3, 50), ("LAB", 1, 110), ("SEM", 1, 50)]
+HALF_TERMS = ["2025/09/04 - 2025/10/24", "2025/10/27 - 2025/12/12"]
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a non-empty list"""
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * pct // 100))
+    return ordered[int(rank) - 1]
+
+
+def summarize(seconds):
+    """Latency percentiles (ms) and throughput of a list of timings"""
+    if not seconds:
+        return {"runs": 0}
+    total = sum(seconds)
+    return {
+        "runs": len(seconds),
+        "mean_ms": round(total / len(seconds) * 1000, 3),
+        "p50_ms": round(percentile(seconds, 50) * 1000, 3),
+        "p90_ms": round(percentile(seconds, 90) * 1000, 3),
+        "p99_ms": round(percentile(seconds, 99) * 1000, 3),
+        "max_ms": round(max(seconds) * 1000, 3),
+        "throughput_per_s": round(len(seconds) / total, 2) if total else None,
+    }
+
+
+def _clock(minutes):
+    hour, minute = divmod(minutes, 60)
+    return f"{(hour - 1) % 12 + 1}:{minute:02d} {'AM' if hour < 12 else 'PM'}"
+
+
+class Command(BaseCommand):
+    help = "Benchmark conflict_free_schedule and its solver on a synthetic term (in-memory SQLite)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--term-courses", type=int, default=40, help="Courses in the synthetic term")
+        parser.add_argument("--sections", type=int, default=8, help="Sections per course")
+        parser.add_argument("--meetings", type=int, default=2, help="Meeting patterns per section (density)")
+        parser.add_argument("--tba-rate", type=float, default=0.05, help="Share of meetings with TBA times")
+        parser.add_argument("--dated-rate", type=float, default=0.0, help="Share of half-term (date-ranged) meetings")
+        parser.add_argument("--courses", type=int, default=5, help="Courses per schedule request")
+        parser.add_argument("--iterations", type=int, default=30, help="Requests to time")
+        parser.add_argument("--limit", type=int, default=50, help="Schedules per page")
+        parser.add_argument("--solver", choices=SOLVER_MODES, default=SOLVER_FORWARD_CHECKING)
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--output", help="Write the JSON report to this file")
+
+    def handle(self, *args, **options):
+        db_name = str(connection.settings_dict["NAME"])
+        if connection.vendor != "sqlite" or not (db_name in (":memory:", "") or "mode=memory" in db_name):
+            raise CommandError(
+                "benchmark_scheduler writes synthetic data; run it with --settings=coursescheduler.settings_bench"
+            )
+        if options["courses"] > options["term_courses"]:
+            raise CommandError("--courses can't exceed --term-courses")
+
+        call_command("migrate", verbosity=0, interactive=False)
+        rng = random.Random(options["seed"])
+
+        start = time.perf_counter()
+        catalog = self.generate_term(rng, options)
+        generate_seconds = time.perf_counter() - start
+        self.stdout.write(
+            f"Generated {len(catalog)} courses x {options['sections']} sections in {generate_seconds:.2f}s"
+        )
+
+        selections = [rng.sample(catalog, options["courses"]) for _ in range(options["iterations"])]
+
+        # Build the term index once so every timed request sees a warm index,
+        # as in production
+        get_course_sections(BENCH_TERM, *catalog[0])
+
+        endpoint = self.bench_endpoint(selections, options)
+        solver = self.bench_solver(selections, options)
+
+        report = {
+            "config": {key: options[key] for key in (
+                "term_courses", "sections", "meetings", "tba_rate", "dated_rate",
+                "courses", "iterations", "limit", "solver", "seed",
+            )},
+            "git_commit": self.git_commit(),
+            "generated_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "generate_seconds": round(generate_seconds, 3),
+            "endpoint": endpoint,
+            "solver": solver,
+        }
+
+        for name in ("endpoint", "solver"):
+            latency = report[name]["latency"]
+            self.stdout.write(
+                f"{name:>8}: p50 {latency['p50_ms']}ms  p90 {latency['p90_ms']}ms  "
+                f"p99 {latency['p99_ms']}ms  max {latency['max_ms']}ms  {latency['throughput_per_s']}/s"
+            )
+        if options["output"]:
+            with open(options["output"], "w") as f:
+                json.dump(report, f, indent=2)
+            self.stdout.write(self.style.SUCCESS(f"Report written to {options['output']}"))
+        else:
+            self.stdout.write(json.dumps(report, indent=2))
+
+    # ------------------------------------------------------------------
+    # Synthetic data
+    # ------------------------------------------------------------------
+    def generate_term(self, rng, options):
+        """Create the synthetic term and return its (course_type, course_code) list"""
+        Course.objects.filter(offered_term=BENCH_TERM).delete()
+
+        catalog = []
+        courses = []
+        for i in range(options["term_courses"]):
+            course_type = COURSE_TYPES[i % len(COURSE_TYPES)]
+            course_code = str(1000 + i)
+            catalog.append((course_type, course_code))
+            for s in range(options["sections"]):
+                courses.append(Course(
+                    offered_term=BENCH_TERM,
+                    course_type=course_type,
+                    course_code=course_code,
+                    section_number=f"{s + 1:02d}",
+                    section_name=f"{course_type}*{course_code}*{s + 1:02d}",
+                    seats="30 / 30",
+                    instructor=f"Instructor {rng.randint(1, options['term_courses'] * 2)}",
+                    has_events=True,
+                ))
+        Course.objects.bulk_create(courses, batch_size=500)
+
+        events = []
+        for course in Course.objects.filter(offered_term=BENCH_TERM).only("course_id"):
+            for _ in range(options["meetings"]):
+                event_type, day_count, duration = rng.choice(MEETING_PATTERNS)
+                if rng.random() < options["tba_rate"]:
+                    times, days = "TBD", "TBD"
+                else:
+                    start = rng.randrange(8 * 60 + 30, 21 * 60 - duration, 30)
+                    times = f"{_clock(start)} - {_clock(start + duration)}"
+                    days = ", ".join(sorted(rng.sample(WEEKDAYS, day_count), key=WEEKDAYS.index))
+                dates = rng.choice(HALF_TERMS) if rng.random() < options["dated_rate"] else ""
+                events.append(Event(
+                    course_id=course, event_type=event_type, times=times,
+                    location="BENCH 100", days=days, dates=dates,
+                    # bulk_create skips pre_save, so encode like the scraper import does
+                    **encode_event(times, days, dates),
+                ))
+        Event.objects.bulk_create(events, batch_size=1000)
+
+        # bulk_create skips the model signals
+        invalidate_term(BENCH_TERM)
+        return catalog
+
+    # ------------------------------------------------------------------
+    # Runs
+    # ------------------------------------------------------------------
+    def bench_endpoint(self, selections, options):
+        factory = RequestFactory()
+        seconds = []
+        phases = {}
+        returned = 0
+        for selection in selections:
+            body = json.dumps({
+                "courses": [{"course_type": t, "course_code": c} for t, c in selection],
+                "offered_term": BENCH_TERM,
+                "offset": 0,
+                "limit": options["limit"],
+                "solver": options["solver"],
+                "parallel": False,
+                "debug": True,
+            })
+            request = factory.post("/api/scheduler/conflict_free_schedule/", body, content_type="application/json")
+            start = time.perf_counter()
+            response = conflict_free_schedule(request)
+            seconds.append(time.perf_counter() - start)
+            if response.status_code != 200:
+                raise CommandError(f"conflict_free_schedule returned {response.status_code}: {response.content[:200]}")
+            payload = json.loads(response.content)
+            returned += len(payload["schedules"])
+            for phase, ms in payload["debug"]["timings_ms"].items():
+                phases.setdefault(phase, []).append(ms / 1000)
+        return {
+            "latency": summarize(seconds),
+            "phases": {phase: summarize(values) for phase, values in phases.items()},
+            "schedules_returned": returned,
+        }
+
+    def bench_solver(self, selections, options):
+        seconds = []
+        nodes = []
+        counted = []
+        for selection in selections:
+            course_data = [get_course_sections(BENCH_TERM, t, c) for t, c in selection]
+            masks = iter(build_masks([s["meetings"] for sections in course_data for s in sections]))
+            domains = [[next(masks) for _ in sections] for sections in course_data]
+
+            start = time.perf_counter()
+            solver = ScheduleSolver(domains, mode=options["solver"])
+            for found, _ in enumerate(solver.search(), 1):
+                # Same page size as the endpoint run
+                if found >= options["limit"]:
+                    break
+            total = solver.count()
+            seconds.append(time.perf_counter() - start)
+            nodes.append(sum(solver.stats.nodes))
+            counted.append(total)
+        return {
+            "latency": summarize(seconds),
+            "mean_nodes_visited": round(sum(nodes) / len(nodes), 1) if nodes else 0,
+            "mean_total_schedules": round(sum(counted) / len(counted), 1) if counted else 0,
+        }
+
+    def git_commit(self):
+        try:
+            return subprocess.run(
+                ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+            ).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.4 on 2026-10-18 10:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scheduler', '0014_degplannercourse_degplannerprogram_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='conflictfreeschedules',
+            name='cache_key',
+            field=models.CharField(blank=True, max_length=64, null=True, unique=True),
+        ),
+        migrations.AddField(
+            model_name='conflictfreeschedules',
+            name='hit_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.4 on 2026-10-18 19:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scheduler', '0017_dataversion'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='conflictfreeschedules',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, db_index=True),
+        ),
+    ]
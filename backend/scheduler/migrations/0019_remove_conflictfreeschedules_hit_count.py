@@ -0,0 +1,17 @@
+# Generated by Django 5.2.1 on 2026-10-18 02:46
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scheduler', '0018_alter_conflictfreeschedules_updated_at'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='conflictfreeschedules',
+            name='hit_count',
+        ),
+    ]
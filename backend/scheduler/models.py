@@ -1,7 +1,9 @@
 # scheduler/models.py
 from django.db import models
-from django.db.models.signals import post_save, post_delete
+from django.db.models.signals import post_save, post_delete, pre_save
 from django.dispatch import receiver
+from .invalidation import assessment_changed, course_changed, event_changed
+from .conflicts import encode_event
 
 class Course(models.Model):
     offered_term = models.CharField(max_length=20, null=True, blank=True, db_index=True)
@@ -55,22 +57,17 @@ class CourseEvent(models.Model):
     description  = models.TextField()
     weightage    = models.CharField(max_length=50, null=True, blank=True)
 
-# AUTOMATIC MAINTENANCE - This keeps has_events in sync
+# AUTOMATIC MAINTENANCE - This keeps has_events in sync, once per
+# transaction (see invalidation.py), and changes the read APIs' ETags
 @receiver(post_save, sender=CourseEvent)
 def update_course_has_events_on_save(sender, instance, created, **kwargs):
     """When a CourseEvent is created or updated, ensure course.has_events = True"""
-    if instance.course.has_events != True:
-        instance.course.has_events = True
-        instance.course.save(update_fields=['has_events'])
+    assessment_changed(instance.course_id)
 
 @receiver(post_delete, sender=CourseEvent)
 def update_course_has_events_on_delete(sender, instance, **kwargs):
     """When a CourseEvent is deleted, check if course still has events"""
-    course = instance.course
-    # Check if this was the last event for this course
-    if not course.events.exists():
-        course.has_events = False
-        course.save(update_fields=['has_events'])
+    assessment_changed(instance.course_id)
 
 class Suggestion(models.Model):
     text         = models.TextField()
@@ -84,18 +81,76 @@ class Event(models.Model):
     location = models.CharField(max_length=255, null=True, blank=True, default="")
     days = models.CharField(max_length=50, null=True, blank=True, default="")
     dates = models.CharField(max_length=100, null=True, blank=True, default="")
+    # Precompiled from times/days/dates (see conflicts.encode_event), so the
+    # scheduler never parses the strings on a request
+    start_minute = models.PositiveSmallIntegerField(null=True, blank=True)
+    end_minute = models.PositiveSmallIntegerField(null=True, blank=True)
+    day_mask = models.PositiveSmallIntegerField(default=0)
+    start_date = models.DateField(null=True, blank=True)
+    end_date = models.DateField(null=True, blank=True)
 
     class Meta:
         db_table = "events"
+        indexes = [
+            models.Index(fields=['day_mask', 'start_minute', 'end_minute'], name='events_day_time_idx'),
+        ]
+
+# Keep the precompiled meeting columns in sync for ORM writes; the raw-SQL
+# scraper import fills them itself (misc_scripts/database.py)
+@receiver(pre_save, sender=Event)
+def encode_event_meeting_times(sender, instance, **kwargs):
+    """Fill start/end minute, day mask and date range from the strings"""
+    for field, value in encode_event(instance.times, instance.days, instance.dates).items():
+        setattr(instance, field, value)
+
+# Keep the in-memory section index (term_index.py) and the schedule cache in
+# sync with the tables; changes are applied once per transaction (see
+# invalidation.py)
+@receiver(post_save, sender=Course)
+@receiver(post_delete, sender=Course)
+def invalidate_term_index_on_course_change(sender, instance, **kwargs):
+    """When a section is added, changed or removed, rebuild its term's index"""
+    course_changed(instance.offered_term, instance.course_type, instance.course_code)
+
+@receiver(post_save, sender=Event)
+@receiver(post_delete, sender=Event)
+def invalidate_term_index_on_event_change(sender, instance, **kwargs):
+    """When a meeting time changes, rebuild the owning term's index"""
+    # The raw key, so a cascaded delete doesn't query its (deleted) section
+    event_changed(instance.course_id_id)
 
 class ConflictFreeSchedules(models.Model):
+    """
+    Cached conflict_free_schedule responses (see schedule_cache.py).
+
+    cache_key is a hash of the canonical request and courses lists the
+    "|TYPE*CODE|" courses the entry was built from, for invalidation.
+    """
     id = models.AutoField(primary_key=True)
     offered_term = models.CharField(max_length=20, db_index=True)
     courses = models.TextField(max_length=1000, null=True, blank=True,default="")
+    cache_key = models.CharField(max_length=64, unique=True, null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
-    updated_at = models.DateTimeField(auto_now=True)
+    # Entries expire and are purged by age (see schedule_cache.py)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
     conflict_free = models.JSONField(help_text="List of conflict-free schedules")
 
+class DataVersion(models.Model):
+    """
+    Data version tokens shared by every process (see term_index.py).
+
+    scope is a term name, "__all__" for every term, "__catalog__" for the
+    course catalog or "__assessments__:<term>" for a term's assessments;
+    invalidate_term() and invalidate_assessments() write a new token whenever
+    that data changes, and caches, ETags and in-memory indexes are keyed on it.
+    """
+    scope = models.CharField(max_length=100, unique=True)
+    token = models.CharField(max_length=32)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = "data_versions"
+
 class DegPlannerProgram(models.Model):
     program_name = models.CharField(max_length=100, unique=True)
     is_coop = models.BooleanField(default=False)
@@ -0,0 +1,144 @@
+# scheduler/parallel.py
+"""
+Multi-process schedule search for very large combination spaces.
+
+The search tree is split on its first one or two branching levels
+(ScheduleSolver.subtree_prefixes) and every subtree is searched in a worker
+process. Results are merged in subtree order, which is exactly the order the
+sequential search would produce, so offsets and cursors stay stable no matter
+which worker finishes first.
+
+Workers only receive plain lists of int masks and import nothing from Django,
+so the pool uses the "spawn" start method and never inherits database
+connections from the web worker.
+"""
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+
+from .solver import ScheduleSolver, SearchDeadlineExceeded
+
+logger = logging.getLogger(__name__)
+
+PARALLEL_WORKERS = max(2, min(8, (os.cpu_count() or 2) - 1))
+# Wall-clock budget for one parallel search, in seconds
+PARALLEL_TIME_BUDGET = 10.0
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ProcessPoolExecutor(
+                max_workers=PARALLEL_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _executor
+
+
+def _search_subtrees(masks, mode, prefixes, resume_after, needed, deadline):
+    """
+    Worker: enumerate up to `needed` combinations from a run of consecutive
+    subtrees, in order. resume_after only applies to the first subtree.
+
+    Returns:
+        (combinations, complete): complete is False if the deadline passed
+        before the subtrees were exhausted or `needed` combinations were found
+    """
+    solver = ScheduleSolver(masks, mode)
+    found = []
+    try:
+        for i, prefix in enumerate(prefixes):
+            # The deadline is checked while searching, not just per combination
+            # found, so a subtree with few or no solutions stops on time too
+            for choice in solver.search(resume_after=resume_after if i == 0 else None, prefix=prefix, deadline=deadline):
+                found.append(choice)
+                if len(found) >= needed:
+                    return found, True
+    except SearchDeadlineExceeded:
+        return found, False
+    return found, True
+
+
+def parallel_search(solver, needed, resume_after=None, time_budget=PARALLEL_TIME_BUDGET):
+    """
+    Find the first `needed` combinations of `solver.search(resume_after)` using
+    a process pool.
+
+    Returns:
+        (combinations, complete): combinations in sequential enumeration order;
+        complete is False if the time budget ran out before `needed`
+        combinations (or the whole space) were covered
+
+    Raises:
+        ValueError: if resume_after is not a combination of this search
+    """
+    depth = 1
+    prefixes = solver.subtree_prefixes(depth)
+    if 0 < len(prefixes) < PARALLEL_WORKERS * 2:
+        depth = 2
+        prefixes = solver.subtree_prefixes(depth)
+
+    first = 0
+    if resume_after is not None:
+        # Skip the subtrees that precede the one holding the cursor
+        for first, prefix in enumerate(prefixes):
+            if all(index is None or index == resume_after[c] for c, index in enumerate(prefix)):
+                break
+        else:
+            raise ValueError("Cursor is not a schedule of this request")
+
+    # Hand each task a contiguous run of subtrees so the masks are only
+    # pickled a few times, while still leaving work to balance across workers
+    prefixes = prefixes[first:]
+    chunk_size = max(1, -(-len(prefixes) // (PARALLEL_WORKERS * 2)))
+    chunks = [prefixes[i:i + chunk_size] for i in range(0, len(prefixes), chunk_size)]
+
+    deadline = time.time() + time_budget
+    executor = _get_executor()
+    futures = [
+        executor.submit(
+            _search_subtrees,
+            solver.masks,
+            solver.mode,
+            chunk,
+            resume_after if i == 0 else None,
+            needed,
+            deadline,
+        )
+        for i, chunk in enumerate(chunks)
+    ]
+
+    combinations = []
+    complete = True
+    try:
+        # Merge strictly in subtree order; later chunks are only useful once
+        # every earlier one has been fully accounted for
+        for future in futures:
+            remaining = max(0.0, deadline - time.time()) + 1.0
+            found, subtree_complete = future.result(timeout=remaining)
+            combinations.extend(found)
+            if len(combinations) >= needed:
+                break
+            if not subtree_complete:
+                complete = False
+                break
+    except FutureTimeoutError:
+        complete = False
+    finally:
+        # Only queued tasks can be cancelled; running ones stop by themselves
+        # at the deadline or once they have found `needed` combinations
+        for future in futures:
+            future.cancel()
+
+    logger.info(
+        f"Parallel search over {len(prefixes)} subtrees (depth {depth}) found "
+        f"{len(combinations)} combinations, complete={complete}"
+    )
+    return combinations[:needed], complete
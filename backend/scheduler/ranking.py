@@ -0,0 +1,217 @@
+# scheduler/ranking.py
+"""
+Preference scoring for ranked schedule generation.
+
+A schedule's cost is a weighted sum of:
+
+- early_start:     minutes of class before `earliest_start`
+- late_end:        minutes of class after `latest_end`
+- gap_minutes:     idle minutes between the first and last class of each day
+- days_on_campus:  number of days with at least one class
+- instructor:      sections not taught by one of `preferred_instructors`
+
+Lower is better. Because sections in a conflict-free schedule never overlap,
+the early/late/instructor terms are additive per section, which is what
+lets ScheduleSolver.search_ranked() compute admissible lower bounds for
+partial schedules and prune whole subtrees (see lower_bound()).
+"""
+import math
+
+from .timetable import MINUTES_PER_DAY, interval_mask, parse_clock
+
+DEFAULT_WEIGHTS = {
+    "early_start": 1.0,
+    "late_end": 1.0,
+    "gap_minutes": 0.5,
+    "days_on_campus": 120.0,
+    "instructor": 60.0,
+}
+DEFAULT_EARLIEST_START = "9:00 AM"
+DEFAULT_LATEST_END = "6:00 PM"
+
+_DAY_MASK = (1 << MINUTES_PER_DAY) - 1
+
+
+def _day_bits(mask):
+    """7-bit int with bit d set if the occupancy mask has a class on day d"""
+    bits = 0
+    for day in range(7):
+        if (mask >> (day * MINUTES_PER_DAY)) & _DAY_MASK:
+            bits |= 1 << day
+    return bits
+
+
+def _gap_minutes(mask):
+    """Idle minutes between the first and last class of each day"""
+    gaps = 0
+    for day in range(7):
+        bits = (mask >> (day * MINUTES_PER_DAY)) & _DAY_MASK
+        if bits:
+            first = (bits & -bits).bit_length() - 1
+            gaps += bits.bit_length() - first - bits.bit_count()
+    return gaps
+
+
+class SchedulePreferences:
+    """
+    Weighted schedule preferences.
+
+    Args:
+        weights: dict overriding DEFAULT_WEIGHTS, a weight of 0 disables a term;
+            weights must be finite and non-negative (ValueError otherwise)
+        earliest_start: minutes after midnight before which class time is penalised
+        latest_end: minutes after midnight after which class time is penalised
+        preferred_instructors: instructor names (case-insensitive substrings)
+    """
+
+    def __init__(self, weights=None, earliest_start=None, latest_end=None, preferred_instructors=None):
+        self.weights = dict(DEFAULT_WEIGHTS)
+        for name, value in (weights or {}).items():
+            if name not in DEFAULT_WEIGHTS:
+                raise ValueError(f"Unknown preference weight '{name}'")
+            value = float(value)
+            # A negative or non-finite weight would make lower_bound()
+            # overestimate, and search_ranked() would prune better schedules
+            if not (math.isfinite(value) and value >= 0):
+                raise ValueError(f"Preference weight '{name}' must be a finite number >= 0")
+            self.weights[name] = value
+        self.earliest_start = parse_clock(DEFAULT_EARLIEST_START) if earliest_start is None else earliest_start
+        self.latest_end = parse_clock(DEFAULT_LATEST_END) if latest_end is None else latest_end
+        self.preferred_instructors = [name.lower() for name in (preferred_instructors or []) if name]
+
+        self._early_mask = 0
+        self._late_mask = 0
+        for day in range(7):
+            if self.earliest_start > 0:
+                self._early_mask |= interval_mask(day, 0, self.earliest_start)
+            if self.latest_end < MINUTES_PER_DAY:
+                self._late_mask |= interval_mask(day, self.latest_end, MINUTES_PER_DAY)
+
+        self.section_costs = []
+        self.section_days = []
+        self.section_masks = []
+
+    @classmethod
+    def from_request(cls, data):
+        """
+        Build preferences from the "preferences" object of a request:
+
+            {
+                "earliest_start": "9:00 AM",
+                "latest_end": "6:00 PM",
+                "preferred_instructors": ["Smith"],
+                "weights": {"days_on_campus": 200, "gap_minutes": 1}
+            }
+
+        A single instructor may also be given as a plain string.
+
+        Raises:
+            ValueError: for unknown, negative or non-finite weights, unparseable
+                times or instructors that are neither a string nor a list of strings
+        """
+        data = data or {}
+        instructors = data.get("preferred_instructors")
+        if isinstance(instructors, str):
+            instructors = [instructors]
+        elif instructors is not None and (
+            not isinstance(instructors, list) or not all(isinstance(name, str) for name in instructors)
+        ):
+            raise ValueError("preferred_instructors must be a list of names")
+        times = {}
+        for field in ("earliest_start", "latest_end"):
+            value = data.get(field)
+            if value is not None:
+                times[field] = parse_clock(value)
+                if times[field] is None:
+                    raise ValueError(f"{field} must look like '9:00 AM'")
+        return cls(
+            weights=data.get("weights"),
+            preferred_instructors=instructors,
+            **times,
+        )
+
+    # ------------------------------------------------------------------
+    # Per-section precomputation
+    # ------------------------------------------------------------------
+    def prepare(self, course_data):
+        """
+        Precompute the additive cost, the campus days and the weekly mask of
+        every section.
+
+        Args:
+            course_data: list per course of section dicts with "mask" and "instructor"
+        """
+        self.section_costs = [[self.section_cost(s) for s in sections] for sections in course_data]
+        self.section_days = [[_day_bits(s["mask"]) for s in sections] for sections in course_data]
+        self.section_masks = [[s["mask"] for s in sections] for sections in course_data]
+        return self
+
+    def section_cost(self, section):
+        """Cost terms that only depend on the section itself"""
+        mask = section["mask"]
+        cost = self.weights["early_start"] * (mask & self._early_mask).bit_count()
+        cost += self.weights["late_end"] * (mask & self._late_mask).bit_count()
+        if self.preferred_instructors and self.weights["instructor"]:
+            instructor = (section.get("instructor") or "").lower()
+            if not any(name in instructor for name in self.preferred_instructors):
+                cost += self.weights["instructor"]
+        return cost
+
+    # ------------------------------------------------------------------
+    # Scoring
+    # ------------------------------------------------------------------
+    def score(self, occupied, additive_cost):
+        """Total cost of a complete schedule, from its weekly occupancy mask"""
+        cost = additive_cost
+        cost += self.weights["gap_minutes"] * _gap_minutes(occupied)
+        cost += self.weights["days_on_campus"] * _day_bits(occupied).bit_count()
+        return cost
+
+    def lower_bound(self, occupied, additive_cost, remaining):
+        """
+        Admissible lower bound on the cost of any completion of a partial
+        schedule.
+
+        Args:
+            occupied: weekly occupancy mask of the placed sections
+            additive_cost: sum of section_cost() of the placed sections
+            remaining: list of (course, viable section indexes) still to place
+
+        Additive terms use the cheapest viable section of every remaining
+        course. Days on campus can only grow, and at least the largest
+        "cheapest number of new days" among remaining courses will be added.
+        Gaps can shrink as sections are added, so they only count once the
+        schedule is complete.
+        """
+        occupied_days = _day_bits(occupied)
+        bound = additive_cost
+        extra_days = 0
+        for course, domain in remaining:
+            costs = self.section_costs[course]
+            days = self.section_days[course]
+            bound += min(costs[i] for i in domain)
+            extra_days = max(extra_days, min((days[i] & ~occupied_days).bit_count() for i in domain))
+        if not remaining:
+            bound += self.weights["gap_minutes"] * _gap_minutes(occupied)
+        return bound + self.weights["days_on_campus"] * (occupied_days.bit_count() + extra_days)
+
+    def breakdown(self, course_data, choice):
+        """Per-term cost breakdown of a complete schedule, for the response"""
+        occupied = 0
+        instructor_misses = 0
+        for sections, index in zip(course_data, choice):
+            section = sections[index]
+            occupied |= section["mask"]
+            if self.preferred_instructors:
+                instructor = (section.get("instructor") or "").lower()
+                if not any(name in instructor for name in self.preferred_instructors):
+                    instructor_misses += 1
+        additive = sum(self.section_costs[c][i] for c, i in enumerate(choice))
+        return {
+            "score": round(self.score(occupied, additive), 2),
+            "early_minutes": (occupied & self._early_mask).bit_count(),
+            "late_minutes": (occupied & self._late_mask).bit_count(),
+            "gap_minutes": _gap_minutes(occupied),
+            "days_on_campus": _day_bits(occupied).bit_count(),
+            "non_preferred_instructors": instructor_misses,
+        }
@@ -0,0 +1,151 @@
+# scheduler/schedule_cache.py
+"""
+Persistent result cache for conflict_free_schedule, stored in the
+ConflictFreeSchedules table.
+
+Entries are keyed on a hash of the canonical request (term, the term's data
+version, sorted course/section selection, solver and preference options,
+page position) and hold the ready-to-serve response. Every entry also
+records the courses it was built from as "|CIS*3750|ENGG*3380|", so a change
+to any section of one of those courses deletes exactly the affected entries,
+once per transaction (see invalidation.py and the signals in models.py).
+Raw-SQL scraper imports invalidate the whole term. Because the data version (term_index.term_data_version, stored in the
+database) is part of the key, a worker still holding a stale index writes
+entries no up-to-date request ever reads.
+
+Entries expire after SCHEDULE_CACHE_TTL. purge_expired_schedules() deletes
+them, and the oldest entries past SCHEDULE_CACHE_MAX_ENTRIES, and runs from
+Celery beat (scheduler.tasks).
+"""
+import datetime
+import hashlib
+import json
+import logging
+
+from django.db import IntegrityError
+from django.db.models import Q
+from django.utils import timezone
+
+from metrics.prometheus import schedule_cache_requests
+
+logger = logging.getLogger(__name__)
+
+# Seconds a cached response is served
+SCHEDULE_CACHE_TTL = 24 * 60 * 60
+# Entries kept at most; purge_expired_schedules() drops the oldest beyond it
+SCHEDULE_CACHE_MAX_ENTRIES = 20000
+
+
+def canonical_selection(selected_courses):
+    """Sorted [course_type, course_code, course_section] triples of a request"""
+    return sorted(
+        [c["course_type"], c["course_code"], c.get("course_section") or ""]
+        for c in selected_courses
+    )
+
+
+def courses_field(selection):
+    """Delimited course list stored on each entry, used for invalidation"""
+    course_keys = sorted({f"{course_type}*{course_code}" for course_type, course_code, _ in selection})
+    return "|" + "|".join(course_keys) + "|"
+
+
+def cache_key(offered_term, data_version, selection, options):
+    """Stable hash of everything that determines a response"""
+    raw = json.dumps([offered_term, data_version, selection, options], sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+def get_cached_schedules(key):
+    """
+    Return the cached response for `key`, or None on a miss.
+
+    A hit is a single read; hits and misses are only counted in Prometheus
+    (schedule_cache_requests), so serving from the cache writes nothing
+    """
+    from .models import ConflictFreeSchedules
+
+    fresh_since = timezone.now() - datetime.timedelta(seconds=SCHEDULE_CACHE_TTL)
+    entry = (
+        ConflictFreeSchedules.objects
+        .filter(cache_key=key, updated_at__gte=fresh_since)
+        .values_list("conflict_free", flat=True)
+        .first()
+    )
+    if entry is None:
+        schedule_cache_requests.labels(result="miss").inc()
+        return None
+    schedule_cache_requests.labels(result="hit").inc()
+    return entry
+
+
+def store_schedules(key, offered_term, selection, response_data):
+    """Save a freshly generated response under `key`"""
+    from .models import ConflictFreeSchedules
+
+    try:
+        ConflictFreeSchedules.objects.update_or_create(
+            cache_key=key,
+            defaults={
+                "offered_term": offered_term,
+                "courses": courses_field(selection),
+                "conflict_free": response_data,
+            },
+        )
+    except IntegrityError:
+        # A concurrent request stored the same entry first
+        pass
+
+
+def invalidate_schedule_cache(offered_term=None, course_type=None, course_code=None, courses=None):
+    """
+    Delete cached schedules affected by a data change.
+
+    Args:
+        offered_term: term of the changed section, or None for every term
+        course_type, course_code: the changed course; when omitted every
+            entry of the term is deleted
+        courses: alternatively, (course_type, course_code) pairs of several
+            changed courses, deleted with a single query
+    """
+    from .models import ConflictFreeSchedules
+
+    if course_type is not None and course_code is not None:
+        courses = [(course_type, course_code)]
+    entries = ConflictFreeSchedules.objects.exclude(cache_key=None)
+    if offered_term is not None:
+        entries = entries.filter(offered_term=offered_term)
+    if courses is not None:
+        if not courses:
+            return
+        query = Q()
+        for changed_type, changed_code in sorted(set(courses)):
+            query |= Q(courses__contains=f"|{changed_type}*{changed_code}|")
+        entries = entries.filter(query)
+    deleted, _ = entries.delete()
+    if deleted:
+        logger.info(f"Invalidated {deleted} cached schedule results for {offered_term} ({len(courses) if courses else 'all'} courses)")
+
+
+def purge_expired_schedules():
+    """
+    Delete expired entries, then the oldest entries beyond
+    SCHEDULE_CACHE_MAX_ENTRIES.
+
+    Returns:
+        number of entries deleted
+    """
+    from .models import ConflictFreeSchedules
+
+    entries = ConflictFreeSchedules.objects.exclude(cache_key=None)
+    fresh_since = timezone.now() - datetime.timedelta(seconds=SCHEDULE_CACHE_TTL)
+    deleted, _ = entries.filter(updated_at__lt=fresh_since).delete()
+
+    cutoff = entries.order_by("-updated_at").values_list("updated_at", flat=True)[SCHEDULE_CACHE_MAX_ENTRIES:SCHEDULE_CACHE_MAX_ENTRIES + 1]
+    cutoff = list(cutoff)
+    if cutoff:
+        extra, _ = entries.filter(updated_at__lte=cutoff[0]).delete()
+        deleted += extra
+    if deleted:
+        logger.info(f"Purged {deleted} cached schedule results")
+    return deleted
@@ -0,0 +1,507 @@
+# scheduler/solver.py
+"""
+Search engine behind the conflict-free schedule generator.
+
+Courses are variables and their sections are the values, each section being
+represented by its weekly occupancy bitmask (see timetable.py). Two search
+strategies are available:
+
+- "backtrack": the original strategy. Courses are tried in request order and
+  a conflict is only detected when a section is placed.
+- "forward_checking": arc consistency is enforced once up front, then after
+  every placement the sections of all remaining courses that overlap it are
+  pruned, and the search always branches next on the course with the fewest
+  viable sections. Dead ends are found before descending into them, and a
+  request without any solution is usually rejected before the search starts.
+
+Every search records per-depth node and prune counts in `solver.stats`
+(SearchStats) for instrumentation.
+
+Solutions are yielded as tuples holding one section index per course, in the
+order the courses were given, so callers never depend on the branching order.
+
+The enumeration order is deterministic, so any solution doubles as a resume
+point: search(resume_after=solution) walks straight back down that solution's
+path and continues with the next one. encode_cursor()/decode_cursor() turn
+such a position into an opaque, stateless pagination token.
+
+count() computes the exact number of solutions with a dynamic program over
+projected occupancy masks, so totals don't require enumeration.
+
+search_ranked() is a branch-and-bound variant that returns the top-K
+combinations under a SchedulePreferences cost (see ranking.py) without
+enumerating and sorting the whole space.
+"""
+import base64
+import binascii
+import bisect
+import hashlib
+import json
+import time
+
+SOLVER_BACKTRACK = "backtrack"
+SOLVER_FORWARD_CHECKING = "forward_checking"
+SOLVER_MODES = (SOLVER_BACKTRACK, SOLVER_FORWARD_CHECKING)
+
+# Candidate sections tried between two deadline checks in search()
+DEADLINE_CHECK_NODES = 1000
+
+_UNSET = object()
+
+
+class _NodeBudgetExceeded(Exception):
+    """Raised inside search_ranked() to unwind once max_nodes is reached"""
+
+
+class SearchDeadlineExceeded(Exception):
+    """Raised by search() when its deadline passes, between two solutions or not"""
+
+
+class SearchStats:
+    """
+    Counters collected while searching, per depth (number of courses placed
+    before the branch).
+
+    nodes[d]: sections placed at depth d
+    pruned[d]: candidate sections rejected at depth d, because they overlap
+        the partial schedule or (forward checking) would leave some other
+        course without a viable section
+    """
+
+    def __init__(self, depth):
+        self.nodes = [0] * depth
+        self.pruned = [0] * depth
+        self.solutions = 0
+
+    def branching_factor(self):
+        """Average number of sections placed under each expanded node"""
+        placed = sum(self.nodes)
+        # The root plus every placement that still had courses below it
+        expanded = 1 + sum(self.nodes[:-1])
+        return placed / expanded if placed else 0.0
+
+    def as_dict(self):
+        return {
+            "nodes_visited": sum(self.nodes),
+            "nodes_per_depth": list(self.nodes),
+            "pruned_per_depth": list(self.pruned),
+            "solutions": self.solutions,
+            "branching_factor": round(self.branching_factor(), 3),
+        }
+
+
+class ScheduleSolver:
+    """
+    Enumerate conflict-free section combinations.
+
+    Args:
+        domains: list with one entry per course, each a list of section masks
+        mode: SOLVER_FORWARD_CHECKING (default) or SOLVER_BACKTRACK
+    """
+
+    def __init__(self, domains, mode=SOLVER_FORWARD_CHECKING):
+        if mode not in SOLVER_MODES:
+            raise ValueError(f"Unknown solver mode '{mode}'")
+        self.masks = [list(sections) for sections in domains]
+        self.mode = mode
+        self.stats = SearchStats(len(self.masks))
+        self._initial_domains = _UNSET
+        self._deadline = None
+        self._ticks = DEADLINE_CHECK_NODES
+
+    # ------------------------------------------------------------------
+    # Domain pruning
+    # ------------------------------------------------------------------
+    def initial_domains(self):
+        """
+        Viable section indexes per course before the search starts, or None
+        if the request provably has no solution.
+        """
+        if self._initial_domains is _UNSET:
+            domains = [list(range(len(sections))) for sections in self.masks]
+            if any(not d for d in domains):
+                domains = None
+            elif self.mode == SOLVER_FORWARD_CHECKING:
+                domains = self._enforce_arc_consistency(domains)
+            self._initial_domains = domains
+        return self._initial_domains
+
+    def is_infeasible(self):
+        """True if no conflict-free schedule can exist for this request"""
+        return self.initial_domains() is None
+
+    def _enforce_arc_consistency(self, domains):
+        """
+        Drop every section that conflicts with all viable sections of some
+        other course, repeating until nothing changes (AC-3 on the pairwise
+        "sections do not overlap" constraints).
+        """
+        masks = self.masks
+        count = len(domains)
+        changed = True
+        while changed:
+            changed = False
+            for a in range(count):
+                masks_a = masks[a]
+                for b in range(count):
+                    if a == b:
+                        continue
+                    masks_b = [masks[b][j] for j in domains[b]]
+                    supported = [
+                        i for i in domains[a]
+                        if any(not masks_a[i] & mask_b for mask_b in masks_b)
+                    ]
+                    if not supported:
+                        return None
+                    if len(supported) != len(domains[a]):
+                        domains[a] = supported
+                        changed = True
+        return domains
+
+    # ------------------------------------------------------------------
+    # Search
+    # ------------------------------------------------------------------
+    def search(self, resume_after=None, prefix=None, deadline=None):
+        """
+        Yield every conflict-free combination as a tuple of section indexes.
+
+        Args:
+            resume_after: a combination previously yielded by this search; when
+                given, enumeration starts right after it instead of at the
+                beginning
+            prefix: a partial combination from subtree_prefixes(); when given,
+                only the combinations inside that subtree are yielded, in the
+                same order the full search would yield them
+            deadline: optional time.time() value; checked every
+                DEADLINE_CHECK_NODES candidate sections, so a sparse subtree
+                can't run past it while looking for the next combination
+
+        Raises:
+            SearchDeadlineExceeded: once the deadline has passed
+        """
+        domains = self.initial_domains()
+        if domains is None:
+            return
+        if resume_after is not None and len(resume_after) != len(domains):
+            raise ValueError("resume_after does not match the number of courses")
+        if prefix is not None and len(prefix) != len(domains):
+            raise ValueError("prefix does not match the number of courses")
+        assignment = [None] * len(domains)
+        self._deadline = deadline
+        self._ticks = DEADLINE_CHECK_NODES
+        if self.mode == SOLVER_FORWARD_CHECKING:
+            yield from self._search_forward_checking(assignment, domains, len(domains), resume_after, prefix)
+        else:
+            yield from self._search_backtrack(assignment, 0, 0, resume_after, prefix)
+
+    def subtree_prefixes(self, depth):
+        """
+        Partial combinations covering the first `depth` branching levels of the
+        search tree, in enumeration order. Searching every prefix with
+        search(prefix=...) and concatenating the results reproduces search().
+        """
+        domains = self.initial_domains()
+        if domains is None:
+            return []
+        prefixes = []
+        assignment = [None] * len(domains)
+
+        def walk_backtrack(course, occupied):
+            if course >= min(depth, len(assignment)):
+                prefixes.append(tuple(assignment))
+                return
+            for index, mask in enumerate(self.masks[course]):
+                if not mask & occupied:
+                    assignment[course] = index
+                    walk_backtrack(course + 1, occupied | mask)
+            assignment[course] = None
+
+        def walk_forward_checking(domains, level):
+            if level >= min(depth, len(assignment)):
+                prefixes.append(tuple(assignment))
+                return
+            course = self._select_course(assignment, domains)
+            for index in domains[course]:
+                new_domains = self._propagate(assignment, domains, course, self.masks[course][index])
+                if new_domains is not None:
+                    assignment[course] = index
+                    walk_forward_checking(new_domains, level + 1)
+            assignment[course] = None
+
+        if self.mode == SOLVER_FORWARD_CHECKING:
+            walk_forward_checking(domains, 0)
+        else:
+            walk_backtrack(0, 0)
+        return prefixes
+
+    def _search_backtrack(self, assignment, course, occupied, resume=None, prefix=None):
+        if course >= len(assignment):
+            # While resuming, the leaf we walked back to was already returned
+            if resume is None:
+                self.stats.solutions += 1
+                yield tuple(assignment)
+            return
+        start = resume[course] if resume is not None else 0
+        masks = self.masks[course]
+        indexes = range(start, len(masks))
+        if prefix is not None and prefix[course] is not None:
+            indexes = [prefix[course]] if prefix[course] >= start else []
+        for index in indexes:
+            self._ticks -= 1
+            if not self._ticks:
+                self._check_deadline()
+            mask = masks[index]
+            if mask & occupied:
+                self.stats.pruned[course] += 1
+                continue
+            self.stats.nodes[course] += 1
+            assignment[course] = index
+            # Only the resume section itself continues along the resume path
+            yield from self._search_backtrack(
+                assignment, course + 1, occupied | mask, resume if index == start else None, prefix
+            )
+        assignment[course] = None
+
+    def _check_deadline(self):
+        self._ticks = DEADLINE_CHECK_NODES
+        if self._deadline is not None and time.time() > self._deadline:
+            raise SearchDeadlineExceeded()
+
+    def _select_course(self, assignment, domains):
+        """Unassigned course with the fewest viable sections (lowest index on ties)"""
+        best = None
+        best_size = None
+        for course, domain in enumerate(domains):
+            if assignment[course] is None and (best is None or len(domain) < best_size):
+                best = course
+                best_size = len(domain)
+        return best
+
+    def _propagate(self, assignment, domains, course, mask):
+        """
+        Remove sections overlapping `mask` from every unassigned course.
+        Returns the new domains, or None if some course runs out of sections.
+        """
+        masks = self.masks
+        new_domains = list(domains)
+        for other, domain in enumerate(domains):
+            if other == course or assignment[other] is not None:
+                continue
+            masks_other = masks[other]
+            remaining = [i for i in domain if not masks_other[i] & mask]
+            if not remaining:
+                return None
+            new_domains[other] = remaining
+        return new_domains
+
+    def _search_forward_checking(self, assignment, domains, unassigned, resume=None, prefix=None):
+        if unassigned == 0:
+            # While resuming, the leaf we walked back to was already returned
+            if resume is None:
+                self.stats.solutions += 1
+                yield tuple(assignment)
+            return
+        depth = len(assignment) - unassigned
+        course = self._select_course(assignment, domains)
+        masks = self.masks[course]
+        start = resume[course] if resume is not None else -1
+        indexes = domains[course]
+        if prefix is not None and prefix[course] is not None:
+            indexes = [prefix[course]] if prefix[course] in indexes else []
+        for index in indexes:
+            # Domains stay in ascending index order, so everything before the
+            # resume section was fully explored on an earlier page
+            if index < start:
+                continue
+            self._ticks -= 1
+            if not self._ticks:
+                self._check_deadline()
+            mask = masks[index]
+            new_domains = self._propagate(assignment, domains, course, mask)
+            if new_domains is None:
+                self.stats.pruned[depth] += 1
+                continue
+            self.stats.nodes[depth] += 1
+            assignment[course] = index
+            yield from self._search_forward_checking(
+                assignment, new_domains, unassigned - 1, resume if index == start else None, prefix
+            )
+            assignment[course] = None
+
+
+    # ------------------------------------------------------------------
+    # Counting
+    # ------------------------------------------------------------------
+    def count(self, max_work=None):
+        """
+        Exact number of conflict-free combinations, without enumerating them.
+
+        Courses are placed one at a time while tracking how many partial
+        schedules lead to each occupancy mask. Only the minutes that a later
+        course could still collide with matter, so each mask is projected onto
+        the union of the remaining courses' sections and partial schedules
+        that agree there are merged into one state. Sections that share no
+        time with the rest of the request therefore collapse completely.
+
+        Args:
+            max_work: optional cap on (state, section) pairs examined in
+                total. Each step's work is known before it starts, so the
+                count is abandoned before exceeding the cap rather than after
+
+        Returns:
+            int, or None if max_work would be exceeded
+        """
+        domains = self.initial_domains()
+        if domains is None:
+            return 0
+
+        # relevant[k]: minutes used by any viable section of courses k..n-1
+        relevant = [0] * (len(domains) + 1)
+        for course in range(len(domains) - 1, -1, -1):
+            union = relevant[course + 1]
+            for index in domains[course]:
+                union |= self.masks[course][index]
+            relevant[course] = union
+
+        states = {0: 1}
+        work = 0
+        for course, domain in enumerate(domains):
+            keep = relevant[course + 1]
+            masks = [self.masks[course][index] for index in domain]
+            work += len(states) * len(masks)
+            if max_work is not None and work > max_work:
+                return None
+            next_states = {}
+            for occupied, ways in states.items():
+                for mask in masks:
+                    if mask & occupied:
+                        continue
+                    projected = (occupied | mask) & keep
+                    next_states[projected] = next_states.get(projected, 0) + ways
+            if not next_states:
+                return 0
+            states = next_states
+        return sum(states.values())
+
+    # ------------------------------------------------------------------
+    # Ranked search
+    # ------------------------------------------------------------------
+    def search_ranked(self, preferences, top_k, max_nodes=None):
+        """
+        Return the top_k cheapest combinations under `preferences`.
+
+        Depth-first branch and bound with forward checking: sections are tried
+        cheapest first, and a subtree is cut as soon as the admissible lower
+        bound from preferences.lower_bound() is worse than the current k-th
+        best schedule. Ties are broken by the combination tuple so results are
+        deterministic.
+
+        Conflicts are pruned on the solver's masks, which may be date-aware
+        (see conflicts.build_masks), while costs and bounds are computed on
+        the weekly occupancy built from the section masks kept by
+        preferences.prepare().
+
+        Args:
+            preferences: a prepared SchedulePreferences
+            top_k: number of schedules to return
+            max_nodes: optional cap on search nodes; when hit, the best
+                schedules found so far are returned
+
+        Returns:
+            (results, complete): results is a list of (cost, combination)
+            sorted best first; complete is False if max_nodes was hit
+        """
+        best = []
+        if top_k <= 0:
+            return best, True
+        domains = self.initial_domains()
+        if domains is None:
+            return best, True
+
+        count = len(domains)
+        assignment = [None] * count
+        nodes = 0
+        costs = preferences.section_costs
+        weekly_masks = preferences.section_masks
+        stats = self.stats
+
+        def visit(occupied, additive, domains, unassigned):
+            nonlocal nodes
+            nodes += 1
+            if max_nodes is not None and nodes > max_nodes:
+                raise _NodeBudgetExceeded()
+
+            if unassigned == 0:
+                stats.solutions += 1
+                entry = (preferences.score(occupied, additive), tuple(assignment))
+                if len(best) < top_k or entry < best[-1]:
+                    bisect.insort(best, entry)
+                    if len(best) > top_k:
+                        best.pop()
+                return
+
+            remaining = [(c, domains[c]) for c in range(count) if assignment[c] is None]
+            if len(best) == top_k and preferences.lower_bound(occupied, additive, remaining) > best[-1][0]:
+                return
+
+            depth = count - unassigned
+            course = self._select_course(assignment, domains)
+            course_costs = costs[course]
+            masks = self.masks[course]
+            for index in sorted(domains[course], key=lambda i: (course_costs[i], i)):
+                mask = masks[index]
+                new_domains = self._propagate(assignment, domains, course, mask)
+                if new_domains is None:
+                    stats.pruned[depth] += 1
+                    continue
+                stats.nodes[depth] += 1
+                assignment[course] = index
+                visit(occupied | weekly_masks[course][index], additive + course_costs[index], new_domains, unassigned - 1)
+                assignment[course] = None
+
+        try:
+            visit(0, 0, domains, count)
+        except _NodeBudgetExceeded:
+            return best, False
+        return best, True
+
+
+# ----------------------------------------------------------------------
+# Stateless pagination cursors
+# ----------------------------------------------------------------------
+def request_fingerprint(*parts):
+    """Short hash identifying a search request, embedded in its cursors"""
+    raw = json.dumps(parts, sort_keys=True, default=str).encode()
+    return hashlib.sha1(raw).hexdigest()[:16]
+
+
+def encode_cursor(fingerprint, position):
+    """
+    Encode a search position (the last returned combination) as a URL-safe
+    token. The fingerprint ties the token to the request that produced it.
+    """
+    raw = json.dumps({"f": fingerprint, "p": list(position)}, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(token, fingerprint, course_count):
+    """
+    Decode a cursor produced by encode_cursor().
+
+    Returns:
+        tuple of section indexes to pass as search(resume_after=...)
+
+    Raises:
+        ValueError: if the token is malformed or belongs to another request
+            (different term, courses or solver mode)
+    """
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        position = tuple(int(i) for i in payload["p"])
+        token_fingerprint = payload["f"]
+    except (binascii.Error, ValueError, KeyError, TypeError, AttributeError):
+        raise ValueError("Malformed cursor")
+    if token_fingerprint != fingerprint or len(position) != course_count or min(position, default=0) < 0:
+        raise ValueError("Cursor does not match this request or the course data has changed")
+    return position
@@ -0,0 +1,9 @@
+from celery import shared_task
+
+from scheduler.schedule_cache import purge_expired_schedules
+
+
+@shared_task
+def purge_schedule_cache():
+    """Drop expired and surplus conflict_free_schedule cache entries"""
+    return purge_expired_schedules()
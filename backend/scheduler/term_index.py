@@ -0,0 +1,264 @@
+# scheduler/term_index.py
+"""
+Per-term, in-memory index of every section and its compiled meeting times.
+
+The schedule generator used to run one Course query per requested course and
+one Event query per section, then re-parse every "times" string. This module
+loads a whole term with two queries, compiles each section's meetings once
+from the precompiled Event columns (see timetable.py) and keeps the result in
+process memory:
+
+    index["courses"][("CIS", "3750")] -> [section_data, ...]
+
+Each term has a data version token stored in the DataVersion table, so every
+process, including the scraper's, sees the same token. Model signals (see
+models.py) and the scraper pipeline call invalidate_term() when rows change,
+which makes every process rebuild its copy on the next request. Processes
+re-read the tokens at most every VERSION_CHECK_INTERVAL seconds, which bounds
+how stale another process's copy can get; the process that invalidates sees
+the new token immediately.
+"""
+import hashlib
+import logging
+import threading
+import time
+import uuid
+
+from .conflicts import build_masks, compile_section_meetings
+from .timetable import compile_meetings
+
+logger = logging.getLogger(__name__)
+
+# Rebuild an index at least this often, even without an invalidation
+INDEX_MAX_AGE = 15 * 60
+
+# Seconds a process trusts the data version tokens it last read
+VERSION_CHECK_INTERVAL = 2
+
+# DataVersion scopes; terms use their own name
+_GLOBAL_SCOPE = "__all__"
+_CATALOG_SCOPE = "__catalog__"
+# Prefix of the per-term scopes of assessments (CourseEvent rows)
+_ASSESSMENT_SCOPE = "__assessments__:"
+
+# Event columns holding the pre-parsed meeting times (see conflicts.encode_event)
+_PRECOMPILED_FIELDS = ("start_minute", "end_minute", "day_mask", "start_date", "end_date")
+
+_indexes = {}
+_build_lock = threading.Lock()
+
+# scope -> (token, monotonic time it was read)
+_tokens = {}
+
+
+def _new_token():
+    return uuid.uuid4().hex[:12]
+
+
+def cache_key_part(value):
+    """
+    Term names contain spaces, which some cache backends reject in keys;
+    hash them into a short key-safe string.
+    """
+    return hashlib.sha1(str(value).encode()).hexdigest()[:16]
+
+
+def _read_tokens(*scopes):
+    """Current tokens of some DataVersion scopes; "0" for a scope never bumped"""
+    from .models import DataVersion
+
+    now = time.monotonic()
+    stale = [scope for scope in scopes if scope not in _tokens or now - _tokens[scope][1] >= VERSION_CHECK_INTERVAL]
+    if stale:
+        stored = dict(DataVersion.objects.filter(scope__in=stale).values_list("scope", "token"))
+        for scope in stale:
+            _tokens[scope] = (stored.get(scope, "0"), now)
+    return [_tokens[scope][0] for scope in scopes]
+
+
+def _bump(scope):
+    from .models import DataVersion
+
+    token = _new_token()
+    DataVersion.objects.update_or_create(scope=scope, defaults={"token": token})
+    _tokens[scope] = (token, time.monotonic())
+
+
+def term_data_version(offered_term):
+    """
+    Return the current data version token for a term.
+
+    The token changes whenever invalidate_term() is called for that term or
+    for all terms, so it can be used in cache keys and ETags.
+    """
+    global_token, term_token = _read_tokens(_GLOBAL_SCOPE, str(offered_term))
+    return f"{global_token}-{term_token}"
+
+
+def read_api_version(offered_term):
+    """
+    Data version of what the read APIs serve for a term: its section data
+    (term_data_version) plus its assessments, which the section index doesn't
+    hold and which change with invalidate_assessments().
+    """
+    global_token, term_token, assessment_token = _read_tokens(
+        _GLOBAL_SCOPE, str(offered_term), _ASSESSMENT_SCOPE + str(offered_term),
+    )
+    return f"{global_token}-{term_token}-{assessment_token}"
+
+
+def catalog_version():
+    """
+    Data version token covering every term, for documents that span all of
+    them (see catalog.py). Changes on every invalidate_term() call.
+    """
+    return _read_tokens(_CATALOG_SCOPE)[0]
+
+
+def invalidate_term(offered_term=None):
+    """
+    Mark a term's section data as changed, for every process.
+
+    Args:
+        offered_term: Term to invalidate, or None to invalidate every term
+    """
+    _bump(_CATALOG_SCOPE)
+    if offered_term is None:
+        _bump(_GLOBAL_SCOPE)
+        _indexes.clear()
+    else:
+        _bump(str(offered_term))
+        _indexes.pop(offered_term, None)
+
+
+def invalidate_assessments(offered_term, has_events_changed=False):
+    """
+    Mark a term's assessments (CourseEvent rows) as changed. Schedules don't
+    depend on them, so the section index is kept; only read_api_version()
+    changes, and catalog_version() when a section gained its first or lost
+    its last assessment (Course.has_events).
+    """
+    if has_events_changed:
+        _bump(_CATALOG_SCOPE)
+    _bump(_ASSESSMENT_SCOPE + str(offered_term))
+
+
+def _build_term_index(offered_term, version):
+    """Load and compile all sections of a term (two queries)"""
+    from .models import Course, Event
+
+    sections = {}
+    for row in (
+        Course.objects
+        .filter(offered_term=offered_term)
+        .values("course_id", "course_type", "course_code", "section_number", "instructor")
+        .order_by("course_id")
+    ):
+        sections[row["course_id"]] = dict(row, events=[])
+
+    for event in (
+        Event.objects
+        .filter(course_id__offered_term=offered_term)
+        .values(
+            "course_id", "event_type", "times", "location", "days", "dates",
+            *_PRECOMPILED_FIELDS,
+        )
+        .order_by("id")
+    ):
+        section = sections.get(event.pop("course_id"))
+        if section is not None:
+            section["events"].append(event)
+
+    courses = {}
+    for section in sections.values():
+        # Sections without any meetings can't be placed on a timetable
+        if not section["events"]:
+            continue
+        time_slots, mask = compile_meetings(section["events"])
+        section["time_slots"] = time_slots
+        section["mask"] = mask
+        section["meetings"] = compile_section_meetings(section["events"])
+        # Sections without date ranges can use the weekly mask as-is
+        section["dated"] = any(m.first_date is not None for m in section["meetings"])
+        # These only feed the conflict check; the events keep their API shape
+        for event in section["events"]:
+            event.pop("dates")
+            for field in _PRECOMPILED_FIELDS:
+                event.pop(field)
+        section["key"] = f"{section['course_type']}*{section['course_code']}*{section['section_number']}"
+        courses.setdefault((section["course_type"], section["course_code"]), []).append(section)
+
+    return {
+        "offered_term": offered_term,
+        "version": version,
+        "built_at": time.monotonic(),
+        "courses": courses,
+    }
+
+
+def get_term_index(offered_term):
+    """
+    Return the compiled section index for a term, building it if needed.
+
+    Returns:
+        dict: {
+            "offered_term": "Fall 2025",
+            "version": "<data version token>",
+            "built_at": <monotonic seconds>,
+            "courses": {
+                ("CIS", "3750"): [
+                    {
+                        "course_id": 12, "course_type": "CIS", "course_code": "3750",
+                        "section_number": "01", "instructor": "...",
+                        "key": "CIS*3750*01",
+                        "events": [{"event_type", "times", "location", "days"}, ...],
+                        "time_slots": [(day, start_minute, end_minute, event_type), ...],
+                        "mask": <int>,  # weekly occupancy, ignoring date ranges
+                        "meetings": [Meeting(...), ...],  # date-aware, see conflicts.py
+                        "dated": False  # True if any meeting has a date range
+                    },
+                    ...
+                ],
+                ...
+            }
+        }
+    """
+    version = term_data_version(offered_term)
+    index = _indexes.get(offered_term)
+    if index and index["version"] == version and time.monotonic() - index["built_at"] < INDEX_MAX_AGE:
+        return index
+
+    with _build_lock:
+        # Another thread may have rebuilt it while we waited for the lock
+        index = _indexes.get(offered_term)
+        if index and index["version"] == version and time.monotonic() - index["built_at"] < INDEX_MAX_AGE:
+            return index
+
+        start = time.time()
+        index = _build_term_index(offered_term, version)
+        _indexes[offered_term] = index
+        logger.info(
+            f"Built section index for {offered_term}: {len(index['courses'])} courses in {time.time() - start:.2f}s"
+        )
+        return index
+
+
+def get_course_sections(offered_term, course_type, course_code, section_number=None):
+    """
+    Return the indexed sections of one course, optionally pinned to a section.
+    """
+    sections = get_term_index(offered_term)["courses"].get((course_type, course_code), [])
+    if section_number:
+        sections = [s for s in sections if s["section_number"] == section_number]
+    return sections
+
+
+def section_masks(sections):
+    """
+    One occupancy mask per indexed section, in order. The precompiled weekly
+    masks are exact unless a meeting has a date range; only then are
+    date-aware masks built (conflicts.build_masks).
+    """
+    if any(section["dated"] for section in sections):
+        return build_masks([section["meetings"] for section in sections])
+    return [section["mask"] for section in sections]
@@ -1,3 +1,664 @@
-from django.test import TestCase
+# scheduler/tests.py
+"""
+ScheduleSolver checked against brute force over every section combination,
+on weekly meetings and on meetings with date ranges (half-term sections).
+"""
+import datetime
+import itertools
+import json
+import random
+import time
+from datetime import date
+from unittest import mock
 
-# Create your tests here.
+from django.core.cache import cache
+from django.db import transaction
+from django.test import SimpleTestCase, TestCase, TransactionTestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from .conflicts import Meeting, build_masks, sections_conflict
+from .invalidation import apply_pending_changes, batched_invalidation
+from .models import ConflictFreeSchedules, Course, CourseEvent, Event
+from .parallel import _search_subtrees, parallel_search
+from .ranking import DEFAULT_WEIGHTS, SchedulePreferences
+from .schedule_cache import (
+    SCHEDULE_CACHE_TTL,
+    cache_key,
+    canonical_selection,
+    get_cached_schedules,
+    purge_expired_schedules,
+    store_schedules,
+)
+from .solver import (
+    SOLVER_BACKTRACK,
+    SOLVER_MODES,
+    ScheduleSolver,
+    SearchDeadlineExceeded,
+    decode_cursor,
+    encode_cursor,
+    request_fingerprint,
+)
+from .term_index import get_course_sections, read_api_version, section_masks, term_data_version
+from .timetable import interval_mask
+
+HALF_TERMS = (
+    (date(2025, 9, 2), date(2025, 10, 17)),
+    (date(2025, 10, 20), date(2025, 12, 5)),
+)
+INSTRUCTORS = ("A. Smith", "B. Jones", "C. Lee")
+SEEDS = range(40)
+
+
+def random_courses(rng, dated, courses=4, sections=4):
+    """
+    course_data shaped like the term index's: per course, a list of sections
+    with meetings, weekly mask and instructor
+    """
+    course_data = []
+    for _ in range(courses):
+        course_sections = []
+        for _ in range(rng.randint(1, sections)):
+            meetings = []
+            for _ in range(rng.randint(1, 3)):
+                day = rng.randrange(5)
+                start = rng.randrange(8 * 60, 20 * 60, 30)
+                first_date, last_date = rng.choice(HALF_TERMS) if dated and rng.random() < 0.6 else (None, None)
+                meetings.append(Meeting(day, start, start + rng.choice((50, 80, 110)), first_date, last_date, "LEC"))
+            mask = 0
+            for m in meetings:
+                mask |= interval_mask(m.day, m.start, m.end)
+            course_sections.append({"meetings": meetings, "mask": mask, "instructor": rng.choice(INSTRUCTORS)})
+        course_data.append(course_sections)
+    return course_data
+
+
+def make_solver(course_data, mode="forward_checking"):
+    """ScheduleSolver over date-aware masks, as conflict_free_schedule builds it"""
+    masks = iter(build_masks([s["meetings"] for sections in course_data for s in sections]))
+    return ScheduleSolver([[next(masks) for _ in sections] for sections in course_data], mode=mode)
+
+
+def brute_force(course_data):
+    """Every conflict-free combination, as tuples of section indexes"""
+    return [
+        choice
+        for choice in itertools.product(*(range(len(sections)) for sections in course_data))
+        if not any(
+            sections_conflict(course_data[a][choice[a]]["meetings"], course_data[b][choice[b]]["meetings"])
+            for a, b in itertools.combinations(range(len(course_data)), 2)
+        )
+    ]
+
+
+def brute_force_ranked(course_data, preferences, top_k):
+    """The top_k (cost, combination) of brute_force() scored on weekly masks"""
+    ranked = []
+    for choice in brute_force(course_data):
+        weekly = 0
+        for sections, index in zip(course_data, choice):
+            weekly |= sections[index]["mask"]
+        additive = sum(preferences.section_costs[c][i] for c, i in enumerate(choice))
+        ranked.append((preferences.score(weekly, additive), choice))
+    return sorted(ranked)[:top_k]
+
+
+def random_cases(dated):
+    """(seed, course_data) for every seed, with some infeasible mixes among them"""
+    for seed in SEEDS:
+        yield seed, random_courses(random.Random(seed), dated, courses=5)
+
+
+class SearchTests(SimpleTestCase):
+    def assert_solutions_match(self, dated):
+        for seed, course_data in random_cases(dated):
+            expected = brute_force(course_data)
+            for mode in SOLVER_MODES:
+                with self.subTest(seed=seed, mode=mode):
+                    found = list(make_solver(course_data, mode).search())
+                    # Backtracking enumerates in request order, like itertools.product
+                    if mode == SOLVER_BACKTRACK:
+                        self.assertEqual(found, expected)
+                    else:
+                        self.assertEqual(sorted(found), expected)
+                        self.assertEqual(len(set(found)), len(found))
+
+    def test_solutions_match_brute_force(self):
+        self.assert_solutions_match(dated=False)
+
+    def test_solutions_match_brute_force_with_date_ranges(self):
+        self.assert_solutions_match(dated=True)
+
+
+class CursorTests(SimpleTestCase):
+    def assert_cursor_pages_match_offset_pages(self, dated, limit=3):
+        for seed, course_data in random_cases(dated):
+            for mode in SOLVER_MODES:
+                with self.subTest(seed=seed, mode=mode):
+                    fingerprint = request_fingerprint("Fall 2025", seed, mode)
+                    everything = list(make_solver(course_data, mode).search())
+                    offset_pages = [
+                        list(itertools.islice(make_solver(course_data, mode).search(), offset, offset + limit))
+                        for offset in range(0, len(everything), limit)
+                    ]
+                    cursor_pages = []
+                    cursor = None
+                    while True:
+                        resume_after = decode_cursor(cursor, fingerprint, len(course_data)) if cursor else None
+                        page = list(itertools.islice(make_solver(course_data, mode).search(resume_after=resume_after), limit))
+                        if not page:
+                            break
+                        cursor_pages.append(page)
+                        cursor = encode_cursor(fingerprint, page[-1])
+                    self.assertEqual(cursor_pages, offset_pages)
+
+    def test_cursor_pages_match_offset_pages(self):
+        self.assert_cursor_pages_match_offset_pages(dated=False)
+
+    def test_cursor_pages_match_offset_pages_with_date_ranges(self):
+        self.assert_cursor_pages_match_offset_pages(dated=True)
+
+    def test_cursor_of_another_request_is_rejected(self):
+        cursor = encode_cursor(request_fingerprint("Fall 2025", [["CIS", "3750", ""]], "backtrack"), (0, 1))
+        for fingerprint, course_count in (
+            (request_fingerprint("Winter 2026", [["CIS", "3750", ""]], "backtrack"), 2),
+            (request_fingerprint("Fall 2025", [["CIS", "3750", ""]], "backtrack"), 3),
+        ):
+            with self.subTest(fingerprint=fingerprint, course_count=course_count), self.assertRaises(ValueError):
+                decode_cursor(cursor, fingerprint, course_count)
+        with self.assertRaises(ValueError):
+            decode_cursor("not a cursor", "0" * 16, 2)
+
+
+class RankedSearchTests(SimpleTestCase):
+    def assert_top_k_matches(self, dated):
+        for seed in SEEDS:
+            rng = random.Random(seed)
+            course_data = random_courses(rng, dated)
+            preferences = SchedulePreferences(
+                preferred_instructors=["smith"],
+                earliest_start=10 * 60,
+                latest_end=17 * 60,
+            ).prepare(course_data)
+            for top_k in (1, 3, 10):
+                with self.subTest(seed=seed, top_k=top_k):
+                    results, complete = make_solver(course_data).search_ranked(preferences, top_k)
+                    self.assertTrue(complete)
+                    self.assertEqual(results, brute_force_ranked(course_data, preferences, top_k))
+
+    def test_top_k_matches_brute_force(self):
+        self.assert_top_k_matches(dated=False)
+
+    def test_top_k_matches_brute_force_with_date_ranges(self):
+        self.assert_top_k_matches(dated=True)
+
+    def test_top_k_matches_brute_force_with_random_weights(self):
+        for seed in SEEDS:
+            rng = random.Random(seed)
+            course_data = random_courses(rng, dated=seed % 2 == 1)
+            weights = {name: rng.choice((0, 0.25, 1, 7.5, 300)) for name in DEFAULT_WEIGHTS}
+            preferences = SchedulePreferences(
+                weights=weights,
+                preferred_instructors=["smith"],
+                earliest_start=10 * 60,
+                latest_end=17 * 60,
+            ).prepare(course_data)
+            with self.subTest(seed=seed, weights=weights):
+                results, complete = make_solver(course_data).search_ranked(preferences, 5)
+                self.assertTrue(complete)
+                self.assertEqual(results, brute_force_ranked(course_data, preferences, 5))
+
+
+class SchedulePreferencesTests(SimpleTestCase):
+    def test_single_preferred_instructor_string(self):
+        preferences = SchedulePreferences.from_request({"preferred_instructors": "Smith"})
+        self.assertEqual(preferences.preferred_instructors, ["smith"])
+
+    def test_preferred_instructors_must_be_names(self):
+        for instructors in (5, {"name": "Smith"}, ["Smith", 3]):
+            with self.subTest(instructors=instructors), self.assertRaises(ValueError):
+                SchedulePreferences.from_request({"preferred_instructors": instructors})
+
+    def test_weights_must_be_finite_and_non_negative(self):
+        for value in (-1, -0.5, "nan", float("inf"), "-inf"):
+            with self.subTest(value=value), self.assertRaises(ValueError):
+                SchedulePreferences.from_request({"weights": {"gap_minutes": value}})
+        preferences = SchedulePreferences.from_request({"weights": {"gap_minutes": 0, "instructor": "2.5"}})
+        self.assertEqual(preferences.weights["gap_minutes"], 0)
+        self.assertEqual(preferences.weights["instructor"], 2.5)
+
+
+def infeasible_masks(courses=11, sections=10):
+    """
+    Masks where only the last course clashes with everything: backtracking
+    walks sections ** courses partial schedules without finding one
+    """
+    masks = [
+        [interval_mask(0, course * sections + index, course * sections + index + 1) for index in range(sections)]
+        for course in range(courses)
+    ]
+    masks.append([interval_mask(0, 0, 1440) | interval_mask(day, 0, 1440) for day in range(1, 4)])
+    return masks
+
+
+class ParallelSearchTests(SimpleTestCase):
+    def test_subtrees_reproduce_search(self):
+        # parallel_search merges subtree results in this order
+        for seed, course_data in random_cases(dated=True):
+            for mode in SOLVER_MODES:
+                solver = make_solver(course_data, mode)
+                for depth in (1, 2):
+                    with self.subTest(seed=seed, mode=mode, depth=depth):
+                        merged = [
+                            choice
+                            for prefix in solver.subtree_prefixes(depth)
+                            for choice in make_solver(course_data, mode).search(prefix=prefix)
+                        ]
+                        self.assertEqual(merged, list(solver.search()))
+
+    def test_parallel_search_matches_sequential_order(self):
+        course_data = random_courses(random.Random(7), dated=True, courses=6, sections=6)
+        for mode in SOLVER_MODES:
+            with self.subTest(mode=mode):
+                everything = list(make_solver(course_data, mode).search())
+                self.assertGreater(len(everything), 20)
+                found, complete = parallel_search(make_solver(course_data, mode), 20)
+                self.assertTrue(complete)
+                self.assertEqual(found, everything[:20])
+                found, complete = parallel_search(make_solver(course_data, mode), 20, resume_after=everything[9])
+                self.assertEqual(found, everything[10:30])
+
+    def test_deadline_stops_a_search_without_solutions(self):
+        solver = ScheduleSolver(infeasible_masks(), SOLVER_BACKTRACK)
+        with self.assertRaises(SearchDeadlineExceeded):
+            next(solver.search(deadline=time.time() - 1))
+
+        started = time.time()
+        found, complete = _search_subtrees(
+            infeasible_masks(), SOLVER_BACKTRACK, [(None,) * 12], None, 10, time.time() + 0.2,
+        )
+        self.assertEqual((found, complete), ([], False))
+        self.assertLess(time.time() - started, 2)
+
+
+class CountTests(SimpleTestCase):
+    def assert_count_matches(self, dated):
+        for seed, course_data in random_cases(dated):
+            expected = len(brute_force(course_data))
+            for mode in SOLVER_MODES:
+                with self.subTest(seed=seed, mode=mode):
+                    solver = make_solver(course_data, mode)
+                    self.assertEqual(solver.count(), expected)
+                    self.assertEqual(solver.count(max_work=10 ** 9), expected)
+                    # Over budget the count is abandoned, never approximated
+                    self.assertIn(solver.count(max_work=50), (None, expected))
+
+    def test_count_matches_brute_force(self):
+        self.assert_count_matches(dated=False)
+
+    def test_count_matches_brute_force_with_date_ranges(self):
+        self.assert_count_matches(dated=True)
+
+    def test_count_stops_at_max_work(self):
+        solver = ScheduleSolver([[1 << i for i in range(20)] for _ in range(8)], SOLVER_BACKTRACK)
+        self.assertIsNone(solver.count(max_work=1000))
+
+    def test_total_is_counted_once_per_selection_and_version(self):
+        from .views import _count_schedules
+
+        cache.clear()
+        solver = mock.Mock()
+        solver.count.return_value = 12
+        selection = [["CIS", "3750", ""], ["ENGG", "3380", ""]]
+        for _ in range(3):
+            self.assertEqual(_count_schedules(solver, "Fall 2025", "v1", selection), 12)
+        self.assertEqual(solver.count.call_count, 1)
+        _count_schedules(solver, "Fall 2025", "v2", selection)
+        _count_schedules(solver, "Fall 2025", "v2", selection[:1])
+        self.assertEqual(solver.count.call_count, 3)
+
+
+def create_section(offered_term, course_type, course_code, section_number, *meetings):
+    """A Course with one Event per (times, days) meeting"""
+    course = Course.objects.create(
+        offered_term=offered_term,
+        course_type=course_type,
+        course_code=course_code,
+        section_number=section_number,
+        section_name=f"{course_type}*{course_code}*{section_number}",
+        seats="10 / 40",
+        instructor="A. Smith",
+    )
+    for times, days in meetings:
+        Event.objects.create(course_id=course, event_type="LEC", times=times, days=days)
+    return course
+
+
+class SignalTestCase(TestCase):
+    """
+    Changes recorded by the model signals outlive the rolled-back test
+    transactions; drop them so every test starts from none
+    """
+    def setUp(self):
+        with mock.patch("scheduler.invalidation.invalidate_term"), \
+                mock.patch("scheduler.invalidation.invalidate_assessments"), \
+                mock.patch("scheduler.invalidation.invalidate_schedule_cache"):
+            apply_pending_changes()
+
+
+@mock.patch("scheduler.invalidation.invalidate_schedule_cache")
+@mock.patch("scheduler.invalidation.invalidate_term")
+class InvalidationTests(SignalTestCase):
+    def test_changes_are_applied_once_per_transaction(self, invalidate_term, invalidate_schedule_cache):
+        with self.captureOnCommitCallbacks(execute=True):
+            with transaction.atomic():
+                course = create_section("Fall 2025", "CIS", "3750", "01")
+                for day in ("Mon", "Tue", "Wed", "Thu", "Fri"):
+                    Event.objects.create(course_id=course, event_type="LEC", times="8:30 AM - 9:20 AM", days=day)
+                create_section("Fall 2025", "ENGG", "3380", "01", ("10:00 AM - 11:20 AM", "Tues, Thur"))
+        invalidate_term.assert_called_once_with("Fall 2025")
+        invalidate_schedule_cache.assert_called_once_with(
+            "Fall 2025", courses={("CIS", "3750"), ("ENGG", "3380")},
+        )
+
+    def test_deleted_section_invalidates_its_own_term(self, invalidate_term, invalidate_schedule_cache):
+        course = create_section("Fall 2025", "CIS", "3750", "01", *[("8:30 AM - 9:20 AM", "Mon")] * 20)
+        with self.captureOnCommitCallbacks(execute=True):
+            # Collect and delete only; the 20 cascaded events don't each
+            # look up their section
+            with self.assertNumQueries(6):
+                course.delete()
+        invalidate_term.assert_called_once_with("Fall 2025")
+        invalidate_schedule_cache.assert_called_once_with("Fall 2025", courses={("CIS", "3750")})
+
+    def test_batched_invalidation_groups_writes(self, invalidate_term, invalidate_schedule_cache):
+        with self.captureOnCommitCallbacks(execute=True):
+            with batched_invalidation():
+                for section_number in ("01", "02", "03"):
+                    with transaction.atomic():
+                        create_section("Winter 2026", "CIS", "3750", section_number, ("8:30 AM - 9:20 AM", "Mon"))
+                invalidate_term.assert_not_called()
+        invalidate_term.assert_called_once_with("Winter 2026")
+
+
+class AssessmentSignalTests(SignalTestCase):
+    def setUp(self):
+        super().setUp()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.course = create_section("Fall 2025", "CIS", "3750", "01", ("8:30 AM - 9:20 AM", "Mon"))
+
+    def add_assessments(self, count):
+        with self.captureOnCommitCallbacks(execute=True):
+            with transaction.atomic():
+                for number in range(count):
+                    CourseEvent.objects.create(course=self.course, event_type=f"Quiz {number}", weightage="5%")
+
+    def test_assessments_only_change_the_read_version(self):
+        sections_version = term_data_version("Fall 2025")
+        read_version = read_api_version("Fall 2025")
+        with mock.patch("scheduler.invalidation.invalidate_term") as invalidate_term:
+            self.add_assessments(10)
+        invalidate_term.assert_not_called()
+        self.assertEqual(term_data_version("Fall 2025"), sections_version)
+        self.assertNotEqual(read_api_version("Fall 2025"), read_version)
+
+    def test_assessment_writes_are_batched(self):
+        with self.captureOnCommitCallbacks():
+            with transaction.atomic():
+                # Just the inserts; nothing runs until the commit
+                with self.assertNumQueries(5):
+                    for number in range(5):
+                        CourseEvent.objects.create(course=self.course, event_type=f"Quiz {number}")
+
+    def test_has_events_follows_assessments(self):
+        self.course.refresh_from_db()
+        self.assertFalse(self.course.has_events)
+        self.add_assessments(3)
+        self.course.refresh_from_db()
+        self.assertTrue(self.course.has_events)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            CourseEvent.objects.filter(course=self.course).first().delete()
+        self.course.refresh_from_db()
+        self.assertTrue(self.course.has_events)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            with transaction.atomic():
+                for assessment in CourseEvent.objects.filter(course=self.course):
+                    assessment.delete()
+        self.course.refresh_from_db()
+        self.assertFalse(self.course.has_events)
+
+
+class ScheduleCacheTests(SignalTestCase):
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+
+    def store(self, *courses):
+        selection = canonical_selection(
+            {"course_type": course_type, "course_code": course_code} for course_type, course_code in courses
+        )
+        key = cache_key("Fall 2025", "1", selection, {})
+        store_schedules(key, "Fall 2025", selection, {"courses": selection})
+        return key
+
+    def test_key_ignores_course_order_and_empty_sections(self):
+        selection = canonical_selection([
+            {"course_type": "ENGG", "course_code": "3380", "course_section": None},
+            {"course_type": "CIS", "course_code": "3750"},
+        ])
+        self.assertEqual(selection, canonical_selection([
+            {"course_type": "CIS", "course_code": "3750", "course_section": ""},
+            {"course_type": "ENGG", "course_code": "3380"},
+        ]))
+        self.assertEqual(selection, [["CIS", "3750", ""], ["ENGG", "3380", ""]])
+        key = cache_key("Fall 2025", "1-2", selection, {"limit": 50, "offset": 0})
+        self.assertEqual(key, cache_key("Fall 2025", "1-2", selection, {"offset": 0, "limit": 50}))
+        self.assertNotEqual(key, cache_key("Fall 2025", "1-3", selection, {"limit": 50, "offset": 0}))
+        self.assertNotEqual(key, cache_key("Winter 2026", "1-2", selection, {"limit": 50, "offset": 0}))
+
+    def test_hit_is_a_single_read(self):
+        key = self.store(("CIS", "3750"))
+        with self.assertNumQueries(1):
+            self.assertEqual(get_cached_schedules(key), {"courses": [["CIS", "3750", ""]]})
+        self.assertIsNone(get_cached_schedules(cache_key("Fall 2025", "2", [["CIS", "3750", ""]], {})))
+
+    def test_expired_entry_is_not_served(self):
+        key = self.store(("CIS", "3750"))
+        ConflictFreeSchedules.objects.update(
+            updated_at=timezone.now() - datetime.timedelta(seconds=SCHEDULE_CACHE_TTL + 1),
+        )
+        self.assertIsNone(get_cached_schedules(key))
+
+    def test_section_changes_delete_only_affected_entries(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            course = create_section("Fall 2025", "CIS", "3750", "01", ("8:30 AM - 9:20 AM", "Mon"))
+        changed = self.store(("CIS", "3750"), ("ENGG", "3380"))
+        kept = self.store(("ACCT", "1220"), ("ENGG", "3380"))
+        with self.captureOnCommitCallbacks(execute=True):
+            create_section("Fall 2025", "CIS", "3750", "02", ("8:30 AM - 9:20 AM", "Tue"))
+        self.assertIsNone(get_cached_schedules(changed))
+        self.assertIsNotNone(get_cached_schedules(kept))
+
+        changed = self.store(("CIS", "3750"))
+        with self.captureOnCommitCallbacks(execute=True):
+            event = Event.objects.get(course_id=course)
+            event.days = "Wed"
+            event.save()
+        self.assertIsNone(get_cached_schedules(changed))
+        self.assertIsNotNone(get_cached_schedules(kept))
+
+    def test_purge_drops_expired_then_oldest_entries(self):
+        keys = [self.store(("CIS", str(3000 + number))) for number in range(5)]
+        now = timezone.now()
+        for age, key in enumerate(keys):
+            ConflictFreeSchedules.objects.filter(cache_key=key).update(
+                updated_at=now - datetime.timedelta(minutes=age),
+            )
+        ConflictFreeSchedules.objects.filter(cache_key=keys[-1]).update(
+            updated_at=now - datetime.timedelta(seconds=SCHEDULE_CACHE_TTL + 1),
+        )
+        with mock.patch("scheduler.schedule_cache.SCHEDULE_CACHE_MAX_ENTRIES", 2):
+            self.assertEqual(purge_expired_schedules(), 3)
+        self.assertCountEqual(
+            ConflictFreeSchedules.objects.values_list("cache_key", flat=True), keys[:2],
+        )
+
+    def test_view_serves_hits_without_the_term_index(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            create_section("Fall 2025", "CIS", "3750", "01", ("8:30 AM - 9:20 AM", "Mon"))
+            create_section("Fall 2025", "ENGG", "3380", "01", ("10:00 AM - 11:20 AM", "Tues, Thur"))
+        body = json.dumps({
+            "offered_term": "Fall 2025",
+            "courses": [
+                {"course_type": "ENGG", "course_code": "3380"},
+                {"course_type": "CIS", "course_code": "3750"},
+            ],
+        })
+        url = reverse("scheduler-api:conflict_free_schedule")
+        first = self.client.post(url, body, content_type="application/json").json()
+        self.assertNotIn("cached", first)
+        self.assertEqual(len(first["schedules"]), 1)
+        with mock.patch("scheduler.term_index.get_term_index") as get_term_index:
+            second = self.client.post(url, body, content_type="application/json").json()
+        get_term_index.assert_not_called()
+        self.assertTrue(second.pop("cached"))
+        self.assertEqual(second, first)
+
+    def test_view_validates_before_the_lookup(self):
+        url = reverse("scheduler-api:conflict_free_schedule")
+        with mock.patch("scheduler.views.get_cached_schedules") as get_cached:
+            for body in (
+                {"courses": [{"course_type": "CIS", "course_code": "3750"}]},
+                {"offered_term": "Fall 2025", "courses": [{"course_type": "CIS"}]},
+                {"offered_term": "Fall 2025", "courses": [], "limit": 0},
+                {"offered_term": "Fall 2025", "courses": [], "cursor": "not-a-cursor"},
+            ):
+                response = self.client.post(url, json.dumps(body), content_type="application/json")
+                self.assertEqual(response.status_code, 400, body)
+        get_cached.assert_not_called()
+
+
+class SectionMaskTests(SignalTestCase):
+    def test_weekly_sections_reuse_the_precompiled_masks(self):
+        cache.clear()
+        with self.captureOnCommitCallbacks(execute=True):
+            create_section("Fall 2025", "CIS", "3750", "01", ("8:30 AM - 9:20 AM", "Mon, Wed"))
+            create_section("Fall 2025", "CIS", "3750", "02", ("9:00 AM - 9:50 AM", "Wed"))
+            create_section("Fall 2025", "CIS", "3750", "03", ("10:00 AM - 10:50 AM", "Mon, Wed"))
+        sections = get_course_sections("Fall 2025", "CIS", "3750")
+        self.assertFalse(any(section["dated"] for section in sections))
+        exact = build_masks([section["meetings"] for section in sections])
+        with mock.patch("scheduler.term_index.build_masks") as rebuilt:
+            masks = section_masks(sections)
+        rebuilt.assert_not_called()
+        self.assertEqual(masks, [section["mask"] for section in sections])
+        for (a, exact_a), (b, exact_b) in itertools.combinations(zip(masks, exact), 2):
+            self.assertEqual(bool(a & b), bool(exact_a & exact_b))
+
+
+class CourseCatalogTests(SignalTestCase):
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        with self.captureOnCommitCallbacks(execute=True):
+            create_section("Fall 2025", "CIS", "3750", "01", ("8:30 AM - 9:20 AM", "Mon"))
+        self.url = reverse("scheduler-api:course_catalog") + "?has_events=false"
+        self.etag = self.client.get(self.url)["ETag"]
+
+    def test_if_none_match_revalidates(self):
+        for header in (
+            self.etag,
+            f"W/{self.etag}",
+            f'"stale", {self.etag}',
+            f'W/"stale",W/{self.etag}',
+            "*",
+        ):
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=header)
+            self.assertEqual(response.status_code, 304, header)
+            self.assertEqual(response["ETag"], self.etag)
+
+    def test_other_tags_get_the_document(self):
+        for header in ('"stale"', 'W/"stale"', self.etag.strip('"'), ""):
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=header)
+            self.assertEqual(response.status_code, 200, header)
+            self.assertIn("Fall 2025", json.loads(response.content)["terms"])
+
+
+class AsyncReadViewTests(SignalTestCase):
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        with self.captureOnCommitCallbacks(execute=True):
+            for course_type, course_code, section_number in (
+                ("CIS", "3750", "01"), ("CIS", "3750", "02"), ("CIS", "2500", "01"), ("ENGG", "3380", "01"),
+            ):
+                course = create_section("Fall 2025", course_type, course_code, section_number)
+                CourseEvent.objects.create(course=course, event_type="Midterm", weightage="25%")
+
+    async def test_get_and_post_match_the_sync_views(self):
+        for name, params in (
+            ("offered_terms", {}),
+            ("course_types", {"offered_term": "Fall 2025"}),
+            ("course_codes", {"offered_term": "Fall 2025", "course_type": "CIS"}),
+            ("section_numbers", {"offered_term": "Fall 2025", "course_type": "CIS", "course_code": "3750"}),
+        ):
+            url = reverse(f"scheduler-api:async_{name}")
+            sync_url = reverse(f"scheduler-api:get_{name}")
+            expected = (await self.async_client.get(sync_url, params)).json()
+            self.assertTrue(expected, name)
+            get = await self.async_client.get(url, params)
+            post = await self.async_client.post(url, json.dumps(params), content_type="application/json")
+            self.assertEqual(get.json(), expected, name)
+            self.assertEqual(post.json(), expected, name)
+            self.assertIn("max-age", get["Cache-Control"])
+
+            revalidated = await self.async_client.get(url, params, headers={"If-None-Match": get["ETag"]})
+            self.assertEqual(revalidated.status_code, 304, name)
+
+    async def test_course_events_schedule_get_form(self):
+        url = reverse("scheduler-api:async_course_events_schedule")
+        get = await self.async_client.get(url, {"offered_term": "Fall 2025", "sections": "CIS*3750*01,ENGG*3380*01"})
+        post = await self.async_client.post(url, json.dumps({"sections": [
+            {"offered_term": "Fall 2025", "course_type": "CIS", "course_code": "3750", "section_number": "01"},
+            {"offered_term": "Fall 2025", "course_type": "ENGG", "course_code": "3380", "section_number": "01"},
+        ]}), content_type="application/json")
+        self.assertEqual(get.json(), post.json())
+        self.assertEqual([event["event_type"] for event in get.json()["CIS*3750*01"]], ["Midterm"])
+
+    async def test_other_methods_are_rejected(self):
+        response = await self.async_client.put(reverse("scheduler-api:async_course_types"))
+        self.assertEqual(response.status_code, 405)
+
+
+class AsyncScheduleTests(TransactionTestCase):
+    """
+    The async conflict_free_schedule runs outside the request thread
+    (thread_sensitive=False), on its own connection, so the data it reads
+    must be committed
+    """
+    def setUp(self):
+        cache.clear()
+        create_section("Fall 2025", "CIS", "3750", "01", ("8:30 AM - 9:20 AM", "Mon"))
+        create_section("Fall 2025", "CIS", "3750", "02", ("10:30 AM - 11:20 AM", "Mon"))
+        create_section("Fall 2025", "ENGG", "3380", "01", ("8:30 AM - 9:20 AM", "Mon"))
+
+    async def test_matches_the_sync_view(self):
+        body = json.dumps({
+            "offered_term": "Fall 2025",
+            "courses": [
+                {"course_type": "CIS", "course_code": "3750"},
+                {"course_type": "ENGG", "course_code": "3380"},
+            ],
+        })
+        response = await self.async_client.post(
+            reverse("scheduler-api:async_conflict_free_schedule"), body, content_type="application/json",
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(list(response.json()["schedules"][0]), ["CIS*3750*02", "ENGG*3380*01"])
+        cached = (await self.async_client.post(
+            reverse("scheduler-api:conflict_free_schedule"), body, content_type="application/json",
+        )).json()
+        self.assertTrue(cached.pop("cached"))
+        self.assertEqual(cached, response.json())
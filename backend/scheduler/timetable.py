@@ -0,0 +1,136 @@
+# scheduler/timetable.py
+"""
+Compiled weekly timetable representation used by the schedule generator.
+
+Every section's meetings are folded into a single Python int where each bit
+is one minute of the week (Monday 00:00 is bit 0, Sunday 23:59 is bit
+10079). Two sections conflict exactly when their masks share a bit, so a
+conflict check is one AND instead of a nested loop over (day, start, end)
+tuples, and the occupancy of a partial schedule is just the OR of its
+sections' masks.
+"""
+from datetime import datetime
+
+MINUTES_PER_DAY = 24 * 60
+MINUTES_PER_WEEK = 7 * MINUTES_PER_DAY
+
+DAY_INDEX = {
+    "monday": 0, "mon": 0, "m": 0,
+    "tuesday": 1, "tue": 1, "tues": 1, "t": 1,
+    "wednesday": 2, "wed": 2, "w": 2,
+    "thursday": 3, "thu": 3, "thur": 3, "thurs": 3, "th": 3,
+    "friday": 4, "fri": 4, "f": 4,
+    "saturday": 5, "sat": 5, "sa": 5,
+    "sunday": 6, "sun": 6, "su": 6,
+}
+
+
+def parse_days(days):
+    """
+    Convert an Event.days string ("Monday, Wednesday") into day indexes.
+
+    Unknown tokens such as "TBD" are ignored.
+    """
+    if not days:
+        return []
+    result = []
+    for day in days.split(','):
+        index = DAY_INDEX.get(day.strip().lower())
+        if index is not None and index not in result:
+            result.append(index)
+    return result
+
+
+def parse_clock(value):
+    """Convert "10:00 AM" (or "10:00AM") into minutes after midnight, or None if unparseable"""
+    for clock_format in ("%I:%M %p", "%I:%M%p"):
+        try:
+            parsed = datetime.strptime(value.strip(), clock_format)
+        except (ValueError, AttributeError):
+            continue
+        return parsed.hour * 60 + parsed.minute
+    return None
+
+
+def parse_time_range(times):
+    """
+    Convert an Event.times string ("10:00 AM - 11:20 AM") into a
+    (start_minute, end_minute) tuple, or None for TBD/unparseable values.
+    """
+    if not times or '-' not in times:
+        return None
+    parts = times.split('-')
+    if len(parts) != 2:
+        return None
+    start = parse_clock(parts[0])
+    end = parse_clock(parts[1])
+    if start is None or end is None or end <= start:
+        return None
+    return start, end
+
+
+def day_mask(days):
+    """7-bit mask of an Event.days string, bit d set for day index d (Monday is bit 0)"""
+    bits = 0
+    for day in parse_days(days):
+        bits |= 1 << day
+    return bits
+
+
+def days_from_mask(bits):
+    """Day indexes set in a day_mask() value"""
+    return [day for day in range(7) if bits >> day & 1]
+
+
+def event_slot(e):
+    """
+    (start_minute, end_minute, day indexes) of an event, or None for TBD.
+
+    Uses the precompiled Event columns (start_minute, end_minute, day_mask)
+    when they are filled and only falls back to parsing the strings for rows
+    that haven't been backfilled yet.
+    """
+    if e.get("start_minute") is not None and e.get("end_minute") is not None:
+        return e["start_minute"], e["end_minute"], days_from_mask(e.get("day_mask") or 0)
+    time_range = parse_time_range(e.get("times"))
+    if time_range is None:
+        return None
+    return time_range[0], time_range[1], parse_days(e.get("days"))
+
+
+def interval_mask(day, start, end):
+    """Bit mask covering [start, end) minutes on the given day index"""
+    return ((1 << (end - start)) - 1) << (day * MINUTES_PER_DAY + start)
+
+
+def compile_meetings(events):
+    """
+    Compile a section's Event rows into (time_slots, mask).
+
+    Args:
+        events: iterable of dicts with "times", "days" and "event_type", plus
+            optionally the precompiled columns (see event_slot())
+
+    Returns:
+        time_slots: list of (day_index, start_minute, end_minute, event_type)
+        mask: int occupancy bitset for the whole section
+
+    Meetings without a usable time or day (TBD) are left out of the mask,
+    matching the old pairwise check which skipped slots with a None time.
+    """
+    time_slots = []
+    mask = 0
+    for e in events:
+        slot = event_slot(e)
+        if slot is None:
+            continue
+        start, end, days = slot
+        for day in days:
+            time_slots.append((day, start, end, e.get("event_type")))
+            mask |= interval_mask(day, start, end)
+    return time_slots, mask
+
+
+def masks_conflict(mask1, mask2):
+    """True if two occupancy masks share at least one minute"""
+    return (mask1 & mask2) != 0
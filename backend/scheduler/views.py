@@ -1,23 +1,125 @@
 # scheduler/views.py
+import hashlib
 import json
 from datetime import datetime
-from django.http import HttpResponse, JsonResponse, HttpResponseBadRequest
-from django.views.decorators.http import require_POST
+from django.core.cache import cache
+from django.db.models import Q
+from django.http import HttpResponse, JsonResponse, HttpResponseBadRequest, StreamingHttpResponse
+from django.utils.http import parse_etags
+from django.views.decorators.http import require_GET, require_POST, require_http_methods
 from django.views.decorators.csrf import csrf_exempt
 import time
 import logging
 from datetime import datetime, timedelta
-from .models import Course, CourseEvent, Event, Suggestion
+from .models import Course, CourseEvent, Suggestion
+from .term_index import get_course_sections, section_masks, term_data_version
+from .catalog import get_catalog
+from .http_cache import conditional_read, request_data
+from .schedule_cache import canonical_selection, cache_key, get_cached_schedules, store_schedules
+from .frontier import ScheduleFrontier, FrontierTooLarge
+from .solver import (
+    ScheduleSolver, SOLVER_BACKTRACK, SOLVER_FORWARD_CHECKING, SOLVER_MODES,
+    request_fingerprint, encode_cursor, decode_cursor,
+)
+from .ranking import SchedulePreferences
+from .parallel import parallel_search, PARALLEL_TIME_BUDGET
+from metrics.prometheus import (
+    schedule_phase_duration, schedule_search_nodes, schedule_search_pruned, schedule_search_branching,
+)
 # from gpacalc.models import AssignmentCalendarProgress
 from icalendar import Calendar
 from icalendar import Event as calendarEvent
 import pytz
 
+# Combination spaces above this size are searched only partially
+SEARCH_LIMIT_THRESHOLD = 100000
+# Maximum number of complete combinations checked per request. Conflict checks
+# are a single bitmask AND, so this is ten times the old 5,000 cap.
+MAX_COMBINATIONS_TO_CHECK = 50000
+# Search steps allowed for ranked (preference-scored) schedule generation
+RANKED_MAX_NODES = 200000
+# (state, section) pairs ScheduleSolver.count may examine (at most ~20 ms);
+# above this "total" is reported as "unknown"
+COUNT_MAX_WORK = 50000
+# Seconds a selection's total is reused across pages
+COUNT_CACHE_TTL = 30 * 60
+
+# Schedule payload formats for conflict_free_schedule
+FORMAT_FULL = "full"
+FORMAT_COMPACT = "compact"
+FORMAT_CHOICES = (FORMAT_FULL, FORMAT_COMPACT)
+
+# Streaming response formats for conflict_free_schedule
+STREAM_NDJSON = "ndjson"
+STREAM_SSE = "sse"
+STREAM_CONTENT_TYPES = {
+    STREAM_NDJSON: "application/x-ndjson",
+    STREAM_SSE: "text/event-stream",
+}
+
 # -----------------------------------------
 # API: Get Course Events for selected sections
 # -----------------------------------------
-@require_POST
+def section_events_query(courses):
+    """
+    Single CourseEvent query covering every requested section.
+
+    Returns:
+        (result, section_keys, queryset): result maps each "TYPE*CODE*SEC" key
+        to an empty list, section_keys maps the (type, code, section, term)
+        tuple of each row to its key, and queryset is None when no sections
+        were requested. Feed the rows to add_section_event().
+    """
+    result = {}
+    section_keys = {}
+    sections_filter = Q()
+    for c in courses:
+        key = f"{c['course_type']}*{c['course_code']}*{c['section_number']}"
+        result[key] = []
+        section_keys[(c["course_type"], c["course_code"], c["section_number"], c["offered_term"])] = key
+        sections_filter |= Q(
+            course__course_type=c["course_type"],
+            course__course_code=c["course_code"],
+            course__section_number=c["section_number"],
+            course__offered_term=c["offered_term"]
+        )
+    if not section_keys:
+        return result, section_keys, None
+    evs = CourseEvent.objects.filter(sections_filter).values(
+        "id", "event_type", "weightage", "event_date", "location", "description", "time",
+        "course__course_type", "course__course_code", "course__section_number", "course__offered_term"
+    ).order_by("id")
+    return result, section_keys, evs
+
+
+def add_section_event(result, section_keys, ev):
+    """Append one row of section_events_query() to its section's list"""
+    key = section_keys[(
+        ev.pop("course__course_type"),
+        ev.pop("course__course_code"),
+        ev.pop("course__section_number"),
+        ev.pop("course__offered_term"),
+    )]
+    result[key].append(ev)
+
+
+def requested_sections(data):
+    """
+    Sections of a course_events_schedule request: the JSON list of a POST, or
+    the comma-separated "TYPE*CODE*SECTION" keys of one term from a GET
+    """
+    courses = data.get("sections") or data.get("courses", [])
+    if isinstance(courses, str):
+        courses = [
+            dict(zip(("course_type", "course_code", "section_number"), key.split("*")), offered_term=data.get("offered_term"))
+            for key in courses.split(",") if key.count("*") == 2
+        ]
+    return courses
+
+
+@require_http_methods(["GET", "POST"])
 @csrf_exempt
+@conditional_read
 def course_events_schedule(request):
     """
     API: Get all events for multiple course sections
@@ -38,6 +140,9 @@ def course_events_schedule(request):
             ]
         }
 
+        or GET ?offered_term=Fall 2025&sections=CIS*3750*01,ENGG*3380*02
+        (cacheable, with an ETag and 304 Not Modified for unchanged data)
+
     Response:
         {
             "CIS*3750*01": [
@@ -55,22 +160,17 @@ def course_events_schedule(request):
             ...
         }
     """
-    data = json.loads(request.body)
-    courses = data.get("sections") or data.get("courses", [])
+    courses = requested_sections(request_data(request))
     
     # Extract the offered_term from the first course (all should have the same term)
     offered_term = courses[0].get("offered_term", "") if courses else ""
     
-    result = {}
-    for c in courses:
-        key = f"{c['course_type']}*{c['course_code']}*{c['section_number']}"
-        evs = CourseEvent.objects.filter(
-            course__course_type=c["course_type"],
-            course__course_code=c["course_code"],
-            course__section_number=c["section_number"],
-            course__offered_term=c["offered_term"]
-        ).values("id", "event_type", "weightage", "event_date", "location", "description", "time")
-        result[key] = list(evs)
+    # Load every requested section's events in a single query and group them
+    # in Python, instead of one join query per section
+    result, section_keys, evs = section_events_query(courses)
+    if evs is not None:
+        for ev in evs:
+            add_section_event(result, section_keys, ev)
     
     # Save progress data
     progress_data = {
@@ -91,14 +191,171 @@ def course_events_schedule(request):
 # -----------------------------------------
 # API: Generate Conflict-Free Schedules
 # -----------------------------------------
+def _build_schedule(course_data, choice):
+    """Turn a solver combination into the {section_key: events} response shape"""
+    schedule = {}
+    for sections, section_index in zip(course_data, choice):
+        section_data = sections[section_index]
+        schedule[section_data['key']] = section_data['events']
+    return schedule
+
+
+def _compact_schedules(course_data, choices):
+    """
+    Reference-based payload: every section used by `choices` is listed once in
+    a table and each schedule is a list of indexes into that table.
+
+    Returns:
+        (sections, schedules)
+    """
+    sections = []
+    table_index = {}
+    schedules = []
+    for choice in choices:
+        row = []
+        for course, section_index in enumerate(choice):
+            position = table_index.get((course, section_index))
+            if position is None:
+                section_data = course_data[course][section_index]
+                position = table_index[(course, section_index)] = len(sections)
+                sections.append(_section_entry(section_data))
+            row.append(position)
+        schedules.append(row)
+    return sections, schedules
+
+
+def _section_entry(section_data):
+    """One row of the compact format's section table"""
+    return {
+        "key": section_data['key'],
+        "instructor": section_data['instructor'],
+        "events": section_data['events'],
+    }
+
+
+def _record_search_metrics(timings, stats, course_count):
+    """Export one request's phase timings and search counters to Prometheus"""
+    courses = str(course_count)
+    for phase, seconds in timings.items():
+        schedule_phase_duration.labels(phase=phase, courses=courses).observe(seconds)
+    if stats is not None:
+        schedule_search_nodes.labels(courses=courses).observe(sum(stats.nodes))
+        schedule_search_branching.labels(courses=courses).observe(stats.branching_factor())
+        for depth, pruned in enumerate(stats.pruned):
+            schedule_search_pruned.labels(depth=str(depth)).observe(pruned)
+
+
+def _count_schedules(solver, offered_term, data_version, selection):
+    """
+    solver.count() within COUNT_MAX_WORK, computed once per selection and
+    data version and reused by every page of it (None when over budget).
+    data_version must be read before the sections are loaded, so a concurrent
+    change can only make the key stale, never file old data under a new key.
+    """
+    key = "scheduler:count:" + hashlib.sha1(json.dumps(
+        [offered_term, data_version, selection], separators=(",", ":"),
+    ).encode()).hexdigest()
+    cached = cache.get(key)
+    if cached is not None:
+        return cached["total"]
+    total = solver.count(max_work=COUNT_MAX_WORK)
+    cache.set(key, {"total": total}, COUNT_CACHE_TTL)
+    return total
+
+
+def _solver_masks(course_data):
+    """section_masks() grouped per course, as ScheduleSolver expects"""
+    masks = iter(section_masks([section_data for sections in course_data for section_data in sections]))
+    return [[next(masks) for _ in sections] for sections in course_data]
+
+
+def _cursor_for(fingerprint, course_data, choice):
+    """Pagination cursor pointing just after `choice`"""
+    return encode_cursor(fingerprint, [sections[i]['course_id'] for sections, i in zip(course_data, choice)])
+
+
+def _stream_event(stream_format, event_type, payload):
+    """Encode one streamed message as an NDJSON line or a server-sent event"""
+    if stream_format == STREAM_SSE:
+        return f"event: {event_type}\ndata: {json.dumps(payload)}\n\n"
+    return json.dumps(dict(payload, type=event_type)) + "\n"
+
+
+def _stream_schedules(stream_format, course_data, solver, resume_after, offset, limit,
+                      max_combinations_to_check, fingerprint, header, payload_format=FORMAT_FULL):
+    """
+    Generator behind the streaming mode of conflict_free_schedule.
+
+    Emits a "meta" message, one "schedule" message per schedule as soon as the
+    solver yields it, and a final "end" message with the pagination state.
+    In the compact format the meta message carries the table of every
+    candidate section and schedules are lists of indexes into it.
+    """
+    logger = logging.getLogger(__name__)
+    start = time.time()
+    offsets = []
+    if payload_format == FORMAT_COMPACT:
+        # Schedules aren't known yet, so list every candidate section
+        table = []
+        for sections in course_data:
+            offsets.append(len(table))
+            table.extend(_section_entry(section_data) for section_data in sections)
+        header = dict(header, format=FORMAT_COMPACT, sections=table)
+    yield _stream_event(stream_format, "meta", header)
+
+    sent = 0
+    schedules_skipped = 0
+    combinations_checked = 0
+    has_more = False
+    last_choice = None
+    try:
+        for choice in solver.search(resume_after=resume_after):
+            if combinations_checked >= max_combinations_to_check:
+                break
+            if sent >= limit:
+                has_more = True
+                break
+            combinations_checked += 1
+            if schedules_skipped < offset:
+                schedules_skipped += 1
+                continue
+            if payload_format == FORMAT_COMPACT:
+                schedule = [offsets[course] + i for course, i in enumerate(choice)]
+            else:
+                schedule = _build_schedule(course_data, choice)
+            yield _stream_event(stream_format, "schedule", {"index": offset + sent, "schedule": schedule})
+            sent += 1
+            last_choice = choice
+    except Exception as e:
+        # Headers are already sent, so report the failure in-band
+        logger.critical(f"Error while streaming conflict_free_schedule: {str(e)}")
+        yield _stream_event(stream_format, "error", {"error": str(e)})
+        return
+
+    message = f"Showing {sent} conflict-free schedules"
+    if solver.is_infeasible():
+        message = "No conflict-free schedule exists for the selected courses"
+    yield _stream_event(stream_format, "end", {
+        "count": sent,
+        "has_more": has_more,
+        "next_cursor": _cursor_for(fingerprint, course_data, last_choice) if has_more and last_choice is not None else None,
+        "combinations_checked": combinations_checked,
+        "message": message,
+    })
+    logger.info(f"Streamed {sent} conflict-free schedules from {combinations_checked} combinations checked in {time.time() - start:.2f}s")
+
+
 @csrf_exempt
 def conflict_free_schedule(request):
     """
     API: Generate paginated conflict-free schedules for selected courses.
 
-    This endpoint uses a backtracking algorithm to find schedules without time conflicts.
+    This endpoint uses a backtracking search with forward checking (see solver.py)
+    to find schedules without time conflicts.
     Pagination is implemented to avoid overloading the browser with too many schedules.
-    Limited to checking first 5,000 possible combinations for performance.
+    Limited to checking first MAX_COMBINATIONS_TO_CHECK (50,000) possible combinations for performance,
+    except for pages of spaces over SEARCH_LIMIT_THRESHOLD that reach past that cap, which
+    are searched completely in parallel within PARALLEL_TIME_BUDGET (see parallel.py).
 
     Request:
         JSON: {
@@ -110,7 +367,20 @@ def conflict_free_schedule(request):
             ],
             "offered_term": "Fall 2025",
             "offset": 0,
-            "limit": 100
+            "limit": 100,
+            "cursor": "eyJmIjoi...",  # Optional, "next_cursor" from the previous page; replaces offset
+            "solver": "forward_checking",  # Optional, or "backtrack" for plain request-order search
+            "parallel": true,  # Optional, above 100,000 combinations pages past the cap search subtrees in a process pool
+            "stream": "ndjson",  # Optional, "ndjson" or "sse" to receive schedules as they are found
+            "format": "full",  # Optional, "compact" sends each section once plus index arrays
+            "debug": false,  # Optional, adds the "debug" block below (bypasses the result cache)
+            "preferences": {  # Optional, returns the best schedules first instead of enumeration order
+                "earliest_start": "9:00 AM",
+                "latest_end": "6:00 PM",
+                "preferred_instructors": ["Smith"],
+                "weights": {"early_start": 1, "late_end": 1, "gap_minutes": 0.5,
+                            "days_on_campus": 120, "instructor": 60}
+            }
         }
 
     Response:
@@ -128,21 +398,62 @@ def conflict_free_schedule(request):
                 },
                 ... more schedules ...
             ],
-            "total": "unknown",  
+            "total": 1234,  # Exact number of conflict-free schedules, or "unknown" if too costly to count
             "offset": 0,
             "limit": 100,
             "has_more": true/false,
+            "next_cursor": "eyJmIjoi..." or null,
             "message": "Showing N conflict-free schedules",
-            "search_limited": true/false 
+            "search_limited": true/false,
+            "cached": true,  # Only present when served from the ConflictFreeSchedules cache
+            "debug": {  # Only with "debug": true
+                "timings_ms": {"load": 1.2, "compile": 0.8, "count": 0.3, "search": 12.5, "serialize": 0.9},
+                "search": {"nodes_visited": 5120, "nodes_per_depth": [...], "pruned_per_depth": [...],
+                           "solutions": 101, "branching_factor": 1.9}  # null for parallel searches
+            },
+            "scores": [  # Only with "preferences", one entry per schedule
+                {"score": 512.5, "early_minutes": 0, "late_minutes": 50, "gap_minutes": 185,
+                 "days_on_campus": 3, "non_preferred_instructors": 1},
+                ...
+            ]
+        }
+
+    Compact response ("format": "compact"), same fields except:
+        {
+            "format": "compact",
+            "sections": [
+                {"key": "CIS*3750*01", "instructor": "...", "events": [{event details...}, ...]},
+                {"key": "ENGG*3380*02", "instructor": "...", "events": [...]},
+                ...
+            ],
+            "schedules": [[0, 1], [0, 2], ...],  # indexes into "sections"
+            ...
         }
 
+    Streaming response ("stream": "ndjson" / "sse"), one message per line / event:
+        {"type": "meta", "offered_term": ..., "offset": 0, "limit": 100, "search_limited": false, ...}
+        {"type": "schedule", "index": 0, "schedule": {"CIS*3750*01": [...], ...}}
+        ...
+        {"type": "end", "count": 100, "has_more": true, "next_cursor": "...", "message": "..."}
+    With "sse" the type is the event name and the rest is the event data.
+
     Frontend Implementation Notes:
-    - Use offset/limit for pagination - load more schedules as user scrolls
+    - Use limit plus "next_cursor" for pagination - load more schedules as user scrolls.
+      Every cursor page costs the same, while deep offsets re-walk all earlier schedules
     - Display schedules in calendar format with color-coding by course
     - For each schedule, display all sections with their events
     - Provide a "Next Schedule" / "Previous Schedule" navigation
-    - Consider adding filters (e.g., "no early mornings", "compact schedule")
+    - Send "preferences" for "no early mornings" / "compact schedule" style ranking;
+      ranked results page with offset/limit (no cursor)
     - Check "search_limited" field to inform users if search was capped
+    - "total" is exact when it is a number, use it for page counts
+    - Prefer "format": "compact" for large pages; rebuild a schedule with
+      schedule.map(i => sections[i]) before rendering
+    - With "stream", render each schedule as its message arrives (fetch + ReadableStream
+      for NDJSON, or EventSource-style parsing for SSE); streaming skips the result cache
+      and the process pool and can't be combined with "preferences"
+    - "debug" is meant for diagnosing slow course mixes; "serialize" excludes the final
+      JSON encoding, which is only included in the Prometheus histogram
     """
     logger = logging.getLogger(__name__)
     total_start = time.time()
@@ -151,236 +462,608 @@ def conflict_free_schedule(request):
         data = json.loads(request.body)
         selected_courses = data.get("courses", [])
         offered_term = data.get("offered_term", None)
-        offset = int(data.get("offset", 0))
-        limit = int(data.get("limit", 50))
+        if not offered_term:
+            return JsonResponse({"error": "offered_term is required"}, status=400)
+        if not isinstance(selected_courses, list) or not all(
+            isinstance(c, dict) and c.get("course_type") and c.get("course_code") for c in selected_courses
+        ):
+            return JsonResponse({"error": "courses must be a list of objects with course_type and course_code"}, status=400)
+        try:
+            offset = int(data.get("offset", 0))
+            limit = int(data.get("limit", 50))
+        except (TypeError, ValueError):
+            return JsonResponse({"error": "offset and limit must be integers"}, status=400)
+        if offset < 0 or limit < 1:
+            return JsonResponse({"error": "offset must be >= 0 and limit >= 1"}, status=400)
+        cursor = data.get("cursor")
+        solver_mode = data.get("solver", SOLVER_FORWARD_CHECKING)
+        if solver_mode not in SOLVER_MODES:
+            return JsonResponse({"error": f"solver must be one of {', '.join(SOLVER_MODES)}"}, status=400)
+        stream_format = data.get("stream")
+        if stream_format not in (None, STREAM_NDJSON, STREAM_SSE):
+            return JsonResponse({"error": f"stream must be '{STREAM_NDJSON}' or '{STREAM_SSE}'"}, status=400)
+        if stream_format and data.get("preferences") is not None:
+            return JsonResponse({"error": "Ranked schedules can't be streamed, drop 'stream' or 'preferences'"}, status=400)
+        payload_format = data.get("format", FORMAT_FULL)
+        if payload_format not in FORMAT_CHOICES:
+            return JsonResponse({"error": f"format must be one of {', '.join(FORMAT_CHOICES)}"}, status=400)
+        preferences = None
+        if data.get("preferences") is not None:
+            try:
+                preferences = SchedulePreferences.from_request(data["preferences"])
+            except (ValueError, TypeError, AttributeError) as e:
+                return JsonResponse({"error": f"Invalid preferences: {e}"}, status=400)
+
+        # Courses are searched in a canonical order so that the same selection
+        # always produces the same schedules, cursors and cache entries
+        selection = canonical_selection(selected_courses)
+        # A cursor encodes the course_ids of the last schedule of the previous
+        # page, so the search resumes right there instead of re-walking
+        # `offset` schedules. It is checked before the cache is consulted
+        fingerprint = request_fingerprint(offered_term, selection, solver_mode)
+        cursor_ids = None
+        if cursor and preferences is None:
+            try:
+                cursor_ids = decode_cursor(cursor, fingerprint, len(selection))
+            except ValueError as e:
+                return JsonResponse({"error": f"Invalid cursor: {e}"}, status=400)
+
+        # Keyed on the stored data version, read once for the whole request:
+        # a hit costs one indexed lookup and never builds the term index, and
+        # entries built from older data are never served
+        data_version = term_data_version(offered_term)
+        key = cache_key(offered_term, data_version, selection, {
+            "solver": solver_mode,
+            "preferences": data.get("preferences"),
+            "offset": offset,
+            "limit": limit,
+            "cursor": cursor,
+            "parallel": data.get("parallel", True),
+            "format": payload_format,
+        })
+        # Streamed responses are produced incrementally and never cached;
+        # debug responses describe this run, not the one that filled the cache
+        debug = bool(data.get("debug"))
+        cached = get_cached_schedules(key) if not (stream_format or debug) else None
+        if cached is not None:
+            logger.info(f"Served {len(cached.get('schedules', []))} conflict-free schedules from cache in {time.time() - total_start:.2f}s")
+            return JsonResponse(dict(cached, cached=True))
+
+        # Wall-clock seconds per phase, exported to Prometheus and the debug block
+        timings = {}
+        phase_start = time.perf_counter()
 
-        # Get all sections for each course with their events
+        # Get all sections for each course with their compiled meetings from
+        # the per-term index, so no database round-trips are needed here
         course_data = []
-        course_section_numbers = {}
         total_combinations = 1
         
-        for course in selected_courses:
+        for course_type, course_code, course_section in selection:
             # Here course_section is optional, if user wants to select a specific section for a specific course they can do that, if no section is provided, 
             # all sections for that course will be considered.
-            if not course.get("course_section"):
-                sections = Course.objects.filter(
-                    course_type=course["course_type"],
-                    course_code=course["course_code"],
-                    offered_term=offered_term
-                )
-            else:
-                sections = Course.objects.filter(
-                    course_type=course["course_type"],
-                    course_code=course["course_code"],
-                    section_number=course["course_section"],
-                    offered_term=offered_term
-                )
-            course_section_numbers[f"{course['course_type']}*{course['course_code']}"] = len(sections)
-            section_events = []
-            for section in sections:
-                events = list(Event.objects.filter(course_id=section.course_id).values(
-                    "event_type", "times", "location", "days"
-                ))
-                
-                if not events:
-                    continue
-                    
-                # Parse time slots for conflict checking
-                time_slots = []
-                for e in events:
-                    times = e["times"].split('-')
-                    days = []
-                    if e["days"]:
-                        for day in e["days"].split(','):
-                            if day.strip():
-                                days.append(day.strip())
-                    
-                    time_part = e["times"]
-                    if times:
-                        try:
-                            start, end = [t.strip() for t in time_part.split('-')]
-                            start_24 = datetime.strptime(start, "%I:%M %p").time()
-                            end_24 = datetime.strptime(end, "%I:%M %p").time()
-                        except:
-                            logger.error(f"Error parsing time '{time_part}' for event {e}")
-                            start_24 = end_24 = None
-                    else:
-                        start_24 = end_24 = None
-                        
-                    for d in days:
-                        time_slots.append((d, start_24, end_24, e["event_type"]))
-                        
-                section_events.append({
-                    'section': section,
-                    'events': events,
-                    'time_slots': time_slots,
-                    'key': f"{section.course_type}*{section.course_code}*{section.section_number}"
-                })
+            section_events = get_course_sections(offered_term, course_type, course_code, course_section)
                 
             course_data.append(section_events)
             total_combinations *= len(section_events) if section_events else 1
-            logger.info(f"Course {course['course_type']}{course['course_code']}: {len(section_events)} sections with events")
+            logger.info(f"Course {course_type}{course_code}: {len(section_events)} sections with events")
+        timings["load"] = time.perf_counter() - phase_start
+        phase_start = time.perf_counter()
+
+        # Huge combination spaces are split across a process pool, but only
+        # when the page (and the one schedule past it) reaches beyond the
+        # MAX_COMBINATIONS_TO_CHECK schedules the sequential search stops at;
+        # a cursor page starts at offset 0. Clients opt out with "parallel": false
+        page_end = (limit if cursor and preferences is None else offset + limit) + 1
+        use_parallel = (
+            total_combinations > SEARCH_LIMIT_THRESHOLD
+            and page_end > MAX_COMBINATIONS_TO_CHECK
+            and preferences is None
+            and not stream_format
+            and data.get("parallel", True)
+        )
 
-        # Check if total combinations exceed 100,000 and log warning
-        search_limited = total_combinations > 100000
-        max_combinations_to_check = min(total_combinations, 5000)
+        # Check if total combinations exceed the search threshold and log warning
+        search_limited = total_combinations > SEARCH_LIMIT_THRESHOLD and not use_parallel
+        max_combinations_to_check = min(total_combinations, MAX_COMBINATIONS_TO_CHECK)
         
         if search_limited:
-            logger.warning(f"Total combinations ({total_combinations}) exceed 100K. Limiting search to first 5,000 combinations.")
-
-        # Conflict checking helper function
-        def events_conflict(slots1, slots2):
-            """Check if two sets of time slots have any conflicts"""
-            for day1, start1, end1, _ in slots1:
-                for day2, start2, end2, _ in slots2:
-                    if day1 == day2:
-                        # Skip if any time is None
-                        if None in (start1, end1, start2, end2):
-                            continue
-                        if not (end1 <= start2 or start1 >= end2):
-                            return True
-            return False
-
-        # Modified backtracking to find schedules lazily with combination limit
-        found_schedules = []
+            logger.warning(f"Total combinations ({total_combinations}) exceed {SEARCH_LIMIT_THRESHOLD:,}. Limiting search to first {MAX_COMBINATIONS_TO_CHECK:,} combinations.")
+
+        # Find schedules lazily with combination limit. The solver yields one
+        # section index per course; by default it uses forward checking so
+        # sections that clash with the partial schedule are pruned early.
+        # Masks honour each meeting's date range, so half-term sections and
+        # one-off meetings only clash with what actually runs on those dates
+        solver = ScheduleSolver(_solver_masks(course_data), mode=solver_mode)
+        solver.initial_domains()
+        timings["compile"] = time.perf_counter() - phase_start
+        resume_after = None
+        if cursor_ids is not None:
+            try:
+                resume_after = tuple(
+                    [section_data['course_id'] for section_data in sections].index(course_id)
+                    for sections, course_id in zip(course_data, cursor_ids)
+                )
+            except ValueError as e:
+                return JsonResponse({"error": f"Invalid cursor: {e}"}, status=400)
+            offset = 0
+
+        if stream_format:
+            # Emit each schedule as soon as the solver finds it; nothing is
+            # accumulated, so memory stays flat however large `limit` is
+            response = StreamingHttpResponse(
+                _stream_schedules(
+                    stream_format,
+                    course_data,
+                    solver,
+                    resume_after,
+                    offset,
+                    limit,
+                    max_combinations_to_check,
+                    fingerprint,
+                    {
+                        "offered_term": offered_term,
+                        "offset": offset,
+                        "limit": limit,
+                        "search_limited": search_limited,
+                        "total_possible_combinations": total_combinations if not search_limited else f"{total_combinations:,}+",
+                    },
+                    payload_format,
+                ),
+                content_type=STREAM_CONTENT_TYPES[stream_format],
+            )
+            response["Cache-Control"] = "no-cache"
+            # Stop nginx from buffering the stream
+            response["X-Accel-Buffering"] = "no"
+            return response
+
+        # Exact total without enumerating the schedules (see ScheduleSolver.count)
+        phase_start = time.perf_counter()
+        total_schedules = _count_schedules(solver, offered_term, data_version, selection)
+        timings["count"] = time.perf_counter() - phase_start
+        phase_start = time.perf_counter()
+
+        page_choices = []
+        schedule_scores = None
+        last_choice = None
         schedules_skipped = 0
         combinations_checked = 0
+        has_more = False
 
-        def build_schedules(course_index, current_schedule, current_slots):
-            """
-            Recursive backtracking to build conflict-free schedules
-            Limited to checking first 10,000 combinations for performance.
-            
-            Args:
-                course_index: Index of current course in course_data
-                current_schedule: Current partial schedule being built
-                current_slots: List of time slots already in the schedule
-            """
-            nonlocal schedules_skipped, combinations_checked
-            
-            # Stop if we have enough schedules for this page
-            if len(found_schedules) >= limit:
-                return
-                
-            # Stop if we've checked maximum allowed combinations
-            if combinations_checked >= max_combinations_to_check:
-                return
-                
-            # Base case: all courses have been processed
-            if course_index >= len(course_data):
+        if preferences is not None:
+            # Ranked mode: branch and bound for the best offset + limit (+1 to
+            # know if there are more) schedules instead of enumeration order
+            preferences.prepare(course_data)
+            ranked, complete = solver.search_ranked(preferences, offset + limit + 1, max_nodes=RANKED_MAX_NODES)
+            search_limited = not complete
+            combinations_checked = len(ranked)
+            has_more = len(ranked) > offset + limit
+            page_choices = [choice for _, choice in ranked[offset:offset + limit]]
+            schedule_scores = [preferences.breakdown(course_data, choice) for choice in page_choices]
+        elif use_parallel:
+            # Complete answer within PARALLEL_TIME_BUDGET; results are merged in
+            # sequential order so offsets and cursors behave exactly the same
+            try:
+                choices, complete = parallel_search(solver, offset + limit + 1, resume_after=resume_after)
+            except ValueError as e:
+                return JsonResponse({"error": f"Invalid cursor: {e}"}, status=400)
+            search_limited = not complete
+            combinations_checked = len(choices)
+            has_more = len(choices) > offset + limit
+            page_choices = choices[offset:offset + limit]
+            last_choice = page_choices[-1] if page_choices else None
+        else:
+            for choice in solver.search(resume_after=resume_after):
+                # Stop if we've checked maximum allowed combinations, there might be
+                # more schedules but we report has_more = False since the search is capped
+                if combinations_checked >= max_combinations_to_check:
+                    break
+                # One schedule past the page is enough to know there are more
+                if len(page_choices) >= limit:
+                    has_more = True
+                    break
                 combinations_checked += 1
                 if schedules_skipped < offset:
                     schedules_skipped += 1
-                else:
-                    found_schedules.append(current_schedule.copy())
-                return
-                
-            # Try each section of the current course
-            for section_data in course_data[course_index]:
-                # Stop if we have enough schedules for this page
-                if len(found_schedules) >= limit:
-                    return
-                    
-                # Stop if we've checked maximum allowed combinations
-                if combinations_checked >= max_combinations_to_check:
-                    return
-                    
-                new_slots = section_data['time_slots']
-                conflict_found = False
-                
-                # Check for conflicts with existing slots
-                for existing_slots in current_slots:
-                    if events_conflict(existing_slots, new_slots):
-                        conflict_found = True
-                        break
-                        
-                if not conflict_found:
-                    new_schedule = current_schedule.copy()
-                    new_schedule[section_data['key']] = section_data['events']
-                    new_slot_list = current_slots + [new_slots]
-                    build_schedules(course_index + 1, new_schedule, new_slot_list)
-        
-        # Start the recursive schedule building
-        build_schedules(0, {}, [])
+                    continue
+                page_choices.append(choice)
+                last_choice = choice
+        timings["search"] = time.perf_counter() - phase_start
+        phase_start = time.perf_counter()
 
-        # Check if we potentially have more schedules by trying to find one more
-        has_more = False
-        if len(found_schedules) == limit and combinations_checked < max_combinations_to_check:
-            # Try to find one more schedule to see if there are more available
-            temp_found = []
-            temp_skipped = schedules_skipped
-            temp_combinations_checked = combinations_checked
-            
-            def check_more_schedules(course_index, current_schedule, current_slots):
-                """Helper function to check if more schedules exist beyond current limit"""
-                nonlocal temp_skipped, temp_combinations_checked
-                
-                if len(temp_found) >= 1:  # We only need to find one more
-                    return
-                    
-                # Stop if we've reached the combination limit
-                if temp_combinations_checked >= max_combinations_to_check:
-                    return
-                    
-                if course_index >= len(course_data):
-                    temp_combinations_checked += 1
-                    if temp_skipped < offset + limit:
-                        temp_skipped += 1
-                    else:
-                        temp_found.append(current_schedule.copy())
-                    return
-                    
-                for section_data in course_data[course_index]:
-                    if len(temp_found) >= 1:
-                        return
-                        
-                    if temp_combinations_checked >= max_combinations_to_check:
-                        return
-                        
-                    new_slots = section_data['time_slots']
-                    conflict_found = False
-                    for existing_slots in current_slots:
-                        if events_conflict(existing_slots, new_slots):
-                            conflict_found = True
-                            break
-                    if not conflict_found:
-                        new_schedule = current_schedule.copy()
-                        new_schedule[section_data['key']] = section_data['events']
-                        new_slot_list = current_slots + [new_slots]
-                        check_more_schedules(course_index + 1, new_schedule, new_slot_list)
-            
-            check_more_schedules(0, {}, [])
-            has_more = len(temp_found) > 0
-        elif combinations_checked >= max_combinations_to_check:
-            # If we hit the combination limit, there might be more schedules we haven't checked
-            has_more = False  # Set to False since we're capping the search
+        if payload_format == FORMAT_COMPACT:
+            compact_sections, found_schedules = _compact_schedules(course_data, page_choices)
+        else:
+            found_schedules = [_build_schedule(course_data, choice) for choice in page_choices]
         
         # Determine message based on search limitations
         message = f"Showing {len(found_schedules)} conflict-free schedules"
-        if search_limited:
+        if total_schedules is not None:
+            message += f" of {total_schedules:,}"
+        if solver.is_infeasible():
+            message = "No conflict-free schedule exists for the selected courses"
+        if preferences is not None:
+            message = f"Showing {len(found_schedules)} best-ranked conflict-free schedules"
+            if search_limited:
+                message += f" (ranking stopped after {RANKED_MAX_NODES:,} search steps)"
+        elif use_parallel:
+            if search_limited:
+                message += f" (search stopped after {PARALLEL_TIME_BUDGET:.0f}s)"
+        elif search_limited:
             message += f" (search limited to first {max_combinations_to_check:,} combinations)"
         
         response_data = {
             "schedules": found_schedules,
-            "total": "unknown",  # We don't calculate total anymore for performance
+            "total": total_schedules if total_schedules is not None else "unknown",
             "offset": offset,
             "limit": limit,
             "has_more": has_more,
+            "next_cursor": _cursor_for(fingerprint, course_data, last_choice) if has_more and last_choice is not None else None,
             "message": message,
             "search_limited": search_limited,
             "combinations_checked": combinations_checked,
             "total_possible_combinations": total_combinations if not search_limited else f"{total_combinations:,}+"
         }
-        
+        if payload_format == FORMAT_COMPACT:
+            response_data["format"] = FORMAT_COMPACT
+            response_data["sections"] = compact_sections
+        if schedule_scores is not None:
+            response_data["scores"] = schedule_scores
+        timings["serialize"] = time.perf_counter() - phase_start
+        # Worker processes keep their own counters, so parallel runs have none
+        search_stats = solver.stats if not use_parallel else None
+        if debug:
+            response_data["debug"] = {
+                "timings_ms": {phase: round(seconds * 1000, 3) for phase, seconds in timings.items()},
+                "search": search_stats.as_dict() if search_stats is not None else None,
+            }
+        elif not (use_parallel and search_limited) and not cursor:
+            # Time-limited parallel results depend on load, and cursor pages
+            # resume cheaply, so neither is worth an entry
+            store_schedules(key, offered_term, selection, response_data)
+
         logger.info(f"Found {len(found_schedules)} conflict-free schedules from {combinations_checked} combinations checked in {time.time() - total_start:.2f}s")
         if search_limited:
             logger.info(f"Search was limited due to high number of possible combinations ({total_combinations:,})")
-            
-        return JsonResponse(response_data)
+
+        response = JsonResponse(response_data)
+        timings["serialize"] = time.perf_counter() - phase_start
+        _record_search_metrics(timings, search_stats, len(course_data))
+        return response
         
     except Exception as e:
-        logger.critical(f"Error in conflict_free_schedule: {str(e)}")
-        print(f"Error in conflict_free_schedule: {str(e)}")
+        logger.exception(f"Error in conflict_free_schedule: {str(e)}")
+        return JsonResponse({"error": str(e)}, status=500)
+
+
+# -----------------------------------------
+# API: Incremental Conflict-Free Schedules
+# -----------------------------------------
+@require_POST
+@csrf_exempt
+def incremental_schedule(request):
+    """
+    API: Conflict-free schedules for a selection that is edited one course at a time.
+
+    The session keeps the compatible combinations of its current selection
+    (see frontier.py), so adding a course only extends them by that course and
+    removing the most recently added course is free. Send the whole current
+    selection every time; the difference to the previous request is worked
+    out on the server.
+
+    Request:
+        JSON: {
+            "courses": [
+                {"course_type": "ENGG", "course_code": "3380", "course_section": "02"},
+                {"course_type": "CIS", "course_code": "3750"}
+            ],
+            "offered_term": "Fall 2025",
+            "offset": 0,
+            "limit": 50,
+            "format": "full"  # Optional, or "compact" (see conflict_free_schedule)
+        }
+
+    Response:
+        {
+            "schedules": [...],  # same shapes as conflict_free_schedule
+            "total": 1234,  # exact
+            "offset": 0,
+            "limit": 50,
+            "has_more": true/false,
+            "message": "Showing N of T conflict-free schedules",
+            "incremental": true,  # false if the selection was too large to keep and was searched from scratch
+            "courses_reused": 4,  # courses whose combinations were reused
+            "courses_computed": 1  # courses added to the combinations by this request
+        }
+
+    Frontend Implementation Notes:
+    - Use this endpoint while the student is adding and removing courses, then
+      conflict_free_schedule for ranking, streaming or cursors
+    - Schedules are ordered by the order courses were added, so keep offset at 0
+      after every edit
+    """
+    logger = logging.getLogger(__name__)
+    start = time.time()
+
+    try:
+        data = json.loads(request.body)
+        offered_term = data.get("offered_term")
+        offset = int(data.get("offset", 0))
+        limit = int(data.get("limit", 50))
+        payload_format = data.get("format", FORMAT_FULL)
+        if payload_format not in FORMAT_CHOICES:
+            return JsonResponse({"error": f"format must be one of {', '.join(FORMAT_CHOICES)}"}, status=400)
+
+        selection = canonical_selection(data.get("courses", []))
+        data_version = term_data_version(offered_term)
+        course_sections = {
+            tuple(course): get_course_sections(offered_term, *course) for course in selection
+        }
+
+        if not request.session.session_key:
+            request.session.create()
+        session_key = request.session.session_key
+
+        frontier = ScheduleFrontier.load(session_key, offered_term)
+        try:
+            reused, computed = frontier.update(selection, course_sections)
+            frontier.save(session_key)
+        except FrontierTooLarge:
+            ScheduleFrontier.discard(session_key, offered_term)
+            frontier = None
+
+        course_data = []
+        page_choices = []
+        has_more = False
+        if frontier is not None:
+            # Turn the stored course_id tuples back into section indexes
+            course_data = [course_sections[course] for course in frontier.order]
+            positions = [
+                {section_data['course_id']: i for i, section_data in enumerate(sections)}
+                for sections in course_data
+            ]
+            combinations = frontier.combinations() if frontier.order else []
+            total_schedules = len(combinations)
+            has_more = total_schedules > offset + limit
+            page_choices = [
+                tuple(position[course_id] for position, course_id in zip(positions, combination))
+                for combination in combinations[offset:offset + limit]
+            ]
+        else:
+            # Too many combinations to keep; search the selection from scratch,
+            # backtracking so the order is still lexicographic by section
+            course_data = [course_sections[tuple(course)] for course in selection]
+            solver = ScheduleSolver(_solver_masks(course_data), mode=SOLVER_BACKTRACK)
+            total_schedules = _count_schedules(solver, offered_term, data_version, selection)
+            for checked, choice in enumerate(solver.search()):
+                if checked >= offset + limit or checked >= MAX_COMBINATIONS_TO_CHECK:
+                    has_more = True
+                    break
+                if checked >= offset:
+                    page_choices.append(choice)
+            reused, computed = 0, len(selection)
+
+        if payload_format == FORMAT_COMPACT:
+            compact_sections, found_schedules = _compact_schedules(course_data, page_choices)
+        else:
+            found_schedules = [_build_schedule(course_data, choice) for choice in page_choices]
+
+        message = f"Showing {len(found_schedules)} conflict-free schedules"
+        if total_schedules is not None:
+            message += f" of {total_schedules:,}"
+        response_data = {
+            "schedules": found_schedules,
+            "total": total_schedules if total_schedules is not None else "unknown",
+            "offset": offset,
+            "limit": limit,
+            "has_more": has_more,
+            "message": message,
+            "incremental": frontier is not None,
+            "courses_reused": reused,
+            "courses_computed": computed,
+        }
+        if payload_format == FORMAT_COMPACT:
+            response_data["format"] = FORMAT_COMPACT
+            response_data["sections"] = compact_sections
+
+        logger.info(f"Incremental schedules for {len(selection)} courses ({reused} reused, {computed} computed) in {time.time() - start:.2f}s")
+        return JsonResponse(response_data)
+
+    except Exception as e:
+        logger.critical(f"Error in incremental_schedule: {str(e)}")
+        return JsonResponse({"error": str(e)}, status=500)
+
+
+# -----------------------------------------
+# API: Course Catalog
+# -----------------------------------------
+def _etag_matches(etag, if_none_match):
+    """
+    If-None-Match check: "*" matches any representation, and tags are
+    compared weakly (a W/ prefix is ignored), as GET revalidation requires
+    """
+    tags = parse_etags(if_none_match)
+    if tags == ["*"]:
+        return True
+    return etag.removeprefix("W/") in {tag.removeprefix("W/") for tag in tags}
+
+
+@require_GET
+def course_catalog(request):
+    """
+    API: The whole term -> course type -> course code -> sections tree in one response
+
+    Replaces the four cascading dropdown calls (offered terms, course types,
+    course codes, section numbers): fetch the catalog once and navigate the
+    dropdowns client-side. The document is rebuilt only when course data
+    changes (see catalog.py) and is served gzip-compressed with a strong ETag.
+
+    Request:
+        GET /api/scheduler/catalog/?has_events=false
+        has_events: Optional, defaults to true (only sections with events,
+            like the dropdown endpoints)
+
+    Response:
+        {
+            "version": "<data version token>",
+            "terms": {
+                "Fall 2025": {
+                    "CIS": {
+                        "3750": ["01", "02"],
+                        ...
+                    },
+                    ...
+                },
+                ...
+            }
+        }
+        304 Not Modified when If-None-Match matches the current ETag
+
+    Frontend Implementation Notes:
+    - Load once per page and send the previous ETag in If-None-Match; the
+      browser does this automatically for repeat visits
+    - Terms, types, codes and sections are already sorted
+    """
+    has_events = request.GET.get("has_events", "true").lower() not in ("false", "0", "no")
+    document = get_catalog(has_events)
+
+    if _etag_matches(document["etag"], request.headers.get("If-None-Match", "")):
+        response = HttpResponse(status=304)
+    elif "gzip" in request.headers.get("Accept-Encoding", ""):
+        response = HttpResponse(document["gzip"], content_type="application/json")
+        response["Content-Encoding"] = "gzip"
+    else:
+        response = HttpResponse(document["body"], content_type="application/json")
+    response["ETag"] = document["etag"]
+    response["Vary"] = "Accept-Encoding"
+    # Clients may reuse it briefly, then must revalidate (cheap with the ETag)
+    response["Cache-Control"] = "public, max-age=300, must-revalidate"
+    return response
+
+
+# -----------------------------------------
+# API: Sections That Fit an Existing Timetable
+# -----------------------------------------
+@require_POST
+@csrf_exempt
+def compatible_sections(request):
+    """
+    API: For each candidate course, the sections that fit around a fixed set of sections.
+
+    Answers "which sections of X fit what I already have?" straight from the
+    per-term section index: the fixed sections' occupancy is OR-ed into one
+    mask and every candidate section is a single AND against it.
+
+    Request:
+        JSON: {
+            "offered_term": "Fall 2025",
+            "fixed": [
+                {"course_type": "ENGG", "course_code": "3380", "section_number": "02"},
+                ...
+            ],
+            "candidates": [
+                {"course_type": "CIS", "course_code": "3750"},
+                ...
+            ]
+        }
+
+    Response:
+        {
+            "fixed": ["ENGG*3380*02", ...],
+            "fixed_conflict": false,  # true if the fixed sections already clash
+            "candidates": {
+                "CIS*3750": {
+                    "compatible": [
+                        {"section_number": "01", "key": "CIS*3750*01", "instructor": "...",
+                         "events": [{event details...}, ...]},
+                        ...
+                    ],
+                    "total_sections": 6
+                },
+                ...
+            }
+        }
+
+    Frontend Implementation Notes:
+    - Call this when the student opens the section picker of a course, with the
+      sections already placed on their timetable as "fixed"
+    - An empty "compatible" list with total_sections > 0 means every section clashes
+    - Fixed sections without any meetings are accepted and block nothing
+    """
+    logger = logging.getLogger(__name__)
+    start = time.time()
+
+    try:
+        data = json.loads(request.body)
+        offered_term = data.get("offered_term")
+        fixed_requested = data.get("fixed", [])
+        candidates_requested = data.get("candidates", [])
+
+        fixed_sections = []
+        fixed_keys = []
+        unindexed = []
+        for c in fixed_requested:
+            sections = get_course_sections(offered_term, c["course_type"], c["course_code"], c["section_number"])
+            fixed_keys.append(f"{c['course_type']}*{c['course_code']}*{c['section_number']}")
+            if not sections:
+                unindexed.append((c["course_type"], c["course_code"], c["section_number"]))
+            fixed_sections.extend(sections)
+        if unindexed:
+            # The index leaves out sections without meetings; those still
+            # exist and simply occupy nothing
+            query = Q()
+            for course_type, course_code, section_number in unindexed:
+                query |= Q(course_type=course_type, course_code=course_code, section_number=section_number)
+            existing = set(
+                Course.objects.filter(query, offered_term=offered_term)
+                .values_list("course_type", "course_code", "section_number")
+            )
+            missing = ["*".join(key) for key in unindexed if key not in existing]
+            if missing:
+                return JsonResponse({"error": f"Sections not found in {offered_term}: {', '.join(missing)}"}, status=404)
+
+        candidate_sections = {
+            f"{c['course_type']}*{c['course_code']}": get_course_sections(offered_term, c["course_type"], c["course_code"])
+            for c in candidates_requested
+        }
+
+        all_sections = fixed_sections + [s for sections in candidate_sections.values() for s in sections]
+        masks = dict(zip((s["course_id"] for s in all_sections), section_masks(all_sections)))
+
+        occupied = 0
+        fixed_conflict = False
+        for section_data in fixed_sections:
+            mask = masks[section_data["course_id"]]
+            fixed_conflict = fixed_conflict or bool(mask & occupied)
+            occupied |= mask
+
+        result = {}
+        for course_key, sections in candidate_sections.items():
+            result[course_key] = {
+                "compatible": [
+                    {
+                        "section_number": section_data["section_number"],
+                        "key": section_data["key"],
+                        "instructor": section_data["instructor"],
+                        "events": section_data["events"],
+                    }
+                    for section_data in sections
+                    if not masks[section_data["course_id"]] & occupied
+                ],
+                "total_sections": len(sections),
+            }
+
+        logger.info(f"Checked {len(all_sections) - len(fixed_sections)} candidate sections against {len(fixed_sections)} fixed sections in {(time.time() - start) * 1000:.2f}ms")
+        return JsonResponse({
+            "fixed": fixed_keys,
+            "fixed_conflict": fixed_conflict,
+            "candidates": result,
+        })
+
+    except (KeyError, TypeError) as e:
+        return JsonResponse({"error": f"Invalid request: {e}"}, status=400)
+    except Exception as e:
+        logger.critical(f"Error in compatible_sections: {str(e)}")
         return JsonResponse({"error": str(e)}, status=500)
 
 